@@ -0,0 +1,146 @@
+import math
+
+
+class LatencyHistogram:
+    """
+    Histograma de tiempos de respuesta con intervalos logarítmicos (4 por cada potencia de 2, desde 1 microsegundo),
+    así que ocupa poco, se puede sumar con el de otro proceso y da los percentiles con un error menor del 20%.
+
+    buckets: {int: int} Número de llamadas en cada intervalo.
+    count: int Número de llamadas.
+    total: float Segundos totales.
+    max: float Llamada más lenta, en segundos.
+    """
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        return
+
+    @classmethod
+    def bucket(cls, seconds):
+        """
+        :param seconds: (float) Duración de la llamada.
+        :return: int Intervalo en el que cae.
+        """
+        microseconds = seconds * 1e6
+        if microseconds <= 1:
+            return 0
+        return int(math.log2(microseconds) * cls.BUCKETS_PER_OCTAVE) + 1
+
+    @classmethod
+    def bucket_limit(cls, bucket):
+        """
+        :param bucket: (int) Intervalo.
+        :return: float Límite superior del intervalo, en segundos.
+        """
+        return 2 ** (bucket / cls.BUCKETS_PER_OCTAVE) / 1e6
+
+    def record(self, seconds):
+        """
+        :param seconds: (float) Duración de la llamada.
+        :return: None
+        """
+        bucket = self.bucket(seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        return
+
+    def merge(self, other):
+        """
+        Suma a este histograma las llamadas de otro.
+        :param other: LatencyHistogram()
+        :return: LatencyHistogram() este mismo histograma
+        """
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, percentile):
+        """
+        :param percentile: (float) Percentil entre 0 y 100.
+        :return: float Segundos por debajo de los que están ese porcentaje de llamadas (como mucho, max).
+        """
+        if not self.count:
+            return 0.0
+        target = percentile / 100 * self.count
+        accumulated = 0
+        for bucket in sorted(self.buckets):
+            accumulated += self.buckets[bucket]
+            if accumulated >= target:
+                return min(self.bucket_limit(bucket), self.max)
+        return self.max
+
+    def mean(self):
+        """
+        :return: float Duración media, en segundos.
+        """
+        return self.total / self.count if self.count else 0.0
+
+
+class AgentLatency:
+    """
+    Tiempos de respuesta de los agentes, por agente (nombre de la clase) y trigger (on_build_phase, on_trade_offer...).
+    Se activa pasándolo al GameDirector (agent_latency=AgentLatency()); el mismo objeto puede acumular muchas partidas
+    y sumarse con el de otros procesos.
+
+    histograms: {(str, str): LatencyHistogram()} Histograma de cada agente y trigger.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        return
+
+    def record(self, agent, trigger, seconds):
+        """
+        :param agent: (str) Nombre del agente.
+        :param trigger: (str) Nombre del trigger llamado.
+        :param seconds: (float) Duración de la llamada.
+        :return: None
+        """
+        histogram = self.histograms.get((agent, trigger))
+        if histogram is None:
+            histogram = self.histograms[(agent, trigger)] = LatencyHistogram()
+        histogram.record(seconds)
+        return
+
+    def merge(self, other):
+        """
+        Suma a estos tiempos los de otro AgentLatency (por ejemplo, el de otro proceso).
+        :param other: AgentLatency()
+        :return: AgentLatency() este mismo objeto
+        """
+        for key, histogram in other.histograms.items():
+            if key in self.histograms:
+                self.histograms[key].merge(histogram)
+            else:
+                self.histograms[key] = LatencyHistogram().merge(histogram)
+        return self
+
+    def rows(self):
+        """
+        :return: [(str, str, int, float, float, float, float, float, float)...] Agente, trigger, llamadas, segundos
+                 totales, media, p50, p95, p99 y máximo (en segundos), de mayor a menor tiempo total.
+        """
+        rows = []
+        for (agent, trigger), histogram in self.histograms.items():
+            rows.append((agent, trigger, histogram.count, histogram.total, histogram.mean(), histogram.percentile(50),
+                         histogram.percentile(95), histogram.percentile(99), histogram.max))
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def __str__(self):
+        lines = [f"{'Agente':<24} {'Trigger':<52} {'Llamadas':>9} {'Total s':>9} {'Media ms':>9} {'p50 ms':>8} "
+                 f"{'p95 ms':>8} {'p99 ms':>8} {'Máx ms':>9}"]
+        for agent, trigger, count, total, mean, p50, p95, p99, maximum in self.rows():
+            lines.append(f"{agent:<24} {trigger:<52} {count:>9} {total:>9.2f} {mean * 1e3:>9.3f} {p50 * 1e3:>8.3f} "
+                         f"{p95 * 1e3:>8.3f} {p99 * 1e3:>8.3f} {maximum * 1e3:>9.3f}")
+        return '\n'.join(lines)
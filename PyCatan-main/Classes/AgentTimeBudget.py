@@ -0,0 +1,118 @@
+import signal
+import threading
+import time
+
+
+class AgentTimeout(BaseException):
+    """
+    Se lanza cuando un agente se pasa de su tiempo. Hereda de BaseException para que un agente con un
+    'except Exception' no pueda capturarla y seguir.
+
+    reason: str 'call' si se ha pasado del tiempo de la llamada, 'game' si ha agotado el tiempo de la partida.
+    """
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AgentTimeBudget:
+    """
+    Tiempo máximo que puede tardar cada agente en cada llamada a un trigger y en toda la partida. Se pasa al
+    GameDirector (time_budget=AgentTimeBudget(...)) y el GameManager aplica la respuesta por defecto del trigger
+    (colocación aleatoria, mover el ladrón al azar, no construir...) cuando un agente se pasa de tiempo.
+
+    En Unix, desde el hilo principal, la llamada se corta con una alarma (SIGALRM, o SIGVTALRM si se cuenta tiempo de
+    CPU) en cuanto se acaba el tiempo, así que un agente que se queda en un bucle no bloquea la partida. En otro caso
+    se deja acabar la llamada y se descarta su respuesta si ha tardado demasiado.
+
+    call_seconds: float/None Segundos máximos por llamada (None: sin límite).
+    game_seconds: float/None Segundos máximos de cada agente en toda la partida (None: sin límite).
+    clock: str 'wall' para tiempo real o 'cpu' para tiempo de CPU del proceso.
+    used: [float, float, float, float] Segundos gastados por cada agente en la partida actual.
+    """
+    WALL = 'wall'
+    CPU = 'cpu'
+
+    def __init__(self, call_seconds=None, game_seconds=None, clock=WALL):
+        if clock not in (self.WALL, self.CPU):
+            raise ValueError("clock debe ser 'wall' o 'cpu'")
+        self.call_seconds = call_seconds
+        self.game_seconds = game_seconds
+        self.clock = clock
+        self.timer = time.perf_counter if clock == self.WALL else time.process_time
+        if clock == self.WALL:
+            self.itimer, self.signal_number = getattr(signal, 'ITIMER_REAL', None), getattr(signal, 'SIGALRM', None)
+        else:
+            self.itimer, self.signal_number = (getattr(signal, 'ITIMER_VIRTUAL', None),
+                                               getattr(signal, 'SIGVTALRM', None))
+        self.used = [0.0, 0.0, 0.0, 0.0]
+        return
+
+    def reset(self):
+        """
+        Reinicia el tiempo gastado por los agentes al empezar una partida.
+        :return: None
+        """
+        self.used = [0.0, 0.0, 0.0, 0.0]
+        return
+
+    def can_interrupt(self):
+        """
+        :return: bool Si se puede cortar una llamada con una alarma (Unix y en el hilo principal).
+        """
+        return (self.signal_number is not None and hasattr(signal, 'setitimer') and
+                threading.current_thread() is threading.main_thread())
+
+    def remaining(self, player_id):
+        """
+        :param player_id: (int) Asiento del agente.
+        :return: float/None Segundos que puede tardar el agente en la próxima llamada, o None si no hay límite.
+        """
+        limits = []
+        if self.call_seconds is not None:
+            limits.append(self.call_seconds)
+        if self.game_seconds is not None:
+            limits.append(self.game_seconds - self.used[player_id])
+        return min(limits) if limits else None
+
+    def run(self, player_id, function, args):
+        """
+        Llama a function(*args) dentro del tiempo que le queda al agente.
+        :param player_id: (int) Asiento del agente.
+        :param function: Trigger del agente.
+        :param args: Argumentos del trigger.
+        :return: Lo que devuelva el trigger. Lanza AgentTimeout si el agente se pasa de tiempo.
+        """
+        remaining = self.remaining(player_id)
+        if remaining is None:
+            return function(*args)
+        if remaining <= 0:
+            raise AgentTimeout('game')
+
+        reason = 'call' if self.call_seconds is not None and remaining >= self.call_seconds else 'game'
+        interrupt = self.can_interrupt()
+        # La alarma solo corta la llamada mientras el agente está ejecutándose, no mientras se restaura el estado
+        running = [True]
+        start = self.timer()
+        if interrupt:
+            def on_alarm(signal_number, frame):
+                if running[0]:
+                    raise AgentTimeout(reason)
+            previous_handler = signal.signal(self.signal_number, on_alarm)
+            signal.setitimer(self.itimer, remaining)
+        try:
+            try:
+                result = function(*args)
+            finally:
+                running[0] = False
+        finally:
+            if interrupt:
+                signal.setitimer(self.itimer, 0)
+                signal.signal(self.signal_number, previous_handler)
+            elapsed = self.timer() - start
+            self.used[player_id] += elapsed
+
+        if elapsed > remaining:
+            raise AgentTimeout(reason)
+        return result
@@ -1,9 +1,259 @@
 import random
+from types import MappingProxyType
 
+from Classes.BuildFrontier import BuildFrontier
 from Classes.Constants import HarborConstants, TerrainConstants, MaterialConstants
+from Classes.LongestRoadTracker import LongestRoadTracker
+from Classes.ProductionIndex import ProductionIndex
 from Classes.Utilities import is_even
 
 
+# Topología del tablero. Es siempre la misma, así que se calcula una sola vez al importar el módulo y la comparten
+# todas las instancias de Board. Es inmutable (tuplas y MappingProxyType), para que un agente o una partida no
+# puedan cambiársela a los tableros que se creen después.
+NODE_COUNT = 54
+TERRAIN_COUNT = 19
+
+CONTACTING_NODES = MappingProxyType({
+    0: (0, 1, 2, 8, 9, 10),
+    1: (2, 3, 4, 10, 11, 12),
+    2: (4, 5, 6, 12, 13, 14),
+    3: (7, 8, 9, 17, 18, 19),
+    4: (9, 10, 11, 19, 20, 21),
+    5: (11, 12, 13, 21, 22, 23),
+    6: (13, 14, 15, 23, 24, 25),
+    7: (16, 17, 18, 27, 28, 29),
+    8: (18, 19, 20, 29, 30, 31),
+    9: (20, 21, 22, 31, 32, 33),
+    10: (22, 23, 24, 33, 34, 35),
+    11: (24, 25, 26, 35, 36, 37),
+    12: (28, 29, 30, 38, 39, 40),
+    13: (30, 31, 32, 40, 41, 42),
+    14: (32, 33, 34, 42, 43, 44),
+    15: (34, 35, 36, 44, 45, 46),
+    16: (39, 40, 41, 47, 48, 49),
+    17: (41, 42, 43, 49, 50, 51),
+    18: (43, 44, 45, 51, 52, 53),
+})
+
+PROBABILITIES = MappingProxyType({
+    0: 11,      1: 12,      2: 9,       3: 4,       4: 6,
+    5: 5,       6: 10,      7: 7,       8: 3,       9: 11,
+    10: 4,      11: 8,      12: 8,      13: 10,     14: 9,
+    15: 3,      16: 5,      17: 2,      18: 6
+})
+
+TERRAIN_TYPES = MappingProxyType({
+    0: TerrainConstants.WOOD, 1: TerrainConstants.WOOL, 2: TerrainConstants.CEREAL,
+    3: TerrainConstants.CLAY, 4: TerrainConstants.MINERAL, 5: TerrainConstants.CLAY,
+    6: TerrainConstants.WOOL, 7: TerrainConstants.DESERT, 8: TerrainConstants.WOOD,
+    9: TerrainConstants.CEREAL, 10: TerrainConstants.WOOD, 11: TerrainConstants.CEREAL,
+    12: TerrainConstants.CLAY, 13: TerrainConstants.WOOL, 14: TerrainConstants.WOOL,
+    15: TerrainConstants.MINERAL, 16: TerrainConstants.MINERAL, 17: TerrainConstants.CEREAL,
+    18: TerrainConstants.WOOD
+})
+
+HARBORS = MappingProxyType({
+    0: HarborConstants.WOOD, 1: HarborConstants.WOOD,
+    3: HarborConstants.CEREAL, 4: HarborConstants.CEREAL,
+    14: HarborConstants.CLAY, 15: HarborConstants.CLAY,
+    28: HarborConstants.MINERAL, 38: HarborConstants.MINERAL,
+    50: HarborConstants.WOOL, 51: HarborConstants.WOOL,
+    7: HarborConstants.ALL, 17: HarborConstants.ALL, 26: HarborConstants.ALL, 37: HarborConstants.ALL,
+    45: HarborConstants.ALL, 46: HarborConstants.ALL, 47: HarborConstants.ALL, 48: HarborConstants.ALL
+})
+
+COASTAL_NODES = (0, 1, 2, 3, 4, 5, 6, 7, 8, 14, 15, 16, 17, 25, 26, 27, 28, 36, 37, 38, 39, 45, 46, 47, 48, 49, 50, 51, 52, 53)
+
+
+def calculate_adjacent_nodes(node_id):
+    """
+    Calcula los nodos adyacentes a un nodo a partir de la fila en la que está
+    :param node_id: Id del nodo del que se quieren los ID de los nodos adyacentes
+    :return: [int, ...]
+    """
+    adjacent_nodes = []
+
+    if 0 <= node_id < 7:
+        if node_id != 0:
+            adjacent_nodes.append(node_id - 1)
+        if node_id != 6:
+            adjacent_nodes.append(node_id + 1)
+
+        if is_even(node_id):
+            adjacent_nodes.append(node_id + 8)
+
+    elif 7 <= node_id < 16:
+        if node_id != 7:
+            adjacent_nodes.append(node_id - 1)
+        if node_id != 15:
+            adjacent_nodes.append(node_id + 1)
+
+        if is_even(node_id):
+            adjacent_nodes.append(node_id - 8)
+        else:
+            adjacent_nodes.append(node_id + 10)
+
+    elif 16 <= node_id < 27:
+        if node_id != 16:
+            adjacent_nodes.append(node_id - 1)
+        if node_id != 26:
+            adjacent_nodes.append(node_id + 1)
+
+        if is_even(node_id):
+            adjacent_nodes.append(node_id + 11)
+        else:
+            adjacent_nodes.append(node_id - 10)
+
+    elif 27 <= node_id < 38:
+        if node_id != 27:
+            adjacent_nodes.append(node_id - 1)
+        if node_id != 37:
+            adjacent_nodes.append(node_id + 1)
+
+        if is_even(node_id):
+            adjacent_nodes.append(node_id + 10)
+        else:
+            adjacent_nodes.append(node_id - 11)
+
+    elif 38 <= node_id < 47:
+        if node_id != 37:
+            adjacent_nodes.append(node_id - 1)
+        if node_id != 46:
+            adjacent_nodes.append(node_id + 1)
+
+        if is_even(node_id):
+            adjacent_nodes.append(node_id - 10)
+        else:
+            adjacent_nodes.append(node_id + 8)
+
+    elif 47 <= node_id < 54:
+        if node_id != 47:
+            adjacent_nodes.append(node_id - 1)
+        if node_id != 53:
+            adjacent_nodes.append(node_id + 1)
+
+        if not is_even(node_id):
+            adjacent_nodes.append(node_id - 8)
+
+    return adjacent_nodes
+
+
+# ADJACENT_NODES[node_id]: nodos adyacentes a cada nodo
+ADJACENT_NODES = tuple(tuple(calculate_adjacent_nodes(node_id)) for node_id in range(NODE_COUNT))
+
+# CONTACTING_TERRAIN[node_id]: terrenos con los que hace contacto cada nodo
+CONTACTING_TERRAIN = tuple(tuple(terrain_id for terrain_id, nodes in CONTACTING_NODES.items() if node_id in nodes)
+                           for node_id in range(NODE_COUNT))
+
+# COASTAL_MASK[node_id]: si el nodo es costero
+COASTAL_NODE_SET = frozenset(COASTAL_NODES)
+COASTAL_MASK = tuple(node_id in COASTAL_NODE_SET for node_id in range(NODE_COUNT))
+
+# Cada carretera posible tiene un id. Se numeran por orden de aparición al recorrer los nodos y sus adyacentes.
+# EDGES[edge_id]: (node_id, node_id)
+# EDGE_IDS[(node_id, node_id)]: edge_id, en los dos sentidos
+# NODE_EDGES[node_id]: ((edge_id, node_id)...) carreteras que salen de cada nodo y nodo al que llegan
+EDGES = []
+EDGE_IDS = {}
+for _node_id in range(NODE_COUNT):
+    for _adjacent_id in ADJACENT_NODES[_node_id]:
+        if (_node_id, _adjacent_id) not in EDGE_IDS:
+            EDGE_IDS[(_node_id, _adjacent_id)] = EDGE_IDS[(_adjacent_id, _node_id)] = len(EDGES)
+            EDGES.append((_node_id, _adjacent_id))
+EDGES = tuple(EDGES)
+EDGE_IDS = MappingProxyType(EDGE_IDS)
+NODE_EDGES = tuple(tuple((edge_id, start if end == node_id else end) for edge_id, (start, end) in enumerate(EDGES)
+                         if node_id in (start, end))
+                   for node_id in range(NODE_COUNT))
+
+
+class BoardNode(dict):
+    """
+    Nodo del tablero. Se comporta como un diccionario normal (así lo usan los agentes y las trazas), pero avisa al
+    tablero cada vez que se modifica, para que las estructuras que este mantiene de forma incremental estén al día.
+    """
+    __slots__ = ('board',)
+
+    def __init__(self, node, board=None):
+        super().__init__(node)
+        self.board = board
+        if not isinstance(self['roads'], BoardRoads):
+            super().__setitem__('roads', BoardRoads(self['roads'], self))
+
+    def __setitem__(self, key, value):
+        if key == 'roads' and not isinstance(value, BoardRoads):
+            value = BoardRoads(value, self)
+        super().__setitem__(key, value)
+        self.changed()
+
+    def __reduce__(self):
+        # Al copiar o serializar un nodo se obtiene un diccionario normal
+        return dict, (dict(self),)
+
+    def changed(self):
+        board = getattr(self, 'board', None)
+        if board is not None:
+            board.node_changed(self['id'])
+
+
+class BoardRoads(list):
+    """
+    Lista de carreteras de un nodo. Avisa al nodo cada vez que se modifica.
+    """
+    __slots__ = ('node',)
+
+    def __init__(self, roads=(), node=None):
+        super().__init__(roads)
+        self.node = node
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def _changed(self):
+        node = getattr(self, 'node', None)
+        if node is not None:
+            node.changed()
+
+    def append(self, road):
+        super().append(road)
+        self._changed()
+
+    def extend(self, roads):
+        super().extend(roads)
+        self._changed()
+
+    def insert(self, index, road):
+        super().insert(index, road)
+        self._changed()
+
+    def remove(self, road):
+        super().remove(road)
+        self._changed()
+
+    def pop(self, index=-1):
+        road = super().pop(index)
+        self._changed()
+        return road
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, index, road):
+        super().__setitem__(index, road)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, roads):
+        result = super().__iadd__(roads)
+        self._changed()
+        return result
+
+
 class Board:
     """
     Clase que representa una instancia del tablero.
@@ -28,80 +278,37 @@ class Board:
 
     La asignación de los ids de nodo y terreno se ha llevado a cabo por filas, de izquierda a derecha y de arriba a abajo.
     """
+    # La topología es fija y se comparte entre todas las instancias (ver las constantes del módulo)
+    contacting_nodes = CONTACTING_NODES
+    probabilities = PROBABILITIES
+    terrain_types = TERRAIN_TYPES
+    harbors = HARBORS
+    coastal_nodes = COASTAL_NODES
 
     def __init__(self, nodes=None, terrain=None):
-        # TODO: esto se deberia de poder calcular automaticamente
-        self.contacting_nodes = {
-            0: [0, 1, 2, 8, 9, 10],
-            1: [2, 3, 4, 10, 11, 12],
-            2: [4, 5, 6, 12, 13, 14],
-            3: [7, 8, 9, 17, 18, 19],
-            4: [9, 10, 11, 19, 20, 21],
-            5: [11, 12, 13, 21, 22, 23],
-            6: [13, 14, 15, 23, 24, 25],
-            7: [16, 17, 18, 27, 28, 29],
-            8: [18, 19, 20, 29, 30, 31],
-            9: [20, 21, 22, 31, 32, 33],
-            10: [22, 23, 24, 33, 34, 35],
-            11: [24, 25, 26, 35, 36, 37],
-            12: [28, 29, 30, 38, 39, 40],
-            13: [30, 31, 32, 40, 41, 42],
-            14: [32, 33, 34, 42, 43, 44],
-            15: [34, 35, 36, 44, 45, 46],
-            16: [39, 40, 41, 47, 48, 49],
-            17: [41, 42, 43, 49, 50, 51],
-            18: [43, 44, 45, 51, 52, 53],
-        }
-
-        self.probabilities = {
-            0: 11,      1: 12,      2: 9,       3: 4,       4: 6,
-            5: 5,       6: 10,      7: 7,       8: 3,       9: 11,
-            10: 4,      11: 8,      12: 8,      13: 10,     14: 9,
-            15: 3,      16: 5,      17: 2,      18: 6
-        }
-
-        self.terrain_types = {
-            0: TerrainConstants.WOOD, 1: TerrainConstants.WOOL, 2: TerrainConstants.CEREAL,
-            3: TerrainConstants.CLAY, 4: TerrainConstants.MINERAL, 5: TerrainConstants.CLAY,
-            6: TerrainConstants.WOOL, 7: TerrainConstants.DESERT, 8: TerrainConstants.WOOD,
-            9: TerrainConstants.CEREAL, 10: TerrainConstants.WOOD, 11: TerrainConstants.CEREAL,
-            12: TerrainConstants.CLAY, 13: TerrainConstants.WOOL, 14: TerrainConstants.WOOL,
-            15: TerrainConstants.MINERAL, 16: TerrainConstants.MINERAL, 17: TerrainConstants.CEREAL,
-            18: TerrainConstants.WOOD
-        }
-
-        self.harbors = {
-            0: HarborConstants.WOOD, 1: HarborConstants.WOOD,
-            3: HarborConstants.CEREAL, 4: HarborConstants.CEREAL,
-            14: HarborConstants.CLAY, 15: HarborConstants.CLAY,
-            28: HarborConstants.MINERAL, 38: HarborConstants.MINERAL,
-            50: HarborConstants.WOOL, 51: HarborConstants.WOOL,
-            7: HarborConstants.ALL, 17: HarborConstants.ALL, 26: HarborConstants.ALL, 37: HarborConstants.ALL,
-            45: HarborConstants.ALL, 46: HarborConstants.ALL, 47: HarborConstants.ALL, 48: HarborConstants.ALL
-        }
-
-        self.coastal_nodes = [0, 1, 2, 3, 4, 5, 6, 7, 8, 14, 15, 16, 17, 25, 26, 27, 28, 36, 37, 38, 39, 45, 46, 47, 48, 49, 50, 51, 52, 53]
+        # Objetos que quieren enterarse de cada cambio en un nodo (ver node_changed)
+        self.node_listeners = []
 
         if nodes:
-            self.nodes = nodes
+            self.nodes = [BoardNode(node, self) for node in nodes]
         else:
             self.nodes = []  # 0 a 53
-            for i in range(54):
-                self.nodes.append({
+            for i in range(NODE_COUNT):
+                self.nodes.append(BoardNode({
                     "id": i,
-                    "adjacent": self.__get_adjacent_nodes__(i),
+                    "adjacent": list(ADJACENT_NODES[i]),
                     "harbor": self.__get_harbors__(i),
                     "roads": [],
                     "has_city": False,
                     "player": -1,
-                    "contacting_terrain": self.__get_contacting_terrain__(i),
-                })
+                    "contacting_terrain": list(CONTACTING_TERRAIN[i]),
+                }, self))
 
         if terrain:
             self.terrain = terrain
         else:
             self.terrain = []  # 0 a 18
-            for j in range(19):
+            for j in range(TERRAIN_COUNT):
                 probability = self.__get_probability__(j)
                 has_thief = probability == 7
                 self.terrain.append({
@@ -116,6 +323,65 @@ class Board:
 
         return
 
+    def __copy__(self):
+        # copy(board) comparte los nodos con el tablero original, así que también debe compartir sus estructuras
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        return board
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['node_listeners'] = []
+        return state
+
+    def __setstate__(self, state):
+        # Tras un deepcopy o un pickle los nodos llegan como diccionarios normales y hay que volver a enlazarlos
+        self.__dict__.update(state)
+        self.nodes = [BoardNode(node, self) for node in self.nodes]
+        self.node_listeners = []
+
+    def node_changed(self, node_id):
+        """
+        Avisa a los objetos que mantienen información derivada del tablero de que un nodo ha cambiado.
+        :param node_id: (int) Id del nodo modificado.
+        :return: None
+        """
+        for listener in self.node_listeners:
+            listener.on_node_changed(node_id)
+
+    def longest_road(self):
+        """
+        Devuelve la carretera más larga del tablero y a quién pertenece. Se calcula de forma incremental, solo se
+        recalculan las redes de carreteras que han cambiado desde la última llamada.
+        :return: {'longest_road': int, 'player': int}
+        """
+        return self.get_node_listener(LongestRoadTracker).get_longest_road()
+
+    def production(self, dice_roll):
+        """
+        Devuelve los materiales que recibe cada jugador con una tirada de dados. Se consulta un índice que se mantiene
+        al día cada vez que se construye un pueblo o una ciudad, en lugar de recorrer todos los terrenos.
+        :param dice_roll: (int) Resultado de los dados.
+        :return: {player_id: Materials()}
+        """
+        return self.get_node_listener(ProductionIndex).get_production(dice_roll)
+
+    def get_node_listener(self, listener_class):
+        """
+        Devuelve la estructura incremental del tipo indicado (LongestRoadTracker, ProductionIndex, BuildFrontier...),
+        creándola la primera vez que se pide. Se guarda en node_listeners, que es compartida por las copias
+        superficiales del tablero, así que copy(board) no vuelve a construirla.
+        :param listener_class: Clase de la estructura.
+        :return: listener_class()
+        """
+        for listener in self.node_listeners:
+            if type(listener) is listener_class:
+                return listener
+
+        listener = listener_class(self)
+        self.node_listeners.append(listener)
+        return listener
+
     def visualize_board(self):
         print('Nodos:')
         for node in self.nodes:
@@ -143,8 +409,7 @@ class Board:
         :param node_id: El ID de la pieza del terreno actual
         :return: [terrain_id, terrain_id, terrain_id, terrain_id, terrain_id, terrain_id]
         """
-        contact = [terrain_id for terrain_id, nodes in self.contacting_nodes.items() if node_id in nodes]
-        return contact
+        return list(CONTACTING_TERRAIN[node_id])
 
     def __get_contacting_nodes__(self, terrain_id):
         """
@@ -152,7 +417,8 @@ class Board:
         :param terrain_id: El ID de la pieza del terreno actual
         :return: [node_id, node_id, node_id, node_id, node_id, node_id]
         """
-        return self.contacting_nodes.get(terrain_id, TerrainConstants.DESERT)
+        contacting_nodes = self.contacting_nodes.get(terrain_id)
+        return list(contacting_nodes) if contacting_nodes is not None else TerrainConstants.DESERT
 
     def __get_probability__(self, terrain_id):
         return self.probabilities[terrain_id]
@@ -160,77 +426,13 @@ class Board:
     def __get_terrain_type__(self, terrain_id):
         return self.terrain_types[terrain_id]
 
-    def __get_adjacent_nodes__(self, node_id): #TODO
+    def __get_adjacent_nodes__(self, node_id):
         """
         Función que obtiene los nodos adyacentes de manera automática
         :param node_id: Id del nodo del que se quieren los ID de los nodos adyacentes
         :return: [int, ...]
         """
-        adjacent_nodes = []
-
-        if 0 <= node_id < 7:
-            if node_id != 0:
-                adjacent_nodes.append(node_id - 1)
-            if node_id != 6:
-                adjacent_nodes.append(node_id + 1)
-
-            if is_even(node_id):
-                adjacent_nodes.append(node_id + 8)
-
-        elif 7 <= node_id < 16:
-            if node_id != 7:
-                adjacent_nodes.append(node_id - 1)
-            if node_id != 15:
-                adjacent_nodes.append(node_id + 1)
-
-            if is_even(node_id):
-                adjacent_nodes.append(node_id - 8)
-            else:
-                adjacent_nodes.append(node_id + 10)
-
-        elif 16 <= node_id < 27:
-            if node_id != 16:
-                adjacent_nodes.append(node_id - 1)
-            if node_id != 26:
-                adjacent_nodes.append(node_id + 1)
-
-            if is_even(node_id):
-                adjacent_nodes.append(node_id + 11)
-            else:
-                adjacent_nodes.append(node_id - 10)
-
-        elif 27 <= node_id < 38:
-            if node_id != 27:
-                adjacent_nodes.append(node_id - 1)
-            if node_id != 37:
-                adjacent_nodes.append(node_id + 1)
-
-            if is_even(node_id):
-                adjacent_nodes.append(node_id + 10)
-            else:
-                adjacent_nodes.append(node_id - 11)
-
-        elif 38 <= node_id < 47:
-            if node_id != 37:
-                adjacent_nodes.append(node_id - 1)
-            if node_id != 46:
-                adjacent_nodes.append(node_id + 1)
-
-            if is_even(node_id):
-                adjacent_nodes.append(node_id - 10)
-            else:
-                adjacent_nodes.append(node_id + 8)
-
-        elif 47 <= node_id < 54:
-            if node_id != 47:
-                adjacent_nodes.append(node_id - 1)
-            if node_id != 53:
-                adjacent_nodes.append(node_id + 1)
-
-            if not is_even(node_id):
-                adjacent_nodes.append(node_id - 8)
-
-        return adjacent_nodes
+        return list(ADJACENT_NODES[node_id])
 
     def __get_harbors__(self, node_id):
         return self.harbors.get(node_id, HarborConstants.NONE)
@@ -308,11 +510,12 @@ class Board:
         return {'response': True, 'error_msg': ''}
             
 
-    def move_thief(self, terrain_id):
+    def move_thief(self, terrain_id, rng=random):
         """
         Permite mover el ladrón a la casilla de terreno especificada
         Cambia la variable terrain para colocar al ladrón en el terreno correspondiente
         :param terrain: Número que representa un hexágono en el tablero
+        :param rng: Generador aleatorio con el que se elige la casilla si se intenta dejar el ladrón donde está
         :return: {bool, string}. Envía si se ha podido move al ladrón y en caso de no haberse podido el porqué
         """
         if self.terrain[terrain_id]['has_thief']: # Yo aqui hacia un raise exception y me quedaba muy agusto
@@ -322,7 +525,7 @@ class Board:
             # hay que regenerar tests
             rand_terrain = terrain_id 
             while rand_terrain == terrain_id:
-                rand_terrain = random.randint(0, 18)
+                rand_terrain = rng.randint(0, 18)
 
             self.terrain[terrain_id]['has_thief'] = False
             self.terrain[rand_terrain]['has_thief'] = True
@@ -351,7 +554,7 @@ class Board:
         return True
 
     def is_coastal_node(self, node_id):
-        return node_id in self.coastal_nodes
+        return node_id in COASTAL_NODE_SET
 
     def valid_town_nodes(self, player_id):
         """
@@ -360,17 +563,8 @@ class Board:
         :param player_id: int
         :return: [int...]
         """
-        valid_nodes = []
-        for node in self.nodes:
-            for road in node['roads']:
-                if (
-                    road['player_id'] == player_id and
-                    self.empty_adjacent_nodes(node['id']) and
-                    node['player'] == -1 and
-                    node['id'] not in valid_nodes
-                ):
-                    valid_nodes.append(node['id'])
-        return valid_nodes
+        # Nodos libres, sin pueblos adyacentes, a los que llega una carretera del jugador
+        return self.get_node_listener(BuildFrontier).get_town_nodes(player_id)
 
     def valid_city_nodes(self, player_id):
         """
@@ -378,45 +572,19 @@ class Board:
         :param player_id: int
         :return: [int...]
         """
-        valid_city_node = lambda node: node['player'] == player_id and node['has_city'] == False
-        return [node['id'] for node in self.nodes if valid_city_node(node)]
+        # Pueblos del jugador que aún no son ciudad
+        return self.get_node_listener(BuildFrontier).get_city_nodes(player_id)
 
-
-    def valid_road_nodes(self, player_id): # TODO
+    def valid_road_nodes(self, player_id):
         """
         Devuelve un array de diccionarios con los nodos iniciales y finales en los que se puede hacer una carretera
         :param player_id:
         :return: [{'starting_node': int, 'finishing_node': int}, ...]
         """
-        valid_nodes = []
-        # Por cada nodo que existe
-        for node in self.nodes:
-            # Se comprueban sus nodos adyacentes
-            for adjacent_node_id in node['adjacent']:
-                # Se crea una variable para ver si se puede construir
-                allowed_to_build = False
-                # Se comprueba que el nodo ADYACENTE sea del jugador o no tenga jugador antes siquiera de mirar si
-                # se puede construir. Si se quiere llegar al pueblo de otro jugador, cuando se esté en ese nodo,
-                # al mirar el adyacente verá que puede construir y dejará hacer la carretera.
-                # Sin embargo, esto evitará que se pueda atravesar pueblos de otros jugadores.
-
-                if self.nodes[adjacent_node_id]['player'] in [player_id, -1]:
-
-                    # Por cada carretera que haya en el nodo adyacente
-                    for road in self.nodes[adjacent_node_id]['roads']:
-                        # Si la carretera no es una carretera de vuelta
-                        if road['node_id'] != node['id']:
-                            allowed_to_build = road['player_id'] == player_id
-                        # En caso de haber una carretera de vuelta, independientemente de qué jugador,
-                        # se corta inmediatamente y se prohíbe construir
-                        else:
-                            allowed_to_build = False
-                            break
-                if allowed_to_build:
-                    valid_nodes.append({'starting_node': adjacent_node_id, 'finishing_node': node['id']})
-
-        return valid_nodes
-
+        # Se puede construir desde un nodo adyacente que sea del jugador o no tenga jugador (para no atravesar pueblos
+        # de otros jugadores), cuya última carretera sea del jugador y que no tenga ya una carretera de vuelta.
+        # BuildFrontier mantiene esta lista al día cada vez que cambia un nodo.
+        return self.get_node_listener(BuildFrontier).get_road_nodes(player_id)
 
     def valid_starting_nodes(self):
         """
@@ -0,0 +1,228 @@
+from collections.abc import Mapping
+from copy import deepcopy
+
+
+class BoardView:
+    """
+    Vista de solo lectura del tablero que se pasa a los agentes (on_game_start, on_build_phase, on_trade_offer) en
+    lugar de copy(board).
+
+    Crearla cuesta O(1): no copia nada y lee siempre el tablero real, así que, igual que con copy(board), un agente que
+    guarde la vista verá el estado actual de la partida en los turnos siguientes.
+
+    Solo se puede acceder a nodes, terrain, la topología (que es inmutable) y los métodos de READ_METHODS, que devuelven
+    copias. Los nodos y terrenos se entregan como vistas de solo lectura y sus listas como ReadOnlyList, que lanza
+    TypeError si se intenta modificar. Si el agente asigna una clave de un nodo o terreno o llama a un método de
+    MUTATING_METHODS, la vista se separa del tablero real haciendo una copia propia (copy-on-write) y el cambio solo se
+    aplica a esa copia. Cualquier otro atributo lanza AttributeError.
+
+    forked: bool Si la vista ya se ha separado del tablero de la partida.
+    """
+    __slots__ = ('_board', '_forked', '_nodes', '_terrain')
+
+    READ_METHODS = (
+        'valid_town_nodes', 'valid_city_nodes', 'valid_road_nodes', 'valid_starting_nodes', 'empty_adjacent_nodes',
+        'is_coastal_node', 'check_for_player_harbors', 'longest_road', 'get_board',
+        '__get_contacting_terrain__', '__get_contacting_nodes__', '__get_probability__', '__get_terrain_type__',
+        '__get_adjacent_nodes__', '__get_harbors__',
+    )
+    TOPOLOGY = ('contacting_nodes', 'probabilities', 'terrain_types', 'harbors', 'coastal_nodes')
+    MUTATING_METHODS = ('build_town', 'build_city', 'build_road', 'move_thief')
+
+    def __init__(self, board):
+        self._board = board
+        self._forked = False
+        self._nodes = None
+        self._terrain = None
+        return
+
+    @property
+    def forked(self):
+        return self._forked
+
+    def fork(self):
+        """
+        Separa la vista del tablero de la partida haciendo una copia propia. Solo se hace la primera vez.
+        :return: Board()
+        """
+        if not self._forked:
+            self._board = deepcopy(self._board)
+            self._forked = True
+        return self._board
+
+    @property
+    def nodes(self):
+        if self._nodes is None:
+            self._nodes = ReadOnlyItems(self, 'nodes')
+        return self._nodes
+
+    @property
+    def terrain(self):
+        if self._terrain is None:
+            self._terrain = ReadOnlyItems(self, 'terrain')
+        return self._terrain
+
+    def __getattr__(self, name):
+        if name in BoardView.READ_METHODS:
+            method = getattr(self._board, name)
+            return lambda *args, **kwargs: copy_value(method(*args, **kwargs))
+        if name in BoardView.TOPOLOGY:
+            return getattr(self._board, name)
+        if name in BoardView.MUTATING_METHODS:
+            return getattr(self.fork(), name)
+        raise AttributeError(f"La vista del tablero no permite acceder a '{name}'")
+
+    def __copy__(self):
+        board_view = BoardView(self._board)
+        board_view._forked = self._forked
+        return board_view
+
+    def __deepcopy__(self, memo):
+        return deepcopy(self._board, memo)
+
+
+def copy_value(value):
+    """
+    :param value: Valor devuelto por el tablero.
+    :return: Copia del valor, con las listas, diccionarios y conjuntos que contenga también copiados.
+    """
+    if isinstance(value, list):
+        return [copy_value(element) for element in value]
+    if isinstance(value, dict):
+        return {key: copy_value(element) for key, element in value.items()}
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def read_only_value(value):
+    """
+    :param value: Valor de un nodo o terreno.
+    :return: El valor, con las listas convertidas en ReadOnlyList y los diccionarios en ReadOnlyDict.
+    """
+    if isinstance(value, list):
+        return ReadOnlyList(read_only_value(element) for element in value)
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, read_only_value(element)) for key, element in value.items())
+    return value
+
+
+def read_only_error(*args, **kwargs):
+    raise TypeError('La vista del tablero es de solo lectura: usa copy() para obtener una copia modificable')
+
+
+class ReadOnlyList(list):
+    """
+    Lista de un nodo o terreno de una BoardView. Se comporta como una lista (se compara, se recorre y se convierte a
+    JSON igual), pero cualquier modificación lanza TypeError. copy() devuelve una lista normal.
+    """
+    __slots__ = ()
+
+    append = extend = insert = remove = pop = clear = sort = reverse = read_only_error
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = read_only_error
+
+    def copy(self):
+        return copy_value(list(self))
+
+    def __reduce__(self):
+        # Al copiar o serializar la lista se obtiene una lista normal
+        return list, (self.copy(),)
+
+
+class ReadOnlyDict(dict):
+    """
+    Diccionario dentro de una lista de un nodo (las carreteras). Cualquier modificación lanza TypeError.
+    """
+    __slots__ = ()
+
+    update = pop = popitem = clear = setdefault = read_only_error
+    __setitem__ = __delitem__ = __ior__ = read_only_error
+
+    def copy(self):
+        return copy_value(dict(self))
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+class ReadOnlyItems:
+    """
+    Lista de solo lectura con los nodos o los terrenos de una BoardView.
+    """
+    __slots__ = ('board_view', 'attribute', 'views')
+
+    def __init__(self, board_view, attribute):
+        self.board_view = board_view
+        self.attribute = attribute
+        self.views = {}
+
+    def _items(self):
+        return getattr(self.board_view._board, self.attribute)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        view = self.views.get(index)
+        if view is None:
+            # Se comprueba que el índice existe antes de guardar la vista
+            self._items()[index]
+            view = self.views[index] = ReadOnlyItem(self, index)
+        return view
+
+    def __len__(self):
+        return len(self._items())
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __contains__(self, item):
+        return item in self._items()
+
+    def __setitem__(self, index, value):
+        self.board_view.fork()
+        self._items()[index] = value
+
+
+class ReadOnlyItem(Mapping):
+    """
+    Nodo o terreno de solo lectura. Las listas se devuelven como ReadOnlyList. Asignar una clave separa la BoardView
+    del tablero de la partida y hace el cambio sobre su copia.
+
+    Es un Mapping, no un dict: isinstance(node, dict) es False y json.dumps(node) falla. copy() (o copy(node),
+    deepcopy(node)) devuelve el nodo como un diccionario normal.
+    """
+    __slots__ = ('parent', 'index')
+
+    def __init__(self, parent, index):
+        self.parent = parent
+        self.index = index
+
+    def _item(self):
+        return self.parent._items()[self.index]
+
+    def __getitem__(self, key):
+        return read_only_value(self._item()[key])
+
+    def __setitem__(self, key, value):
+        self.parent.board_view.fork()
+        self._item()[key] = value
+
+    def __iter__(self):
+        return iter(self._item())
+
+    def __len__(self):
+        return len(self._item())
+
+    def copy(self):
+        """
+        :return: dict Copia modificable del nodo o terreno.
+        """
+        return {key: copy_value(self._item()[key]) for key in self._item()}
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+    def __repr__(self):
+        return repr(self.copy())
@@ -0,0 +1,139 @@
+class BuildFrontier:
+    """
+    Clase que mantiene de forma incremental dónde puede construir cada jugador, para que Board.valid_town_nodes,
+    Board.valid_city_nodes y Board.valid_road_nodes no tengan que recorrer el tablero entero cada vez que se llaman.
+
+    Cada vez que cambia un nodo solo se recalculan ese nodo y los que lo tienen como adyacente. Las reglas son las
+    mismas que las de los métodos originales de Board, incluidas sus particularidades.
+
+    town_nodes: {player_id: {node_id...}} Nodos donde cada jugador puede construir un pueblo.
+    city_nodes: {player_id: {node_id...}} Pueblos que cada jugador puede convertir en ciudad.
+    road_edges: {player_id: {(starting_node, finishing_node)...}} Carreteras que puede construir cada jugador.
+    node_town_players: [{player_id...}...] Jugadores que pueden construir un pueblo en cada nodo.
+    node_city_player: [int...] Jugador que puede construir una ciudad en cada nodo (-1 si nadie).
+    edge_player: {(starting_node, finishing_node): player_id} Jugador que puede construir cada carretera.
+    adjacent_to: [[node_id...]...] Nodos que tienen a cada nodo en su lista de adyacentes.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.town_nodes = {}
+        self.city_nodes = {}
+        self.road_edges = {}
+        self.node_town_players = [set() for _ in board.nodes]
+        self.node_city_player = [-1 for _ in board.nodes]
+        self.edge_player = {}
+
+        self.adjacent_to = [[] for _ in board.nodes]
+        for node in board.nodes:
+            for adjacent_id in node['adjacent']:
+                self.adjacent_to[adjacent_id].append(node['id'])
+
+        for node in board.nodes:
+            self.on_node_changed(node['id'])
+        return
+
+    def on_node_changed(self, node_id):
+        """
+        Se llama cada vez que cambia un nodo del tablero. Recalcula los pueblos, ciudades y carreteras que dependen de
+        ese nodo.
+        :param node_id: (int) Id del nodo que ha cambiado.
+        :return: None
+        """
+        self._update_town_node(node_id)
+        for dependent_id in self.adjacent_to[node_id]:
+            self._update_town_node(dependent_id)
+            self._update_road_edge(node_id, dependent_id)
+        self._update_city_node(node_id)
+        return
+
+    def _update_town_node(self, node_id):
+        """
+        Un jugador puede construir un pueblo en un nodo libre, sin pueblos adyacentes, al que llega una de sus
+        carreteras.
+        :param node_id: (int) Id del nodo.
+        :return: None
+        """
+        node = self.board.nodes[node_id]
+        players = set()
+        if node['player'] == -1 and self.board.empty_adjacent_nodes(node_id):
+            players = {road['player_id'] for road in node['roads']}
+
+        for player_id in self.node_town_players[node_id] - players:
+            self.town_nodes[player_id].discard(node_id)
+        for player_id in players - self.node_town_players[node_id]:
+            self.town_nodes.setdefault(player_id, set()).add(node_id)
+        self.node_town_players[node_id] = players
+        return
+
+    def _update_city_node(self, node_id):
+        """
+        Un jugador puede construir una ciudad en cualquiera de sus pueblos.
+        :param node_id: (int) Id del nodo.
+        :return: None
+        """
+        node = self.board.nodes[node_id]
+        player_id = node['player'] if not node['has_city'] else -1
+
+        if player_id != self.node_city_player[node_id]:
+            if self.node_city_player[node_id] != -1:
+                self.city_nodes[self.node_city_player[node_id]].discard(node_id)
+            if player_id != -1:
+                self.city_nodes.setdefault(player_id, set()).add(node_id)
+            self.node_city_player[node_id] = player_id
+        return
+
+    def _update_road_edge(self, starting_node_id, finishing_node_id):
+        """
+        Igual que en Board.valid_road_nodes, se puede construir desde el nodo inicial si es del jugador o está libre,
+        no hay ya una carretera hacia el nodo final y la última carretera construida en el nodo inicial es del
+        jugador.
+        :param starting_node_id: (int) Id del nodo inicial.
+        :param finishing_node_id: (int) Id del nodo final.
+        :return: None
+        """
+        starting_node = self.board.nodes[starting_node_id]
+        roads = starting_node['roads']
+        player_id = -1
+        if roads and all(road['node_id'] != finishing_node_id for road in roads):
+            if starting_node['player'] in [roads[-1]['player_id'], -1]:
+                player_id = roads[-1]['player_id']
+
+        edge = (starting_node_id, finishing_node_id)
+        last_player_id = self.edge_player.get(edge, -1)
+        if player_id != last_player_id:
+            if last_player_id != -1:
+                self.road_edges[last_player_id].discard(edge)
+            if player_id != -1:
+                self.road_edges.setdefault(player_id, set()).add(edge)
+                self.edge_player[edge] = player_id
+            else:
+                del self.edge_player[edge]
+        return
+
+    def get_town_nodes(self, player_id):
+        """
+        :param player_id: (int) Id del jugador.
+        :return: [int...] Nodos donde el jugador puede construir un pueblo, en orden.
+        """
+        return sorted(self.town_nodes.get(player_id, ()))
+
+    def get_city_nodes(self, player_id):
+        """
+        :param player_id: (int) Id del jugador.
+        :return: [int...] Nodos donde el jugador puede construir una ciudad, en orden.
+        """
+        return sorted(self.city_nodes.get(player_id, ()))
+
+    def get_road_nodes(self, player_id):
+        """
+        Devuelve las carreteras en el mismo orden que las recorre Board.valid_road_nodes: por nodo final y después
+        por la posición del nodo inicial entre los adyacentes del final.
+        :param player_id: (int) Id del jugador.
+        :return: [{'starting_node': int, 'finishing_node': int}, ...]
+        """
+        nodes = self.board.nodes
+        edges = sorted(self.road_edges.get(player_id, ()),
+                       key=lambda edge: (edge[1], nodes[edge[1]]['adjacent'].index(edge[0])))
+        return [{'starting_node': starting_node_id, 'finishing_node': finishing_node_id}
+                for starting_node_id, finishing_node_id in edges]
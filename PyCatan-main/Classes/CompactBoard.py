@@ -0,0 +1,399 @@
+import random
+from array import array
+
+from Classes.Board import Board, ADJACENT_NODES, CONTACTING_NODES, CONTACTING_TERRAIN, COASTAL_MASK, EDGE_IDS, \
+    EDGES, HARBORS, NODE_COUNT, NODE_EDGES, PROBABILITIES, TERRAIN_COUNT, TERRAIN_TYPES
+from Classes.BoardView import ReadOnlyDict, ReadOnlyList
+from Classes.Constants import HarborConstants, TerrainConstants
+
+# Ladrón al empezar la partida: en el desierto
+THIEF_TERRAIN = next(terrain_id for terrain_id, probability in PROBABILITIES.items() if probability == 7)
+
+
+class CompactNode:
+    """
+    Vista de un nodo de CompactBoard que se comporta como los diccionarios de Board.nodes: node['player'],
+    node['roads'], etc. Lee y escribe directamente en los arrays del tablero.
+
+    node['roads'] se calcula a partir de las carreteras del tablero, así que se devuelve como ReadOnlyList:
+    node['roads'].append(...) lanza TypeError en lugar de perderse. Para cambiar las carreteras hay que asignar la lista
+    entera (node['roads'] = [...]) o usar build_road. Como cada carretera es una sola arista entre dos nodos, asignar
+    las carreteras de un nodo cambia también las de los nodos del otro extremo (en Board cada nodo tiene su lista).
+    """
+    __slots__ = ('board', 'id')
+
+    KEYS = ('id', 'adjacent', 'harbor', 'roads', 'has_city', 'player', 'contacting_terrain')
+
+    def __init__(self, board, node_id):
+        self.board = board
+        self.id = node_id
+
+    def __getitem__(self, key):
+        if key == 'player':
+            return self.board.owner[self.id]
+        if key == 'roads':
+            return self.board.node_roads(self.id)
+        if key == 'has_city':
+            return bool(self.board.city[self.id])
+        if key == 'id':
+            return self.id
+        if key == 'adjacent':
+            return list(ADJACENT_NODES[self.id])
+        if key == 'harbor':
+            return HARBORS.get(self.id, HarborConstants.NONE)
+        if key == 'contacting_terrain':
+            return list(CONTACTING_TERRAIN[self.id])
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'player':
+            self.board.owner[self.id] = value
+        elif key == 'has_city':
+            self.board.city[self.id] = bool(value)
+        elif key == 'roads':
+            self.board.set_node_roads(self.id, value)
+            return
+        else:
+            raise KeyError(key)
+        self.board.node_changed(self.id)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def items(self):
+        return [(key, self[key]) for key in self.KEYS]
+
+    def __to_object__(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.__to_object__())
+
+
+class CompactTerrain:
+    """
+    Vista de una ficha de terreno de CompactBoard que se comporta como los diccionarios de Board.terrain.
+    """
+    __slots__ = ('board', 'id')
+
+    KEYS = ('id', 'has_thief', 'probability', 'terrain_type', 'contacting_nodes')
+
+    def __init__(self, board, terrain_id):
+        self.board = board
+        self.id = terrain_id
+
+    def __getitem__(self, key):
+        if key == 'has_thief':
+            return self.board.thief == self.id
+        if key == 'probability':
+            return PROBABILITIES[self.id] if self.id != THIEF_TERRAIN else 0
+        if key == 'terrain_type':
+            return TERRAIN_TYPES[self.id]
+        if key == 'id':
+            return self.id
+        if key == 'contacting_nodes':
+            contacting_nodes = CONTACTING_NODES.get(self.id)
+            return list(contacting_nodes) if contacting_nodes is not None else TerrainConstants.DESERT
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key != 'has_thief':
+            raise KeyError(key)
+        if value:
+            self.board.thief = self.id
+        elif self.board.thief == self.id:
+            self.board.thief = -1
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def items(self):
+        return [(key, self[key]) for key in self.KEYS]
+
+    def __to_object__(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.__to_object__())
+
+
+class CompactViews:
+    """
+    Lista de solo lectura con las vistas (CompactNode o CompactTerrain) de un tablero. Las vistas se crean la primera
+    vez que se piden.
+    """
+    __slots__ = ('board', 'view_class', 'views')
+
+    def __init__(self, board, view_class, size):
+        self.board = board
+        self.view_class = view_class
+        self.views = [None] * size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.views)))]
+        view = self.views[index]
+        if view is None:
+            view = self.views[index] = self.view_class(self.board, range(len(self.views))[index])
+        return view
+
+    def __len__(self):
+        return len(self.views)
+
+    def __iter__(self):
+        for index in range(len(self.views)):
+            yield self[index]
+
+    def __to_object__(self):
+        return [view.__to_object__() for view in self]
+
+
+class CompactBoard(Board):
+    """
+    Tablero alternativo guardado en arrays de enteros de tamaño fijo en lugar de listas de diccionarios:
+
+    owner: array[54] Jugador dueño de cada nodo (-1 si no hay pueblo).
+    city: array[54] 1 si el nodo tiene ciudad.
+    edge_owner: array[len(EDGES)] Jugador dueño de cada carretera (-1 si no está construida).
+    edge_order: array[len(EDGES)] Orden en el que se construyó cada carretera (0 si no está construida). Sirve para
+                que node['roads'] devuelva las carreteras en el mismo orden que Board.
+    thief: int Terreno en el que está el ladrón.
+
+    nodes y terrain son vistas que siguen sirviendo node['player'], node['roads'], terrain['has_thief'], etc. a los
+    agentes, así que CompactBoard se comporta igual que Board. Copiar el tablero con snapshot() solo copia los arrays.
+
+    Diferencias con Board: las listas de node['roads'] son de solo lectura (ver CompactNode) y solo se pueden construir
+    carreteras entre nodos adyacentes, mientras que Board.build_road acepta cualquier par de nodos.
+    """
+
+    # La topología (contacting_nodes, probabilities...) la hereda de Board
+
+    def __init__(self):
+        self.owner = array('b', [-1] * NODE_COUNT)
+        self.city = array('b', [0] * NODE_COUNT)
+        self.edge_owner = array('b', [-1] * len(EDGES))
+        self.edge_order = array('i', [0] * len(EDGES))
+        self.roads_built = 0
+        self.thief = THIEF_TERRAIN
+
+        self._reset_views()
+        return
+
+    def _reset_views(self):
+        self.nodes = CompactViews(self, CompactNode, NODE_COUNT)
+        self.terrain = CompactViews(self, CompactTerrain, TERRAIN_COUNT)
+        self.node_listeners = []
+
+    def snapshot(self):
+        """
+        Devuelve una copia independiente del tablero. Solo se copian los arrays.
+        :return: CompactBoard()
+        """
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board.owner = self.owner[:]
+        board.city = self.city[:]
+        board.edge_owner = self.edge_owner[:]
+        board.edge_order = self.edge_order[:]
+        board._reset_views()
+        return board
+
+    def __deepcopy__(self, memo):
+        return self.snapshot()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('nodes', 'terrain', 'node_listeners'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_views()
+
+    def get_board(self):
+        return self.__class__()
+
+    def node_roads(self, node_id):
+        """
+        Carreteras que salen del nodo en el mismo formato y orden que Board: por orden de construcción.
+        :param node_id: (int) Id del nodo.
+        :return: [{'player_id': int, 'node_id': int}...]
+        """
+        built = [(self.edge_order[edge_id], edge_id, end) for edge_id, end in NODE_EDGES[node_id]
+                 if self.edge_owner[edge_id] != -1]
+        built.sort()
+        return ReadOnlyList(ReadOnlyDict(player_id=self.edge_owner[edge_id], node_id=end) for _, edge_id, end in built)
+
+    def set_node_roads(self, node_id, roads):
+        """
+        Cambia las carreteras que salen de un nodo (node['roads'] = roads). Las que ya estaban conservan su orden; las
+        nuevas se añaden al final en el orden de la lista. Lanza ValueError si algún nodo no es adyacente.
+        :param node_id: (int) Id del nodo.
+        :param roads: [{'player_id': int, 'node_id': int}...] Carreteras nuevas del nodo.
+        :return: None
+        """
+        owners = {}
+        for road in roads:
+            edge_id = EDGE_IDS.get((node_id, road['node_id']))
+            if edge_id is None:
+                raise ValueError(f"Los nodos {node_id} y {road['node_id']} no son adyacentes")
+            owners[edge_id] = road['player_id']
+
+        changed_nodes = {node_id}
+        for edge_id, end in NODE_EDGES[node_id]:
+            owner = owners.get(edge_id, -1)
+            if self.edge_owner[edge_id] == owner:
+                continue
+            self.edge_owner[edge_id] = owner
+            if owner == -1:
+                self.edge_order[edge_id] = 0
+            changed_nodes.add(end)
+        for edge_id in owners:
+            if self.edge_order[edge_id] == 0:
+                self.roads_built += 1
+                self.edge_order[edge_id] = self.roads_built
+
+        for changed_node in sorted(changed_nodes):
+            self.node_changed(changed_node)
+        return
+
+    def _has_road(self, player, node_id):
+        return any(self.edge_owner[edge_id] == player for edge_id, _ in NODE_EDGES[node_id])
+
+    def build_town(self, player, node=-1):
+        """
+        Construye un pueblo.
+        :param player: id del jugador.
+        :param node: id del nodo.
+        :return: {bool, string}. Devuelve si se ha podido o no construir el poblado, y en caso de no el porqué
+        """
+        if self.owner[node] != -1:
+            return {'response': False, 'error_msg': 'No se puede construir en un nodo que le pertenece a otro jugador'}
+
+        if not self.empty_adjacent_nodes(node):
+            return {'response': False, 'error_msg': 'Hay un pueblo o ciudad muy cercano al nodo'}
+
+        if not self._has_road(player, node):
+            return {'response': False,
+                    'error_msg': 'Debes poseer una carretera hasta el nodo para poder construir un pueblo'}
+
+        self.owner[node] = player
+        self.city[node] = 0
+        self.node_changed(self.nodes[node].id)
+        return {'response': True, 'error_msg': ''}
+
+    def build_city(self, player, node=-1):
+        """
+        Permite construir una ciudad por el jugador especificado en el cruce escrito
+        :param player: Número que representa al jugador
+        :param node: Número que representa un nodo en el tablero
+        :return: {bool, string}. Envía si se ha podido construir la ciudad y en caso de no haberse podido el porqué
+        """
+        if self.owner[node] != player:
+            return {'response': False, 'error_msg': 'Ya posee el nodo otro jugador'}
+
+        if self.owner[node] == -1:
+            return {'response': False, 'error_msg': 'Primero debe construirse un poblado'}
+
+        if self.city[node]:
+            return {'response': False, 'error_msg': 'Ya hay una ciudad tuya en el nodo'}
+
+        self.city[node] = 1
+        self.node_changed(self.nodes[node].id)
+        return {'response': True, 'error_msg': ''}
+
+    def build_road(self, player, start=-1, end=-1):
+        """
+        Permite construir una carretera por el jugador especificado en la carretera especificada
+        :param player: Número que representa al jugador
+        :param start: Nodo desde el que se inicia la carretera
+        :param end: Nodo al que llega la carretera. Debe ser adyacente
+        :return: {bool, string}. Envía si se ha podido construir la carretera y en caso de no haberse podido el porqué
+        """
+        # A diferencia de Board.build_road, que no comprueba la adyacencia, aquí solo se pueden construir las
+        # carreteras de EDGES: entre dos nodos no adyacentes no hay arista donde guardarla
+        start, end = self.nodes[start].id, self.nodes[end].id
+        edge_id = EDGE_IDS.get((start, end))
+        if edge_id is None:
+            return {'response': False, 'error_msg': 'Los nodos no son adyacentes'}
+
+        if self.edge_owner[edge_id] != -1:
+            return {'response': False, 'error_msg': 'Ya hay una carretera aquí'}
+
+        if not (self._has_road(player, start) or self.owner[start] == player):
+            return {'response': False, 'error_msg': 'No puedes hacer una carretera aquí,' +
+                        ' no hay una carretera, ciudad o pueblo adyacente que te pertenezca.'}
+
+        self.roads_built += 1
+        self.edge_owner[edge_id] = player
+        self.edge_order[edge_id] = self.roads_built
+        self.node_changed(start)
+        self.node_changed(end)
+        return {'response': True, 'error_msg': ''}
+
+    def move_thief(self, terrain_id, rng=random):
+        """
+        Permite mover el ladrón a la casilla de terreno especificada
+        :param terrain_id: Número que representa un hexágono en el tablero
+        :param rng: Generador aleatorio con el que se elige la casilla si se intenta dejar el ladrón donde está
+        :return: {bool, string}. Envía si se ha podido move al ladrón y en caso de no haberse podido el porqué
+        """
+        if self.thief == self.terrain[terrain_id].id:
+            rand_terrain = terrain_id
+            while rand_terrain == terrain_id:
+                rand_terrain = rng.randint(0, 18)
+
+            self.thief = rand_terrain
+            return {'response': False,
+                    'error_msg': 'No se puede mover al ladrón a la misma casilla, movido a una casilla aleatoria',
+                    'terrain_id': rand_terrain,
+                    'last_thief_terrain': terrain_id}
+
+        last_terrain = self.thief
+        self.thief = self.terrain[terrain_id].id
+        return {'response': True,
+                'error_msg': '',
+                'terrain_id': terrain_id,
+                'last_thief_terrain': last_terrain}
+
+    def empty_adjacent_nodes(self, node_id):
+        """
+        Comprueba si los nodos a una casilla de distancia del node_id tienen pueblo o ciudad
+        :param node_id:
+        :return: bool
+        """
+        return all(self.owner[adjacent_id] == -1 for adjacent_id in ADJACENT_NODES[node_id])
+
+    def valid_starting_nodes(self):
+        """
+        Devuelve un array con el ID de todos los nodos viables para el posicionamiento inicial.
+        :return: [int]
+        """
+        return [node_id for node_id in range(NODE_COUNT)
+                if self.owner[node_id] == -1 and self.empty_adjacent_nodes(node_id) and
+                not self.is_coastal_node(node_id)]
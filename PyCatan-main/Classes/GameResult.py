@@ -0,0 +1,71 @@
+class GameResult:
+    """
+    Clase que representa el resultado de una partida, sin la traza. Es lo que devuelve GameDirector.game_start en modo
+    rápido o con return_result=True. Solo contiene enteros y listas, así que es barato de serializar (por ejemplo para
+    devolverlo desde otro proceso).
+
+    victory_points: [int, int, int, int] Puntos de victoria de cada jugador al acabar la partida.
+    hidden_victory_points: [int, int, int, int] Puntos de victoria ocultos (cartas de punto de victoria) de cada jugador.
+    winner: int Jugador con más puntos de victoria (en caso de empate, el de menor id).
+    finished: bool Si algún jugador ha ganado antes de llegar al máximo de rondas.
+    rounds: int Rondas jugadas.
+    turns: int Turnos jugados.
+    largest_army: int Jugador con el ejército más grande (-1 si nadie).
+    longest_road: int Jugador con la carretera más larga (-1 si nadie).
+    elapsed_time: float Segundos que ha durado la partida.
+    seed: Semilla con la que se ha jugado la partida, o None si se usó el estado global de random.
+    agent_timeouts: [int, int, int, int] Veces que cada agente se ha pasado de su tiempo (ver AgentTimeBudget).
+    """
+
+    def __init__(self, victory_points=None, finished=False, rounds=0, largest_army=-1, longest_road=-1,
+                 hidden_victory_points=None, turns=0, elapsed_time=0.0, seed=None, agent_timeouts=None):
+        self.victory_points = victory_points if victory_points is not None else [0, 0, 0, 0]
+        self.hidden_victory_points = hidden_victory_points if hidden_victory_points is not None else [0, 0, 0, 0]
+        self.winner = max(range(len(self.victory_points)), key=lambda player_id: self.victory_points[player_id])
+        self.finished = finished
+        self.rounds = rounds
+        self.turns = turns
+        self.largest_army = largest_army
+        self.longest_road = longest_road
+        self.elapsed_time = elapsed_time
+        self.seed = seed
+        self.agent_timeouts = agent_timeouts if agent_timeouts is not None else [0, 0, 0, 0]
+        return
+
+    @classmethod
+    def from_game_manager(cls, game_manager, finished, rounds, elapsed_time=0.0):
+        """
+        Crea el resultado a partir del estado del GameManager al acabar la partida.
+        :param game_manager: GameManager()
+        :param finished: (bool) Si algún jugador ha ganado.
+        :param rounds: (int) Rondas jugadas.
+        :param elapsed_time: (float) Segundos que ha durado la partida.
+        :return: GameResult()
+        """
+        players = game_manager.get_players()
+        largest_army = next((player['id'] for player in players if player['largest_army'] == 1), -1)
+        longest_road = next((player['id'] for player in players if player['longest_road'] == 1), -1)
+        agent_timeouts = [0, 0, 0, 0]
+        for timeout in game_manager.agent_timeouts:
+            agent_timeouts[timeout['player']] += 1
+        return cls([player['victory_points'] for player in players], finished, rounds, largest_army, longest_road,
+                   [player['hidden_victory_points'] for player in players], game_manager.get_turn(), elapsed_time,
+                   game_manager.random_streams.seed, agent_timeouts)
+
+    def rank(self, player_id):
+        """
+        Posición del jugador (1 a 4) ordenando por puntos de victoria. En caso de empate va antes el de menor id.
+        :param player_id: (int) Id del jugador.
+        :return: int
+        """
+        ranking = sorted(range(len(self.victory_points)), key=lambda i: self.victory_points[i], reverse=True)
+        return ranking.index(player_id) + 1
+
+    def __str__(self):
+        return f"GameResult: {self.victory_points} winner: J{self.winner} rounds: {self.rounds}"
+
+    def __to_object__(self):
+        return {'victory_points': self.victory_points, 'hidden_victory_points': self.hidden_victory_points,
+                'winner': self.winner, 'finished': self.finished, 'rounds': self.rounds, 'turns': self.turns,
+                'largest_army': self.largest_army, 'longest_road': self.longest_road,
+                'elapsed_time': self.elapsed_time, 'seed': self.seed, 'agent_timeouts': self.agent_timeouts}
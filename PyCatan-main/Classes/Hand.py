@@ -17,11 +17,24 @@ class Hand:
         :param amount: (int) cantidad del recurso a añadir.
         :return: None
         """
+        if isinstance(resource_id, int):
+            self.resources = self.resources.add_material(resource_id, amount)
+            return
+
         materials = Materials.from_ids(resource_id, amount)
         materials = materials + self.resources
         self.resources = materials.replace_negative()
 
 
+    def add_materials(self, materials):
+        """
+        Suma de una vez todos los materiales indicados (si alguno es negativo lo resta).
+        :param materials: (Materials()) materiales a añadir.
+        :return: None
+        """
+        self.resources = (self.resources + materials).replace_negative()
+
+
     def remove_material(self, resource, amount):
         """
         Resta amount al material o materiales seleccionados (si es negativo lo suma).
@@ -0,0 +1,129 @@
+class LongestRoadTracker:
+    """
+    Clase que mantiene de forma incremental la carretera más larga del tablero.
+
+    Guarda, para cada nodo, el resultado de calcular la carretera más larga empezando desde él (el mismo recorrido que
+    GameManager.longest_road_calculator) y solo lo recalcula cuando cambia la red de carreteras que pasa por ese nodo.
+
+    road_graphs: {player_id: {node_id: {node_id...}}} Grafo de carreteras de cada jugador.
+    node_roads: [{(int, int)...}...] Carreteras (jugador, nodo destino) que tenía cada nodo la última vez que cambió.
+    node_owners: [int...] Último dueño conocido de cada nodo, para saber cuándo un pueblo corta una carretera.
+    longest_roads: [(int, int)...] Resultado (longitud, jugador) del recorrido que empieza en cada nodo.
+    dirty_nodes: {int...} Nodos cuyo resultado hay que recalcular.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.road_graphs = {}
+        self.node_roads = [set() for _ in board.nodes]
+        self.node_owners = [-1 for _ in board.nodes]
+        self.longest_roads = [(0, -1) for _ in board.nodes]
+        self.dirty_nodes = set()
+        self.longest_road = None
+
+        for node in board.nodes:
+            self.on_node_changed(node['id'])
+        return
+
+    def on_node_changed(self, node_id):
+        """
+        Se llama cada vez que cambia un nodo del tablero (su dueño o sus carreteras). Marca como pendientes de
+        recalcular las redes de los jugadores afectadas por el cambio.
+        :param node_id: (int) Id del nodo que ha cambiado.
+        :return: None
+        """
+        node = self.board.nodes[node_id]
+        affected_players = set()
+
+        roads = {(road['player_id'], road['node_id']) for road in node['roads']}
+        for player_id, end in self.node_roads[node_id] - roads:
+            # Carretera quitada. La red de antes de quitarla incluye los dos trozos en los que puede quedar partida
+            self.dirty_nodes.update(self._road_network(player_id, node_id))
+            if (player_id, node_id) not in self.node_roads[end]:
+                graph = self.road_graphs[player_id]
+                graph[node_id].discard(end)
+                graph[end].discard(node_id)
+            self.longest_road = None
+        self.node_roads[node_id] = roads
+
+        for player_id, end in roads:
+            graph = self.road_graphs.setdefault(player_id, {})
+            neighbours = graph.setdefault(node_id, set())
+            if end not in neighbours:
+                neighbours.add(end)
+                graph.setdefault(end, set()).add(node_id)
+                affected_players.add(player_id)
+
+        # Un pueblo nuevo puede cortar la carretera de cualquier jugador que pase por el nodo
+        if node['player'] != self.node_owners[node_id]:
+            self.node_owners[node_id] = node['player']
+            affected_players.update(road['player_id'] for road in node['roads'])
+
+        for player_id in affected_players:
+            self.dirty_nodes.update(self._road_network(player_id, node_id))
+
+        if affected_players:
+            self.longest_road = None
+        return
+
+    def _road_network(self, player_id, node_id):
+        """
+        Devuelve todos los nodos conectados a node_id por carreteras del jugador.
+        :param player_id: (int) Id del jugador.
+        :param node_id: (int) Id del nodo.
+        :return: {int...}
+        """
+        graph = self.road_graphs[player_id]
+        network = {node_id}
+        pending = [node_id]
+        while pending:
+            for neighbour in graph.get(pending.pop(), ()):
+                if neighbour not in network:
+                    network.add(neighbour)
+                    pending.append(neighbour)
+        return network
+
+    def _longest_road_from(self, node_id):
+        """
+        Calcula la carretera más larga empezando en node_id. Hace exactamente el mismo recorrido que
+        GameManager.longest_road_calculator para que el resultado sea idéntico.
+        :param node_id: (int) Id del nodo desde el que se empieza.
+        :return: (int, int) longitud y jugador
+        """
+        nodes = self.board.nodes
+        visited = {node_id}
+        longest_road = [0, -1]
+
+        def explore(node, depth, player_id):
+            for road in node['roads']:
+                if ((road['node_id'] not in visited) and (road['player_id'] == player_id or player_id == -1) and
+                        (road['player_id'] == node['player'] or node['player'] == -1)):
+                    visited.add(road['node_id'])
+
+                    if depth > longest_road[0]:
+                        longest_road[0] = depth
+                        longest_road[1] = player_id
+
+                    explore(nodes[road['node_id']], depth + 1, road['player_id'])
+
+        explore(nodes[node_id], 1, -1)
+        return longest_road[0], longest_road[1]
+
+    def get_longest_road(self):
+        """
+        Devuelve la carretera más larga del tablero. En caso de empate gana el nodo de menor id, igual que al recorrer
+        todos los nodos con GameManager.longest_road_calculator.
+        :return: {'longest_road': int, 'player': int}
+        """
+        if self.longest_road is None:
+            for node_id in self.dirty_nodes:
+                self.longest_roads[node_id] = self._longest_road_from(node_id)
+            self.dirty_nodes.clear()
+
+            longest_road = (0, -1)
+            for node_longest_road in self.longest_roads:
+                if node_longest_road[0] > longest_road[0]:
+                    longest_road = node_longest_road
+            self.longest_road = longest_road
+
+        return {'longest_road': self.longest_road[0], 'player': self.longest_road[1]}
@@ -18,8 +18,12 @@ class Materials(NamedTuple):
     @classmethod
     def from_ids(cls, ids, amount = 1):
         if isinstance(ids, int):
-            ids = [ids]
-        return Materials(*[amount * ids.count(id) for id in range(5)])
+            # Camino rápido para un solo material, el caso más habitual
+            materials = [0, 0, 0, 0, 0]
+            if 0 <= ids < 5:
+                materials[ids] = amount
+            return _new_materials(materials)
+        return _new_materials([amount * ids.count(id) for id in range(5)])
         
     @classmethod
     def from_iterable(cls, iterable):
@@ -29,16 +33,21 @@ class Materials(NamedTuple):
     def from_building(cls, building):
         if building not in bmc.keys():
             return False
-        return cls.from_iterable(bmc[building])
+        return _BUILDING_MATERIALS[building]
 
     def replace_negative(self):
-        return Materials(*[0 if n < 0 else n for n in self])
+        # Como es inmutable, si no hay negativos se puede devolver el mismo objeto
+        cereal, mineral, clay, wood, wool = self
+        if cereal >= 0 and mineral >= 0 and clay >= 0 and wood >= 0 and wool >= 0:
+            return self
+        return _new_materials((cereal if cereal > 0 else 0, mineral if mineral > 0 else 0, clay if clay > 0 else 0,
+                               wood if wood > 0 else 0, wool if wool > 0 else 0))
 
     def is_empty(self):
-        return all([n == 0 for n in self])
+        return not any(self)
 
     def check_negative(self):
-        return any([n < 0 for n in self])
+        return min(self) < 0
 
     def get_from_id(self, material_constant):
         return self[material_constant]
@@ -58,8 +67,23 @@ class Materials(NamedTuple):
         """
         if isinstance(materials, str):
             materials = Materials.from_building(materials)
-            
-        return all(materials <= self)
+
+        cereal, mineral, clay, wood, wool = self
+        return (materials[0] <= cereal and materials[1] <= mineral and materials[2] <= clay and
+                materials[3] <= wood and materials[4] <= wool)
+
+    def add_material(self, material_id, amount):
+        """
+        Suma amount a un solo material y quita los negativos. Es lo mismo que
+        (self + Materials.from_ids(material_id, amount)).replace_negative() sin crear objetos intermedios.
+        :param material_id: (int) Id del material.
+        :param amount: (int) Cantidad a sumar (negativa para restar).
+        :return: Materials()
+        """
+        materials = list(self)
+        if 0 <= material_id < 5:
+            materials[material_id] += amount
+        return _new_materials([n if n > 0 else 0 for n in materials])
     
     def __str__(self):
         material_icons = ["🥖", "🪨", "🧱", "🪵", "🧶"]
@@ -90,14 +114,30 @@ class Materials(NamedTuple):
     def __ge__(self, other):
         return map(op.ge, self, other)
 
+    # Suma y resta crean la tupla directamente, sin pasar por map() ni por Materials.__new__
     def __sub__(self, other):
-        return Materials(*map(op.sub, self, other))
+        return _new_materials((self[0] - other[0], self[1] - other[1], self[2] - other[2], self[3] - other[3],
+                               self[4] - other[4]))
     
     def __add__(self, other):
-        return Materials(*map(op.add, self, other))
+        return _new_materials((self[0] + other[0], self[1] + other[1], self[2] + other[2], self[3] + other[3],
+                               self[4] + other[4]))
     
     def __mul__(self, other):
         return Materials(*map(op.mul, self, other))
     
     def __rmul__(self, other):
-        return self.__mul__(other)
\ No newline at end of file
+        return self.__mul__(other)
+
+
+def _new_materials(iterable):
+    """
+    Crea un Materials() a partir de 5 enteros sin comprobar los argumentos, más rápido que Materials(*iterable).
+    :param iterable: 5 enteros.
+    :return: Materials()
+    """
+    return tuple.__new__(Materials, iterable)
+
+
+# Materiales de cada construcción, para no crearlos cada vez que se consultan
+_BUILDING_MATERIALS = {building: Materials(*materials) for building, materials in bmc.items()}
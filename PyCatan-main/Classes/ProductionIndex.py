@@ -0,0 +1,80 @@
+from Classes.Materials import Materials
+
+
+class ProductionIndex:
+    """
+    Clase que relaciona cada tirada de dados con los materiales que produce a cada jugador. Se actualiza de forma
+    incremental cada vez que cambia un nodo del tablero (se construye un pueblo o una ciudad), así que repartir
+    materiales es solo una consulta.
+
+    production: {dice: {player_id: [int, int, int, int, int]}} Materiales que recibe cada jugador con cada tirada.
+    node_production: [(int, int)...] Jugador y cantidad que aporta actualmente cada nodo a sus terrenos.
+    payouts: {dice: {player_id: Materials()}} Caché de production convertida a Materials().
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.production = {dice: {} for dice in range(2, 13)}
+        self.node_production = [(-1, 0) for _ in board.nodes]
+        self.payouts = {}
+
+        for node in board.nodes:
+            self.on_node_changed(node['id'])
+        return
+
+    def on_node_changed(self, node_id):
+        """
+        Se llama cada vez que cambia un nodo del tablero. Actualiza lo que aporta el nodo a cada tirada.
+        :param node_id: (int) Id del nodo que ha cambiado.
+        :return: None
+        """
+        node = self.board.nodes[node_id]
+        player_id = node['player']
+        # Si tiene ciudad se dan 2 en lugar de 1 material
+        amount = 0 if player_id == -1 else (2 if node['has_city'] else 1)
+
+        if self.node_production[node_id] != (player_id, amount):
+            last_player_id, last_amount = self.node_production[node_id]
+            self._add_node_production(node_id, last_player_id, -last_amount)
+            self._add_node_production(node_id, player_id, amount)
+            self.node_production[node_id] = (player_id, amount)
+        return
+
+    def _add_node_production(self, node_id, player_id, amount):
+        """
+        Suma amount a lo que recibe el jugador por cada terreno con el que hace contacto el nodo.
+        :param node_id: (int) Id del nodo.
+        :param player_id: (int) Id del jugador.
+        :param amount: (int) Cantidad a sumar (negativa para restar).
+        :return: None
+        """
+        if player_id == -1 or amount == 0:
+            return
+
+        for terrain_id in self.board.nodes[node_id]['contacting_terrain']:
+            terrain = self.board.terrain[terrain_id]
+            if terrain['probability'] not in self.production:
+                continue
+
+            dice_production = self.production[terrain['probability']]
+            player_production = dice_production.setdefault(player_id, [0, 0, 0, 0, 0])
+            player_production[terrain['terrain_type']] += amount
+            if not any(player_production):
+                del dice_production[player_id]
+
+            self.payouts.pop(terrain['probability'], None)
+        return
+
+    def get_production(self, dice_roll):
+        """
+        Devuelve los materiales que recibe cada jugador con la tirada indicada.
+        :param dice_roll: (int) Resultado de los dados.
+        :return: {player_id: Materials()}
+        """
+        if dice_roll not in self.production:
+            return {}
+
+        if dice_roll not in self.payouts:
+            self.payouts[dice_roll] = {player_id: Materials(*player_production)
+                                       for player_id, player_production in self.production[dice_roll].items()}
+        return self.payouts[dice_roll]
@@ -0,0 +1,175 @@
+import cProfile
+import marshal
+import os
+import pstats
+import signal
+import threading
+
+
+class ProfileData:
+    """
+    Perfil de ejecución que se puede enviar entre procesos y sumar con el de otros: las estadísticas de cProfile (el
+    mismo diccionario que guarda pstats) y las pilas muestreadas por StackSampler.
+
+    stats: dict Estadísticas de cProfile por función, en el formato de pstats.
+    stacks: {str: int} Número de muestras de cada pila, con las funciones de la raíz a la hoja separadas por ';'.
+    """
+
+    def __init__(self, stats=None, stacks=None):
+        self.stats = stats if stats is not None else {}
+        self.stacks = stacks if stacks is not None else {}
+        return
+
+    def merge(self, other):
+        """
+        Suma a este perfil el de otro proceso.
+        :param other: ProfileData()
+        :return: ProfileData() este mismo perfil
+        """
+        for function, stat in other.stats.items():
+            if function in self.stats:
+                self.stats[function] = pstats.add_func_stats(self.stats[function], stat)
+            else:
+                self.stats[function] = stat
+        for stack, count in other.stacks.items():
+            self.stacks[stack] = self.stacks.get(stack, 0) + count
+        return self
+
+    def dump_stats(self, path):
+        """
+        Guarda las estadísticas de cProfile en un fichero que se puede abrir con pstats.Stats(path) o snakeviz.
+        :param path: Ruta del fichero.
+        :return: None
+        """
+        with open(path, 'wb') as stats_file:
+            marshal.dump(self.stats, stats_file)
+        return
+
+    def write_collapsed(self, path):
+        """
+        Guarda las pilas muestreadas en formato 'collapsed' (una pila y su número de muestras por línea), el que
+        usan flamegraph.pl y speedscope para dibujar flame graphs.
+        :param path: Ruta del fichero.
+        :return: None
+        """
+        with open(path, 'w') as collapsed_file:
+            for stack, count in sorted(self.stacks.items()):
+                collapsed_file.write(f"{stack} {count}\n")
+        return
+
+    def print_stats(self, sort='cumulative', amount=25):
+        """
+        Imprime las funciones que más tiempo han tardado.
+        :param sort: (str) Criterio de ordenación de pstats.
+        :param amount: (int) Número de funciones a mostrar.
+        :return: None
+        """
+        profile_stats = pstats.Stats(ProfileStatsSource(self.stats))
+        profile_stats.sort_stats(sort).print_stats(amount)
+        return
+
+
+class ProfileStatsSource:
+    """
+    Adaptador para crear un pstats.Stats a partir de un diccionario de estadísticas sin pasar por un fichero.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        return
+
+
+class StackSampler:
+    """
+    Perfilador por muestreo: cada interval segundos de CPU (con la señal SIGPROF) guarda la pila de llamadas que se
+    está ejecutando. Su coste no depende del número de llamadas, así que no distorsiona las funciones pequeñas y muy
+    llamadas como hace cProfile. Solo funciona en Unix y desde el hilo principal; en otro caso no hace nada.
+
+    interval: float Segundos de CPU entre muestras.
+    stacks: {str: int} Número de muestras de cada pila.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = {}
+        self.previous_handler = None
+        self.running = False
+        return
+
+    @staticmethod
+    def can_sample():
+        return (hasattr(signal, 'SIGPROF') and hasattr(signal, 'setitimer') and
+                threading.current_thread() is threading.main_thread())
+
+    @staticmethod
+    def frame_name(frame):
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def on_sample(self, signal_number, frame):
+        names = []
+        while frame is not None:
+            names.append(self.frame_name(frame))
+            frame = frame.f_back
+        stack = ';'.join(reversed(names))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def start(self):
+        """
+        :return: None
+        """
+        if self.running or not self.can_sample():
+            return
+        self.previous_handler = signal.signal(signal.SIGPROF, self.on_sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.running = True
+        return
+
+    def stop(self):
+        """
+        :return: None
+        """
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self.previous_handler)
+        self.running = False
+        return
+
+
+class Profiler:
+    """
+    Perfila un bloque de código con cProfile y con StackSampler a la vez:
+
+        with Profiler() as profiler:
+            ...
+        profile_data = profiler.profile_data()
+
+    sample_interval: float/None Segundos de CPU entre muestras de pilas, o None para no muestrear.
+    """
+
+    def __init__(self, sample_interval=0.005):
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(sample_interval) if sample_interval else None
+        return
+
+    def __enter__(self):
+        if self.sampler is not None:
+            self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        return False
+
+    def profile_data(self):
+        """
+        :return: ProfileData() con lo medido.
+        """
+        self.profile.create_stats()
+        return ProfileData(self.profile.stats, dict(self.sampler.stacks) if self.sampler is not None else {})
@@ -0,0 +1,70 @@
+import random
+from contextlib import nullcontext
+
+
+class RandomStreams:
+    """
+    Generadores aleatorios de una partida. Con una semilla, cada fuente de azar tiene su propio random.Random
+    independiente: los dados, el mazo de cartas de desarrollo, el resto del motor (ladrón, robos, orden de los
+    intercambios, elecciones por defecto) y uno por cada asiento de agente. Así una partida se puede reproducir sola
+    a partir de su semilla, sin depender del estado global de random ni de las partidas jugadas antes en el mismo
+    proceso.
+
+    Sin semilla, todas las fuentes son el módulo random, igual que antes de existir esta clase.
+
+    seed: Semilla de la partida, o None si se usa el estado global de random.
+    dice: Generador para las tiradas de dados.
+    deck: Generador para barajar el mazo de cartas de desarrollo.
+    engine: Generador para el resto de decisiones aleatorias del motor.
+    agents: [random.Random() * 4] Generadores de cada asiento, o None sin semilla.
+    active_seat: int/None Asiento cuyo generador está puesto ahora mismo como estado global de random.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        if seed is None:
+            self.dice = self.deck = self.engine = random
+            self.agents = None
+        else:
+            # Sembrar con una cadena no depende de PYTHONHASHSEED, así que es estable entre procesos
+            self.dice = random.Random(f'{seed}:dice')
+            self.deck = random.Random(f'{seed}:deck')
+            self.engine = random.Random(f'{seed}:engine')
+            self.agents = [random.Random(f'{seed}:agent_{player_id}') for player_id in range(4)]
+        # Asiento cuyo estado está puesto en el módulo random y estado que tenía el módulo antes de ponerlo
+        self.active_seat = None
+        self.outside_state = None
+        return
+
+    def agent(self, player_id):
+        """
+        Contexto en el que se llama a un agente. Los agentes usan el módulo random directamente, así que con semilla
+        el estado global de random pasa a ser el del asiento del agente. Para no copiar el estado en cada llamada, se
+        deja puesto hasta que se llama a un agente de otro asiento o a release(), que devuelve al módulo random el
+        estado que tenía antes de la partida. Sin semilla no hace nada.
+        :param player_id: (int) Asiento del agente.
+        :return: Contexto (no hace nada al salir).
+        """
+        if self.agents is not None and self.active_seat != player_id:
+            if self.active_seat is None:
+                self.outside_state = random.getstate()
+            else:
+                self.agents[self.active_seat].setstate(random.getstate())
+            random.setstate(self.agents[player_id].getstate())
+            self.active_seat = player_id
+        return NO_AGENT_STREAM
+
+    def release(self):
+        """
+        Guarda el estado del asiento activo y devuelve al módulo random el estado que tenía antes de la partida.
+        :return: None
+        """
+        if self.active_seat is not None:
+            self.agents[self.active_seat].setstate(random.getstate())
+            random.setstate(self.outside_state)
+            self.active_seat = None
+            self.outside_state = None
+        return
+
+
+NO_AGENT_STREAM = nullcontext()
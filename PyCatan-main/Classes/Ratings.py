@@ -0,0 +1,72 @@
+class EloRatings:
+    """
+    Puntuaciones Elo para partidas de varios jugadores. Cada partida se trata como un enfrentamiento de cada par de
+    jugadores: gana el par quien acaba con más puntos de victoria (empate si tienen los mismos). Las puntuaciones se
+    actualizan partida a partida, así que se pueden ir calculando según llegan los resultados sin volver a procesar
+    las partidas anteriores.
+
+    ratings: {str: float} Puntuación de cada agente.
+    games: {str: int} Partidas jugadas por cada agente.
+    k_factor: float Cambio máximo de puntuación en una partida.
+    initial_rating: float Puntuación de un agente que aún no ha jugado.
+    """
+
+    def __init__(self, k_factor=32.0, initial_rating=1500.0):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        self.ratings = {}
+        self.games = {}
+        return
+
+    def get_rating(self, agent):
+        """
+        :param agent: (str) Nombre del agente.
+        :return: float
+        """
+        return self.ratings.get(agent, self.initial_rating)
+
+    def expected_score(self, agent, opponent):
+        """
+        Probabilidad de que agent acabe por delante de opponent según sus puntuaciones.
+        :param agent: (str) Nombre del agente.
+        :param opponent: (str) Nombre del rival.
+        :return: float
+        """
+        return 1 / (1 + 10 ** ((self.get_rating(opponent) - self.get_rating(agent)) / 400))
+
+    def update(self, agents, victory_points):
+        """
+        Actualiza las puntuaciones con el resultado de una partida. Todos los cambios se calculan con las puntuaciones
+        de antes de la partida.
+        :param agents: [str...] Nombre del agente de cada asiento.
+        :param victory_points: [int...] Puntos de victoria de cada asiento al acabar la partida.
+        :return: {str: float} Cambio de puntuación de cada agente.
+        """
+        changes = {agent: 0.0 for agent in agents}
+        # Cada jugador se enfrenta a todos los demás, así que se reparte el factor K entre los rivales
+        k_factor = self.k_factor / max(1, len(agents) - 1)
+
+        for seat, agent in enumerate(agents):
+            for other_seat, opponent in enumerate(agents):
+                if seat == other_seat or agent == opponent:
+                    continue
+                if victory_points[seat] > victory_points[other_seat]:
+                    score = 1.0
+                elif victory_points[seat] == victory_points[other_seat]:
+                    score = 0.5
+                else:
+                    score = 0.0
+                changes[agent] += k_factor * (score - self.expected_score(agent, opponent))
+
+        for agent, change in changes.items():
+            self.ratings[agent] = self.get_rating(agent) + change
+        for agent in agents:
+            self.games[agent] = self.games.get(agent, 0) + 1
+        return changes
+
+    def ranking(self):
+        """
+        :return: [(str, float, int)...] Agentes ordenados de mayor a menor puntuación, con sus partidas jugadas.
+        """
+        return sorted(((agent, rating, self.games.get(agent, 0)) for agent, rating in self.ratings.items()),
+                      key=lambda row: row[1], reverse=True)
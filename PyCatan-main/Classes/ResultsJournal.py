@@ -0,0 +1,79 @@
+import json
+from pathlib import Path
+
+
+class ResultsJournal:
+    """
+    Diario en disco con el resultado de cada partida de un benchmark o torneo, en formato JSON Lines (un objeto JSON
+    por línea). Los resultados se añaden según acaban las partidas, así que si se interrumpe la ejecución no se pierde
+    lo ya jugado: al volver a abrir el diario se cargan los resultados y se pueden saltar las partidas hechas.
+
+    Cada resultado es un diccionario y se identifica por los valores de key_fields (por ejemplo agente, posición y
+    semilla). Si una línea está incompleta (el proceso murió mientras la escribía) se ignora.
+
+    path: Path Fichero del diario.
+    key_fields: (str...) Campos que identifican una partida.
+    results: {tuple: dict} Resultados cargados y añadidos, por clave.
+    """
+
+    def __init__(self, path, key_fields=('agent', 'position', 'seed')):
+        self.path = Path(path)
+        self.key_fields = tuple(key_fields)
+        self.results = {}
+
+        if self.path.exists():
+            with open(self.path) as journal_file:
+                for line in journal_file:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.results[self.key(result)] = result
+        return
+
+    def key(self, result):
+        """
+        :param result: dict Resultado de una partida.
+        :return: tuple Clave que identifica la partida.
+        """
+        return tuple(result[field] for field in self.key_fields)
+
+    def __contains__(self, key):
+        return tuple(key) in self.results
+
+    def __len__(self):
+        return len(self.results)
+
+    def append(self, results):
+        """
+        Añade resultados al diario y los escribe al final del fichero.
+        :param results: [dict...] Resultados de partidas.
+        :return: None
+        """
+        if not results:
+            return
+        lines = []
+        for result in results:
+            self.results[self.key(result)] = result
+            lines.append(json.dumps(result) + '\n')
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as journal_file:
+            # Si la última línea quedó a medias se empieza en una línea nueva para no estropear la siguiente
+            if journal_file.tell() and not self._ends_with_newline():
+                journal_file.write('\n')
+            journal_file.writelines(lines)
+        return
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as journal_file:
+            journal_file.seek(-1, 2)
+            return journal_file.read(1) == b'\n'
+
+    def filter(self, **values):
+        """
+        :param values: Campos y valores que deben tener los resultados.
+        :return: [dict...] Resultados que coinciden.
+        """
+        return [result for result in self.results.values()
+                if all(result.get(field) == value for field, value in values.items())]
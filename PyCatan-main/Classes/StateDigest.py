@@ -0,0 +1,173 @@
+MASK_64 = (1 << 64) - 1
+
+# Identificadores de cada dato del estado. Los nodos van del 0 al 53 y las carreteras se identifican por sus dos nodos
+THIEF_FEATURE = 100
+ROAD_FEATURE = 1000
+PLAYER_FEATURE = 10000
+PLAYER_FIELDS = ('victory_points', 'hidden_victory_points', 'knights', 'largest_army', 'longest_road')
+
+
+def mix64(value):
+    """
+    Función de mezcla de splitmix64: convierte un entero en 64 bits bien repartidos.
+    :param value: (int) Entero a mezclar.
+    :return: int de 64 bits.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class StateDigest:
+    """
+    Resumen de 64 bits del estado de la partida (dueño y ciudades de cada nodo, carreteras, ladrón y, por jugador,
+    puntos, materiales y cartas de desarrollo). Es el XOR de una clave por cada par (dato, valor), así que cuando
+    cambia un dato basta con quitar la clave del valor anterior y poner la del nuevo (set). Dos partidas en el mismo
+    estado tienen el mismo resumen, se haya llegado a él como se haya llegado.
+
+    El tablero se sigue de forma incremental: con track_board el resumen se registra en node_listeners y cada cambio de
+    un nodo actualiza solo ese nodo y sus carreteras; el ladrón se actualiza con set_thief cuando se mueve. Los datos
+    de los jugadores están repartidos entre la mano, las cartas de desarrollo y el diccionario del jugador, y algunos
+    los cambian los agentes directamente (al descartar), así que no hay un punto único por el que pasen todos sus
+    cambios: update_players los vuelve a leer (15 enteros por jugador) y solo aplica los que han cambiado.
+
+    Las claves salen de mix64, no de random, así que el resumen no cambia entre procesos ni consume números
+    aleatorios de la partida.
+
+    digest: int Resumen del estado.
+    """
+
+    def __init__(self):
+        self.digest = 0
+        self.values = {}
+        self.board = None
+        # Carreteras que aporta cada nodo (las que van a un nodo con id mayor): {node_id: {feature: value}}
+        self.node_roads = {}
+        # Últimos datos aplicados de cada jugador: {player_id: [int...]}
+        self.player_values = {}
+        return
+
+    @staticmethod
+    def key(feature, value):
+        """
+        :param feature: (int) Identificador del dato.
+        :param value: (int) Valor del dato.
+        :return: int Clave de 64 bits del par.
+        """
+        return mix64((feature << 32) ^ (value & 0xFFFFFFFF))
+
+    def set(self, feature, value):
+        """
+        Cambia el valor de un dato del resumen.
+        :param feature: (int) Identificador del dato.
+        :param value: (int) Valor nuevo, o None si el dato deja de existir.
+        :return: None
+        """
+        previous = self.values.get(feature)
+        if previous != value:
+            if previous is not None:
+                self.digest ^= self.key(feature, previous)
+            if value is None:
+                del self.values[feature]
+            else:
+                self.digest ^= self.key(feature, value)
+                self.values[feature] = value
+        return
+
+    def track_board(self, board):
+        """
+        Añade el tablero al resumen y se registra en sus node_listeners para seguir sus cambios.
+        :param board: Board() de la partida.
+        :return: None
+        """
+        self.board = board
+        board.node_listeners.append(self)
+        for node_id in range(len(board.nodes)):
+            self.on_node_changed(node_id)
+        self.set_thief(next(terrain['id'] for terrain in board.terrain if terrain['has_thief']))
+        return
+
+    def on_node_changed(self, node_id):
+        """
+        Se llama cada vez que cambia un nodo del tablero. Actualiza el nodo y las carreteras que aporta.
+        :param node_id: (int) Id del nodo que ha cambiado.
+        :return: None
+        """
+        node = self.board.nodes[node_id]
+        self.set(node_id, (node['player'] + 1) * 2 + int(node['has_city']))
+
+        roads = {ROAD_FEATURE + node_id * 64 + road['node_id']: road['player_id'] + 1 for road in node['roads']
+                 if node_id < road['node_id']}
+        for feature in self.node_roads.get(node_id, ()):
+            if feature not in roads:
+                self.set(feature, None)
+        for feature, value in roads.items():
+            self.set(feature, value)
+        self.node_roads[node_id] = roads
+        return
+
+    def set_thief(self, terrain_id):
+        """
+        :param terrain_id: (int) Terreno en el que está el ladrón.
+        :return: None
+        """
+        self.set(THIEF_FEATURE, terrain_id)
+        return
+
+    def update_players(self, players):
+        """
+        Aplica los datos de los jugadores que han cambiado.
+        :param players: [dict...] Jugadores de la partida (AgentManager.players).
+        :return: None
+        """
+        for player_id, player in enumerate(players):
+            development_cards = [0, 0, 0, 0, 0]
+            for card in player['development_cards'].hand:
+                development_cards[card.effect] += 1
+            values = [player[field] for field in PLAYER_FIELDS] + list(player['resources'].resources) + \
+                development_cards
+            previous_values = self.player_values.get(player_id)
+            if values == previous_values:
+                continue
+            for index, value in enumerate(values):
+                if previous_values is None or previous_values[index] != value:
+                    self.set(PLAYER_FEATURE + player_id * 100 + index, value)
+            self.player_values[player_id] = values
+        return
+
+    @staticmethod
+    def features(state):
+        """
+        :param state: dict Estado de la partida (GameManager.get_state_snapshot).
+        :return: {int: int} Valor de cada dato del estado.
+        """
+        features = {node_id: (owner + 1) * 2 + has_city for node_id, (owner, has_city) in enumerate(state['nodes'])}
+        for start, end, owner in state['roads']:
+            features[ROAD_FEATURE + start * 64 + end] = owner + 1
+        features[THIEF_FEATURE] = state['thief']
+        for player_id, player in enumerate(state['players']):
+            values = [player[field] for field in PLAYER_FIELDS] + player['resources'] + player['development_cards']
+            for index, value in enumerate(values):
+                features[PLAYER_FEATURE + player_id * 100 + index] = value
+        return features
+
+    def update(self, state):
+        """
+        Actualiza el resumen a partir de un estado completo, comparando todos sus datos. Es más lento que seguir los
+        cambios con track_board y update_players; sirve para calcular el resumen de un keyframe o para comprobar el
+        incremental.
+        :param state: dict Estado de la partida (GameManager.get_state_snapshot).
+        :return: int Resumen del estado.
+        """
+        for feature, value in self.features(state).items():
+            self.set(feature, value)
+        # Los datos de los jugadores pueden haber cambiado sin pasar por update_players
+        self.player_values = {}
+        return self.digest
+
+    def hexdigest(self):
+        """
+        :return: str Resumen en hexadecimal, con 16 cifras.
+        """
+        return f'{self.digest:016x}'
@@ -0,0 +1,134 @@
+import math
+
+
+class SampleStatistics:
+    """
+    Acumula una muestra de valores (por ejemplo, victorias o diferencias de puntos entre dos agentes) sin guardarlos,
+    para poder sumar los resultados de varios procesos y calcular la media y su intervalo de confianza.
+
+    count: int Número de valores.
+    total: float Suma de los valores.
+    total_squares: float Suma de los cuadrados de los valores.
+    """
+    # Valor z del intervalo de confianza al 95%
+    Z_95 = 1.96
+
+    def __init__(self, count=0, total=0.0, total_squares=0.0):
+        self.count = count
+        self.total = total
+        self.total_squares = total_squares
+        return
+
+    def add(self, value):
+        """
+        :param value: (float) Valor a añadir a la muestra.
+        :return: None
+        """
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        return
+
+    def merge(self, other):
+        """
+        Suma a esta muestra los valores de otra.
+        :param other: SampleStatistics()
+        :return: SampleStatistics() esta misma muestra
+        """
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        return self
+
+    def mean(self):
+        """
+        :return: float Media de la muestra (0 si está vacía).
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def variance(self):
+        """
+        :return: float Varianza muestral (0 con menos de dos valores).
+        """
+        if self.count < 2:
+            return 0.0
+        return max(0.0, (self.total_squares - self.total * self.total / self.count) / (self.count - 1))
+
+    def standard_error(self):
+        """
+        :return: float Error estándar de la media.
+        """
+        return math.sqrt(self.variance() / self.count) if self.count else 0.0
+
+    def confidence_interval(self, z=Z_95):
+        """
+        Intervalo de confianza de la media con la aproximación normal.
+        :param z: (float) Valor z del nivel de confianza (1.96 para el 95%).
+        :return: (float, float) Extremos inferior y superior.
+        """
+        margin = z * self.standard_error()
+        return self.mean() - margin, self.mean() + margin
+
+    def __str__(self):
+        low, high = self.confidence_interval()
+        return f"{self.mean():+.4f} [{low:+.4f}, {high:+.4f}] (n={self.count})"
+
+
+class SequentialProbabilityRatioTest:
+    """
+    Test secuencial de razón de probabilidades (SPRT) de Wald sobre una tasa de victorias. Compara la hipótesis nula
+    (la tasa es p0) con la alternativa (la tasa es p1 > p0) y se puede consultar después de cada partida: en cuanto
+    la evidencia acumulada supera uno de los dos límites ya se puede dejar de jugar.
+
+    p0: float Tasa de victorias de la hipótesis nula (por ejemplo, 0.25: no mejor que ganar al azar entre 4).
+    p1: float Tasa de victorias de la hipótesis alternativa.
+    alpha: float Probabilidad de aceptar p1 si la tasa real es p0.
+    beta: float Probabilidad de aceptar p0 si la tasa real es p1.
+    log_likelihood_ratio: float Logaritmo de la razón de verosimilitudes acumulada.
+    wins: int Victorias observadas.
+    games: int Partidas observadas.
+    """
+    ACCEPT_P0 = 'p0'
+    ACCEPT_P1 = 'p1'
+
+    def __init__(self, p0=0.25, p1=0.35, alpha=0.05, beta=0.05):
+        if not 0 < p0 < p1 < 1:
+            raise ValueError('Debe cumplirse 0 < p0 < p1 < 1')
+        self.p0 = p0
+        self.p1 = p1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+        self.win_weight = math.log(p1 / p0)
+        self.loss_weight = math.log((1 - p1) / (1 - p0))
+        self.log_likelihood_ratio = 0.0
+        self.wins = 0
+        self.games = 0
+        return
+
+    def add(self, wins, games=1):
+        """
+        Añade resultados al test.
+        :param wins: (int) Victorias.
+        :param games: (int) Partidas jugadas, incluidas las victorias.
+        :return: str/None Decisión tras añadirlos (ver decision()).
+        """
+        self.wins += wins
+        self.games += games
+        self.log_likelihood_ratio += wins * self.win_weight + (games - wins) * self.loss_weight
+        return self.decision()
+
+    def decision(self):
+        """
+        :return: ACCEPT_P1 si la tasa es al menos p1, ACCEPT_P0 si no supera p0, o None si aún no se puede decidir.
+        """
+        if self.log_likelihood_ratio >= self.upper_bound:
+            return self.ACCEPT_P1
+        if self.log_likelihood_ratio <= self.lower_bound:
+            return self.ACCEPT_P0
+        return None
+
+    def __str__(self):
+        return (f"SPRT p0={self.p0} p1={self.p1}: {self.wins}/{self.games} victorias, "
+                f"LLR={self.log_likelihood_ratio:.3f} [{self.lower_bound:.3f}, {self.upper_bound:.3f}]")
@@ -1,5 +1,11 @@
+import json
+import time
+
+from Classes.Board import Board
 from Classes.DevelopmentCards import DevelopmentCard
+from Classes.GameResult import GameResult
 from Managers.GameManager import GameManager
+from TraceLoader.TraceContainer import TraceContainerReader, TraceContainerWriter
 from TraceLoader.TraceLoader import TraceLoader
 
 
@@ -8,19 +14,56 @@ class GameDirector:
     Clase que se encarga de dirigir la partida, empezarla y acabarla
     """
 
-    def __init__(self, for_test=False, agents = None, max_rounds=1000, store_trace=True):
-        self.game_manager = GameManager(for_test, agents)
-        self.trace_loader = TraceLoader(store_trace)
+    def __init__(self, for_test=False, agents = None, max_rounds=1000, store_trace=True, board_class=Board, fast=False,
+                 agent_latency=None, time_budget=None, stream_trace=False, action_log=None, container_trace=False,
+                 trace_writer=None, state_digest=False):
+        """
+        :param fast: (bool) Modo rápido: no se construye la traza de la partida (ni se guarda aunque store_trace sea
+                     True) y game_start devuelve solo un GameResult().
+        :param agent_latency: AgentLatency() en el que se acumula cuánto tarda cada agente en cada trigger, o None para
+                              no medirlo.
+        :param time_budget: AgentTimeBudget() con el tiempo máximo de cada agente por llamada y por partida, o None
+                            para no limitarlo. Si un agente se pasa se usa la respuesta por defecto del trigger.
+        :param stream_trace: (bool) Si se guarda la traza, se escribe turno a turno en game_N.jsonl en lugar de
+                             guardarla entera al final en game_N.json. La traza que devuelve game_start solo tiene
+                             entonces el setup, para que la memoria no crezca con la longitud de la partida.
+        :param action_log: ActionLog() en el que se guarda cada partida como traza v2 (semilla, colocaciones y
+                           respuestas de los agentes), o None para no guardarla. Si se guarda la traza, también se
+                           exporta a game_N.v2.json.
+        :param container_trace: (bool) Si se guarda la traza, se escribe ronda a ronda en game_N.trace (ver
+                                TraceContainerWriter), comprimida y con un índice para leer cualquier ronda sin leer el
+                                resto. Tiene prioridad sobre stream_trace y, como con él, la traza que devuelve
+                                game_start solo tiene el setup.
+        :param trace_writer: AsyncTraceWriter() para convertir, comprimir y escribir las trazas en otro hilo, o None
+                             para hacerlo en este. Hay que cerrarlo (close) al acabar.
+        :param state_digest: (bool) Si se mantiene un resumen de 64 bits del estado de la partida
+                             (GameManager.state_digest) y se añade a la traza al final de cada turno.
+        """
+        self.game_manager = GameManager(for_test, agents, board_class=board_class, fast=fast,
+                                        agent_latency=agent_latency, time_budget=time_budget, action_log=action_log,
+                                        state_digest=state_digest)
+        self.trace_loader = TraceLoader(store_trace and not fast, writer=trace_writer)
         self.max_rounds = max_rounds
-        self.store_trace = store_trace
+        self.store_trace = store_trace and not fast
+        self.container_trace = container_trace and self.store_trace
+        self.stream_trace = stream_trace and self.store_trace and not self.container_trace
+        # TraceContainerWriter() de la partida actual si container_trace es True
+        self.trace_container = None
+        self.fast = fast
+        # Resultado de la última partida jugada
+        self.game_result = None
         return
 
-    def reset_game_values(self):
-        # Reseteamos la traza actual
+    def reset_game_values(self, seed=None):
+        # Reseteamos la traza actual. Si la partida anterior se cortó a medias se cierra su fichero
         self.trace_loader.current_trace = {}
+        self.trace_loader.end_stream()
+        if self.trace_container is not None:
+            self.trace_container.close(finished=False)
+            self.trace_container = None
 
         # Reseteamos el game_manager
-        self.game_manager.reset_game_values()
+        self.game_manager.reset_game_values(seed)
         return
 
     # -- -- -- --  Turn  -- -- -- --
@@ -46,15 +89,17 @@ class GameDirector:
             self.game_manager.throw_dice()
             self.game_manager.give_resources()
 
-            start_turn_object['dice'] = self.game_manager.get_last_dice_roll()
-            start_turn_object['actual_player'] = str(self.game_manager.get_whose_turn_is_it())
+            if not self.fast:
+                start_turn_object['dice'] = self.game_manager.get_last_dice_roll()
+                start_turn_object['actual_player'] = str(self.game_manager.get_whose_turn_is_it())
 
             # Si ha salido un 7 en la tirada de dado se llama al ladrón
             start_turn_object = self.game_manager.check_if_thief_is_called(start_turn_object, player)
 
-            for i in range(4):
-                start_turn_object['hand_P' + str(i)] = self.game_manager.player_resources_to_object(i)
-                start_turn_object['total_P' + str(i)] = str(self.game_manager.player_resources_total(i))
+            if not self.fast:
+                for i in range(4):
+                    start_turn_object['hand_P' + str(i)] = self.game_manager.player_resources_to_object(i)
+                    start_turn_object['total_P' + str(i)] = str(self.game_manager.player_resources_total(i))
 
             return start_turn_object, winner
         else:
@@ -87,26 +132,26 @@ class GameDirector:
                     break
 
             # Calculamos quien tiene la carretera más larga
-            for node in self.game_manager.get_board_nodes():
-                longest_road_obj = self.game_manager.longest_road_calculator(node, 1, {'longest_road': 0, 'player': -1},
-                                                                             -1, [node['id']])
-
-                if longest_road_obj['longest_road'] > self.game_manager.get_longest_road()['longest_road']:
-                    self.game_manager.set_longest_road(longest_road_obj)
+            longest_road_obj = self.game_manager.get_board_longest_road()
+            if longest_road_obj['longest_road'] > self.game_manager.get_longest_road()['longest_road']:
+                self.game_manager.set_longest_road(longest_road_obj)
             # Se le da el título a quien tenga la carretera más larga
             if self.game_manager.get_longest_road()['player'] != -1:
                 self.game_manager.get_players()[self.game_manager.get_longest_road()['player']]['longest_road'] = 1
                 self.game_manager.get_players()[self.game_manager.get_longest_road()['player']]['victory_points'] += 2
 
-        vp = {}
-        for i in range(4):
-            vp['J' + str(i)] = str(self.game_manager.get_players()[i]['victory_points'])
-
         for player in self.game_manager.get_players():
             if player['victory_points'] >= 10:
                 winner = True
 
-        end_turn_object['victory_points'] = vp
+        state_digest = self.game_manager.update_state_digest()
+        if not self.fast:
+            vp = {}
+            for i in range(4):
+                vp['J' + str(i)] = str(self.game_manager.get_players()[i]['victory_points'])
+            end_turn_object['victory_points'] = vp
+            if state_digest is not None:
+                end_turn_object['state_digest'] = state_digest
         return end_turn_object, winner
 
     def start_commerce_phase(self, winner, depth=1, player=-1):
@@ -149,7 +194,8 @@ class GameDirector:
     # Round #
     def round_start(self, winner):
         """
-        Esta función permite comenzar una ronda nueva.
+        Esta función permite comenzar una ronda nueva. En modo rápido no se guarda nada de la ronda y round_object
+        queda vacío.
         """
         round_object = {}
         self.game_manager.set_card_used(False)
@@ -171,7 +217,8 @@ class GameDirector:
                 while trading and not winner:
                     commerce_phase_object, winner = self.start_commerce_phase(winner, depth,
                                                                               self.game_manager.get_whose_turn_is_it())
-                    commerce_phase_array.append(commerce_phase_object)
+                    if not self.fast:
+                        commerce_phase_array.append(commerce_phase_object)
                     if commerce_phase_object['trade_offer'] == 'None':
                         trading = False
                     elif not (commerce_phase_object['harbor_trade'] or commerce_phase_object['harbor_trade'] is None):
@@ -185,7 +232,8 @@ class GameDirector:
                 while building and not winner:
                     build_phase_object, winner = self.start_build_phase(winner,
                                                                         self.game_manager.get_whose_turn_is_it())
-                    build_phase_array.append(build_phase_object)
+                    if not self.fast:
+                        build_phase_array.append(build_phase_object)
                     if build_phase_object['building'] == 'None' or not build_phase_object['finished']:
                         building = False
                 obj['build_phase'] = build_phase_array
@@ -193,23 +241,34 @@ class GameDirector:
                 end_turn_object, winner = self.end_turn(winner, self.game_manager.get_whose_turn_is_it())
                 obj['end_turn'] = end_turn_object
 
-                round_object['turn_P' + str(i)] = obj
+                if self.stream_trace:
+                    self.trace_loader.stream_turn('round_' + str(self.game_manager.get_round()), 'turn_P' + str(i),
+                                                  obj)
+                elif not self.fast:
+                    round_object['turn_P' + str(i)] = obj
 
                 if winner:
                     break
         return round_object, winner
 
     # Game #
-    def game_start(self, game_number=0, print_outcome=True):
+    def game_start(self, game_number=0, print_outcome=True, return_result=False, seed=None):
         """
         Esta función permite comenzar una partida nueva.
         :param game_number: (int) número de partidas que se van a jugar.
         :param print_outcome: (bool) si se quiere imprimir el resultado de la partida.
-        :return: object con la traza de la partida.
+        :param return_result: (bool) si se quiere recibir un GameResult() en lugar de la traza. La traza se sigue
+                              construyendo (y guardando si store_trace es True) salvo en modo rápido.
+        :param seed: Semilla de la partida. Con semilla, los dados, el mazo, el motor y cada agente usan su propio
+                     generador aleatorio, así que la partida se puede repetir solo con la semilla y no cambia el
+                     estado global de random. Si es None se usa el estado global de random.
+        :return: object con la traza de la partida, o GameResult() en modo rápido o con return_result.
         """
+        start_time = time.perf_counter()
+
         # Se cargan los agentes y se inicializa el tablero
         # self.game_manager.agent_manager.load_agents()
-        self.reset_game_values()
+        self.reset_game_values(seed)
 
         # Se añade el tablero al setup, para que el intérprete sepa cómo es el tablero
         setup_object = {
@@ -237,22 +296,53 @@ class GameDirector:
             node_id, road_to = self.game_manager.on_game_start_build_towns_and_roads(i)
             setup_object["P" + str(i)].append({"id": node_id, "road": road_to})
 
-        self.trace_loader.current_trace["setup"] = setup_object
-        self.game_loop(game_number, print_outcome)
+        if not self.fast:
+            self.trace_loader.current_trace["setup"] = setup_object
+        if self.stream_trace:
+            self.trace_loader.start_stream(game_number, setup_object)
+        if self.container_trace:
+            self.trace_container = TraceContainerWriter(self.trace_loader.full_path /
+                                                        ("game_" + str(game_number) + '.trace'),
+                                                        writer=self.trace_loader.writer)
+            self.trace_container.write_setup(setup_object)
+        if self.game_manager.action_log is not None:
+            self.game_manager.action_log.setup([setup_object["P" + str(i)] for i in range(4)])
+        self.game_result = self.game_loop(game_number, print_outcome)
+        # Con semilla, el módulo random vuelve a tener el estado de antes de la partida. Si la partida se corta con una
+        # excepción lo hace el siguiente reset_game_values
+        self.game_manager.random_streams.release()
+        self.game_result.elapsed_time = time.perf_counter() - start_time
+        if self.game_manager.action_log is not None:
+            self.game_manager.action_log.finish(self.game_result, self.max_rounds)
+            if self.store_trace:
+                self.trace_loader.export_action_trace(game_number, self.game_manager.action_log.trace)
+
+        if self.fast or return_result:
+            return self.game_result
         return self.trace_loader.current_trace
 
     def game_loop(self, game_number, print_outcome):
         """
         Esta función permite jugar varias partidas seguidas.
         :param game_number: (int) número de partidas que se van a jugar.
+        :return: GameResult()
         """
         game_object = {}
         winner = False
+        rounds = 0
         for i in range(self.max_rounds):
             if print_outcome and i == self.max_rounds-1: 
                 print('Game (' + str(game_number) + ') has reached the maximum number of rounds')
-            game_object['round_' + str(self.game_manager.get_round())], winner = self.round_start(winner)
+            if self.trace_container is not None and self.trace_container.wants_keyframe(self.game_manager.get_round()):
+                self.trace_container.write_keyframe(self.game_manager.get_round(),
+                                                    self.game_manager.get_state_snapshot())
+            round_object, winner = self.round_start(winner)
+            if self.trace_container is not None:
+                self.trace_container.write_round(self.game_manager.get_round(), round_object)
+            elif not self.fast and not self.stream_trace:
+                game_object['round_' + str(self.game_manager.get_round())] = round_object
             self.game_manager.set_round(self.game_manager.get_round() + 1)
+            rounds += 1
             if winner:
                 break
 
@@ -265,7 +355,25 @@ class GameDirector:
                     str(self.game_manager.get_players()[i]['largest_army']) + ')' + ' (' +
                     str(self.game_manager.get_players()[i]['longest_road']) + ')')
 
-        self.trace_loader.current_trace["game"] = game_object
-        if self.store_trace:
-            self.trace_loader.export_to_file(game_number)
+        if self.trace_container is not None:
+            self.trace_container.close(finished=True, rounds=rounds, victory_points=[
+                player['victory_points'] for player in self.game_manager.get_players()])
+            self.trace_loader.run(self.append_container_to_games_file, self.trace_container.path)
+            self.trace_container = None
+        elif self.stream_trace:
+            self.trace_loader.end_stream(rounds)
+        elif not self.fast:
+            self.trace_loader.current_trace["game"] = game_object
+            if self.store_trace:
+                self.trace_loader.export_to_file(game_number)
+        return GameResult.from_game_manager(self.game_manager, winner, rounds)
+
+    def append_container_to_games_file(self, path):
+        """
+        Añade a games.json una partida guardada con container_trace. Solo se carga en memoria esta partida.
+        :param path: Ruta del fichero .trace.
+        :return: None
+        """
+        with TraceContainerReader(path) as reader:
+            self.trace_loader.append_to_games_file(json.dumps(reader.to_trace()))
         return
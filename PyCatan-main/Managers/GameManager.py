@@ -1,7 +1,12 @@
-from copy import copy
+import time
+
+from Classes.AgentTimeBudget import AgentTimeout
 from Classes.Board import Board
+from Classes.BoardView import BoardView
 from Classes.Constants import *
 from Classes.DevelopmentCards import *
+from Classes.RandomStreams import RandomStreams
+from Classes.StateDigest import StateDigest
 from Classes.TradeOffer import TradeOffer
 from Classes.Hand import *
 from Managers.AgentManager import AgentManager
@@ -16,35 +21,69 @@ class GameManager:
     MAX_COMMERCE_DEPTH = 2
     MAX_COMMERCE_TRADES = 2
 
-    def __init__(self, for_test=False, agents = None):
+    def __init__(self, for_test=False, agents = None, board_class=Board, fast=False, agent_latency=None,
+                 time_budget=None, action_log=None, state_digest=False):
+        # En modo rápido no se convierten a JSON los objetos que solo sirven para la traza
+        self.fast = fast
+        # Si se pasa un AgentLatency() se mide cuánto tarda cada llamada a los agentes
+        self.agent_latency = agent_latency
+        # Si se pasa un AgentTimeBudget() se limita lo que puede tardar cada agente y se guardan las veces que se pasa
+        self.time_budget = time_budget
+        self.agent_timeouts = []
+        # Si se pasa un ActionLog() se guardan las respuestas de los agentes y los dados (traza v2). Un ActionReplay()
+        # en su lugar repite una partida guardada así
+        self.action_log = action_log
+        # Con state_digest se mantiene un resumen de 64 bits del estado: el tablero se sigue con cada cambio y los
+        # jugadores se actualizan al acabar cada turno
+        self.track_state_digest = state_digest
+        self.state_digest = None
+        self.board_class = board_class
         self.already_played_development_card = False
         self.last_dice_roll = 0
         self.largest_army = 2
         self.largest_army_player = {}
         self.longest_road = {'longest_road': 4, 'player': -1}
 
-        self.board = Board()
-        self.development_cards_deck = DevelopmentDeck()
+        # Generadores aleatorios de la partida. Por defecto, el estado global de random
+        self.random_streams = RandomStreams()
+
+        self.board = self.board_class()
+        if self.track_state_digest:
+            self.state_digest = StateDigest()
+            self.state_digest.track_board(self.board)
+        self.development_cards_deck = DevelopmentDeck(self.random_streams.deck)
         self.turn_manager = TurnManager()
         self.commerce_manager = CommerceManager()
         self.agent_manager = AgentManager(for_test, agents=agents)
         return
 
-    def reset_game_values(self):
+    def reset_game_values(self, seed=None):
         """
         Reinicia las variables al valor inicial
+        :param seed: Semilla de la partida. Si es None se usa el estado global de random.
         :return: None
         """
+        # Si la partida anterior se cortó a medias, el módulo random aún puede tener el estado de uno de sus asientos
+        self.random_streams.release()
+        self.random_streams = RandomStreams(seed)
+        self.agent_timeouts = []
+        if self.time_budget is not None:
+            self.time_budget.reset()
         self.already_played_development_card = False
         self.last_dice_roll = 0
         self.largest_army = 2
         self.largest_army_player = {}
         self.longest_road = {'longest_road': 4, 'player': -1}
 
-        self.board = Board()
-        self.development_cards_deck = DevelopmentDeck()
+        self.board = self.board_class()
+        if self.track_state_digest:
+            self.state_digest = StateDigest()
+            self.state_digest.track_board(self.board)
+        self.development_cards_deck = DevelopmentDeck(self.random_streams.deck)
         self.turn_manager = TurnManager()
         self.agent_manager.reset_game_values()
+        if self.action_log is not None:
+            self.action_log.start(self)
         return
 
     def throw_dice(self):
@@ -52,9 +91,11 @@ class GameManager:
         Función que devuelve un valor entre el 2 y el 12, simulando una tirada de 2d6
         :return: integer entre 2 y 12
         """
-        first_d6 = random.randint(1, 6)
-        second_d6 = random.randint(1, 6)
+        first_d6 = self.random_streams.dice.randint(1, 6)
+        second_d6 = self.random_streams.dice.randint(1, 6)
         self.last_dice_roll = first_d6 + second_d6
+        if self.action_log is not None:
+            self.action_log.dice(self)
         return
 
     def give_resources(self):
@@ -62,23 +103,11 @@ class GameManager:
         Función que entrega materiales a cada uno de los jugadores en función de la tirada de dados
         :return: None
         """
-        # Por cada pieza de terreno en el tablero
-        for terrain in self.board.terrain:
-            # Si la probabilidad coincide
-            if terrain['probability'] == self.last_dice_roll:
-                # Se miran los nodos adyacentes
-                for node in terrain['contacting_nodes']:
-                    # Si tiene jugador, implica que hay pueblo
-                    if self.board.nodes[node]['player'] != -1:
-                        player = self.agent_manager.players[self.board.nodes[node]['player']]
-                        # Si tiene ciudad se dan 2 en lugar de 1 material
-
-                        if self.board.nodes[node]['has_city']:
-                            player['player'].hand.add_material(terrain['terrain_type'], 2)
-                            player['resources'].add_material(terrain['terrain_type'], 2)
-                        else:
-                            player['player'].hand.add_material(terrain['terrain_type'], 1)
-                            player['resources'].add_material(terrain['terrain_type'], 1)
+        # El tablero sabe qué materiales recibe cada jugador con cada tirada
+        for player_id, materials in self.board.production(self.last_dice_roll).items():
+            player = self.agent_manager.players[player_id]
+            player['player'].hand.add_materials(materials)
+            player['resources'].add_materials(materials)
         return
 
     def _give_all_resources(self):
@@ -108,7 +137,7 @@ class GameManager:
         giver = receivers.pop(self.turn_manager.whose_turn_is_it)
 
         # Se aleatorizan el orden en el que se va a recibir la oferta para evitar que J1 tenga ventaja
-        random.shuffle(receivers)
+        self.random_streams.engine.shuffle(receivers)
 
         original_trade_offer = trade_offer
 
@@ -163,11 +192,11 @@ class GameManager:
         """
         json_obj = {
             'count': count,
-            'trade_offer': trade_offer.__to_object__(),
+            'trade_offer': trade_offer if self.fast else trade_offer.__to_object__(),
             'giver': giver['id'],
             'receiver': receiver['id'],
         }
-        response = receiver['player'].on_trade_offer(copy(self.board), trade_offer, giver['id'])
+        response = self.call_agent(receiver['id'], 'on_trade_offer', BoardView(self.board), trade_offer, giver['id'])
 
         if count > self.MAX_COMMERCE_DEPTH:
             json_obj['response'] = False
@@ -313,7 +342,9 @@ class GameManager:
         :param adjacent_player: Número de un jugador que esté adyacente al hexágono seleccionado
         :return: None
         """
-        move_thief_obj = self.board.move_thief(terrain)
+        move_thief_obj = self.board.move_thief(terrain, self.random_streams.engine)
+        if self.state_digest is not None:
+            self.state_digest.set_thief(move_thief_obj['terrain_id'])
         move_thief_obj['robbed_player'] = -1
         move_thief_obj['stolen_material_id'] = -1
         if move_thief_obj['response']:
@@ -341,7 +372,7 @@ class GameManager:
         new_total = player_obj["resources"].get_total()
 
         while new_total == total and total != 0:
-            material_id = random.randint(0, 4)
+            material_id = self.random_streams.engine.randint(0, 4)
             player_obj['resources'].remove_material(material_id, 1)
             new_total = player_obj['resources'].get_total()
 
@@ -363,7 +394,7 @@ class GameManager:
 
         for count in range(3):
             try:
-                node_id, road_to = self.agent_manager.players[player]['player'].on_game_start(copy(self.board))
+                node_id, road_to = self.call_agent(player, 'on_game_start', BoardView(self.board))
             except Exception as e:
                 print(f"Error: {e}. Agente: {self.agent_manager.players[player]['player']}")
                 node_id, road_to = None, None
@@ -374,10 +405,10 @@ class GameManager:
                     if not valid_nodes:
                         raise Exception("No hay nodos válidos disponibles para iniciar el juego")
                     else:
-                        node_id = random.choice(valid_nodes)
+                        node_id = self.random_streams.engine.choice(valid_nodes)
 
                     possible_roads = self.board.nodes[node_id]['adjacent']
-                    road_to = random.choice(possible_roads)
+                    road_to = self.random_streams.engine.choice(possible_roads)
 
 
                 terrain_ids = self.board.nodes[node_id]['contacting_terrain']
@@ -397,7 +428,7 @@ class GameManager:
                     return node_id, road_to
                 else:
                     possible_roads = self.board.nodes[node_id]['adjacent']
-                    road_to = random.choice(possible_roads) 
+                    road_to = self.random_streams.engine.choice(possible_roads) 
                     self.board.build_road(player, node_id, road_to)
                     return node_id, road_to
 
@@ -471,7 +502,7 @@ class GameManager:
                     self.largest_army_player['largest_army'] = 1
                     self.largest_army_player['victory_points'] += 2
 
-            on_moving_thief = self.agent_manager.players[player_id]['player'].on_moving_thief()
+            on_moving_thief = self.call_agent(player_id, 'on_moving_thief')
             move_thief_obj = self.move_thief(on_moving_thief['terrain'], on_moving_thief['player'])
 
             # se pasan los cambios al objeto
@@ -506,11 +537,11 @@ class GameManager:
 
             if card.effect == DevelopmentCardConstants.MONOPOLY_EFFECT:
                 # Elige material
-                material_chosen = self.agent_manager.players[player_id]['player'].on_monopoly_card_use()
+                material_chosen = self.call_agent(player_id, 'on_monopoly_card_use')
                 material_sum = 0
 
                 if material_chosen is None:
-                    material_chosen = random.randint(0, 4)
+                    material_chosen = self.random_streams.engine.randint(0, 4)
 
                 # Se elimina el material de la mano de todos los jugadores
                 for player in self.agent_manager.players:
@@ -527,8 +558,10 @@ class GameManager:
                 card_obj['played_card'] = 'monopoly'
                 card_obj['material_chosen'] = material_chosen
                 card_obj['material_sum'] = material_sum
-                for i in range(4):
-                    card_obj['hand_P' + str(i)] = self.agent_manager.players[i]['resources'].resources.__to_object__()
+                if not self.fast:
+                    for i in range(4):
+                        card_obj['hand_P' + str(i)] = \
+                            self.agent_manager.players[i]['resources'].resources.__to_object__()
 
                 self.already_played_development_card = True
                 return card_obj, winner
@@ -536,7 +569,7 @@ class GameManager:
             elif card.effect == DevelopmentCardConstants.ROAD_BUILDING_EFFECT:
 
                 # Se piden en qué puntos quieren construir carreteras
-                road_nodes = self.agent_manager.players[player_id]['player'].on_road_building_card_use()
+                road_nodes = self.call_agent(player_id, 'on_road_building_card_use')
                 card_obj['played_card'] = 'road_building'
 
                 # Si hay al menos una carretera
@@ -566,7 +599,7 @@ class GameManager:
                                 # Si no se ha podido construir se cambia de carretera a una aleatoria posible
                                 valid_nodes = self.board.valid_road_nodes(player_id)
                                 if len(valid_nodes):
-                                    road_node = random.choice(valid_nodes) 
+                                    road_node = self.random_streams.engine.choice(valid_nodes) 
                                     road_nodes['node_id'] = valid_nodes[road_node]['starting_node']
                                     road_nodes['road_to'] = valid_nodes[road_node]['finishing_node']
                                 else:
@@ -582,7 +615,7 @@ class GameManager:
 
                                 valid_nodes = self.board.valid_road_nodes(player_id)
                                 if len(valid_nodes):
-                                    road_node = random.choice(valid_nodes) 
+                                    road_node = self.random_streams.engine.choice(valid_nodes) 
                                     road_nodes['node_id_2'] = valid_nodes[road_node]['starting_node']
                                     road_nodes['road_to_2'] = valid_nodes[road_node]['finishing_node']
                                 else:
@@ -605,11 +638,12 @@ class GameManager:
                 card_obj['played_card'] = 'year_of_plenty'
 
                 # Eligen 2 materiales (puede ser el mismo 2 veces)
-                materials_selected = self.agent_manager.players[player_id]['player'].on_year_of_plenty_card_use()
+                materials_selected = self.call_agent(player_id, 'on_year_of_plenty_card_use')
                 card_obj['materials_selected'] = materials_selected
 
                 if materials_selected is None:
-                    material, material2 = random.randint(0, 4), random.randint(0, 4)
+                    material = self.random_streams.engine.randint(0, 4)
+                    material2 = self.random_streams.engine.randint(0, 4)
                     materials_selected = {'material': material, 'material_2': material2}
 
                 # Obtienen una carta de ese material elegido
@@ -619,8 +653,9 @@ class GameManager:
                 # Se actualiza la mano
                 self.agent_manager.players[player_id]['player'].hand = self.agent_manager.players[player_id]['resources']
 
-                card_obj['hand_P' + str(player_id)] = self.agent_manager.players[
-                    player_id]['resources'].resources.__to_object__()
+                if not self.fast:
+                    card_obj['hand_P' + str(player_id)] = self.agent_manager.players[
+                        player_id]['resources'].resources.__to_object__()
 
                 self.already_played_development_card = True
                 return card_obj, winner
@@ -721,6 +756,13 @@ class GameManager:
         """
         return self.longest_road
 
+    def get_board_longest_road(self):
+        """
+        Carretera más larga que hay ahora mismo en el tablero, calculada de forma incremental por el tablero.
+        :return: {'longest_road': int, 'player': int}
+        """
+        return self.board.longest_road()
+
     def player_resources_total(self, player_id):
         """
         :return: int
@@ -733,33 +775,133 @@ class GameManager:
         """
         return self.agent_manager.players[player_id]['resources'].resources.__to_object__()
 
+    def get_state_snapshot(self):
+        """
+        Estado completo de la partida con campos numéricos: dueño y ciudad de cada nodo, carreteras, ladrón, cartas
+        que quedan en el mazo y, por jugador, puntos, materiales y cartas de desarrollo (cuántas tiene de cada efecto).
+        :return: dict
+        """
+        players = []
+        for player in self.agent_manager.players:
+            development_cards = [0, 0, 0, 0, 0]
+            for card in player['development_cards'].hand:
+                development_cards[card.effect] += 1
+            players.append({
+                'victory_points': player['victory_points'],
+                'hidden_victory_points': player['hidden_victory_points'],
+                'resources': list(player['resources'].resources),
+                'development_cards': development_cards,
+                'knights': player['knights'],
+                'largest_army': player['largest_army'],
+                'longest_road': player['longest_road'],
+            })
+        return {
+            'round': self.get_round(),
+            'turn': self.get_turn(),
+            'nodes': [[node['player'], int(node['has_city'])] for node in self.board.nodes],
+            'roads': [[node['id'], road['node_id'], road['player_id']] for node in self.board.nodes
+                      for road in node['roads'] if node['id'] < road['node_id']],
+            'thief': next(terrain['id'] for terrain in self.board.terrain if terrain['has_thief']),
+            'deck': len(self.development_cards_deck.deck),
+            'players': players,
+        }
+
+    def update_state_digest(self):
+        """
+        Pone al día el resumen del estado de la partida. El tablero y el ladrón ya están al día (se siguen con cada
+        cambio); de los jugadores se aplican los datos que han cambiado desde la última vez.
+        :return: str Resumen en hexadecimal, o None si no está activado.
+        """
+        if self.state_digest is None:
+            return None
+        self.state_digest.update_players(self.agent_manager.players)
+        return self.state_digest.hexdigest()
+
+    def call_agent(self, player_id, trigger, *args):
+        """
+        Llama a un trigger de un agente. Todas las llamadas a los agentes pasan por aquí para que usen el generador
+        aleatorio de su asiento y, si agent_latency está activado, para medir cuánto tardan.
+        :param player_id: (int) Asiento del agente.
+        :param trigger: (str) Nombre del trigger (on_build_phase, on_trade_offer...).
+        :param args: Argumentos del trigger.
+        :return: Lo que devuelva el agente.
+        """
+        if self.action_log is not None:
+            return self.action_log.call_agent(self, player_id, trigger, args)
+        return self.run_agent(player_id, trigger, args)
+
+    def run_agent(self, player_id, trigger, args):
+        """
+        :param player_id: (int) Asiento del agente.
+        :param trigger: (str) Nombre del trigger.
+        :param args: (tuple) Argumentos del trigger.
+        :return: Lo que devuelva el agente, o la respuesta por defecto si se pasa de tiempo.
+        """
+        agent = self.agent_manager.players[player_id]['player']
+        with self.random_streams.agent(player_id):
+            if self.agent_latency is None and self.time_budget is None:
+                return getattr(agent, trigger)(*args)
+
+            start = time.perf_counter()
+            try:
+                if self.time_budget is None:
+                    return getattr(agent, trigger)(*args)
+                return self.time_budget.run(player_id, getattr(agent, trigger), args)
+            except AgentTimeout as timeout:
+                self.agent_timeouts.append({'player': player_id, 'trigger': trigger, 'reason': timeout.reason,
+                                            'turn': self.get_turn()})
+                return self.agent_fallback(player_id, trigger)
+            finally:
+                if self.agent_latency is not None:
+                    self.agent_latency.record(type(agent).__name__, trigger, time.perf_counter() - start)
+
+    def agent_fallback(self, player_id, trigger):
+        """
+        Respuesta que se usa cuando un agente se pasa de tiempo. Son respuestas para las que el GameManager ya tiene
+        un comportamiento por defecto: no comerciar ni construir, colocación inicial aleatoria, mover el ladrón a una
+        casilla aleatoria (pidiendo la casilla en la que ya está), descartar materiales al azar...
+        :param player_id: (int) Asiento del agente.
+        :param trigger: (str) Nombre del trigger.
+        :return: Respuesta por defecto del trigger.
+        """
+        if trigger == 'on_trade_offer':
+            return False
+        if trigger == 'on_game_start':
+            return None, None
+        if trigger == 'on_moving_thief':
+            thief_terrain = next(terrain['id'] for terrain in self.board.terrain if terrain['has_thief'])
+            return {'terrain': thief_terrain, 'player': -1}
+        if trigger == 'on_having_more_than_7_materials_when_thief_is_called':
+            return self.agent_manager.players[player_id]['resources']
+        return None
+
     def call_to_agent_on_turn_start(self, player):
         """
         :param player: int
         :return: DevelopmentCard, None
         """
-        return self.agent_manager.players[player]['player'].on_turn_start()
+        return self.call_agent(player, 'on_turn_start')
 
     def call_to_agent_on_turn_end(self, player_id):
         """
         :param player_id: int
         :return: DevelopmentCard, None
         """
-        return self.agent_manager.players[player_id]['player'].on_turn_end()
+        return self.call_agent(player_id, 'on_turn_end')
 
     def call_to_agent_on_commerce_phase(self, player_id):
         """
         :param player_id: int
         :return: TradeOffer, dict{'gives': int, 'receives': int}, None
         """
-        return self.agent_manager.players[player_id]['player'].on_commerce_phase()
+        return self.call_agent(player_id, 'on_commerce_phase')
 
     def call_to_agent_on_build_phase(self, player_id):
         """
         :param player_id: int
         :return: dict{'building': str, 'node_id': int, 'road_to': int/None}, None
         """
-        return self.agent_manager.players[player_id]['player'].on_build_phase(copy(self.board))
+        return self.call_agent(player_id, 'on_build_phase', BoardView(self.board))
 
     def get_board_nodes(self):
         """
@@ -796,14 +938,15 @@ class GameManager:
         if self.last_dice_roll == 7:
             for obj in self.agent_manager.players:
                 if obj['resources'].get_total() > 7:
-                    total = obj['player'].on_having_more_than_7_materials_when_thief_is_called().get_total()
+                    total = self.call_agent(obj['id'],
+                                            'on_having_more_than_7_materials_when_thief_is_called').get_total()
                     max_hand = math.floor(total / 2)
 
                     while total > max_hand:
-                        obj['resources'].remove_material(random.randint(0, 4), 1)
+                        obj['resources'].remove_material(self.random_streams.engine.randint(0, 4), 1)
                         total = obj['resources'].get_total()
 
-            on_moving_thief = self.agent_manager.players[player_id]['player'].on_moving_thief()
+            on_moving_thief = self.call_agent(player_id, 'on_moving_thief')
             move_thief_obj = self.move_thief(on_moving_thief['terrain'], on_moving_thief['player'])
 
             start_turn_object['past_thief_terrain'] = move_thief_obj['last_thief_terrain']
@@ -822,7 +965,7 @@ class GameManager:
         :return: dict
         """
         if isinstance(commerce_response, TradeOffer) and depth <= self.MAX_COMMERCE_TRADES:
-            commerce_phase_object['trade_offer'] = commerce_response.__to_object__()
+            commerce_phase_object['trade_offer'] = commerce_response if self.fast else commerce_response.__to_object__()
             commerce_phase_object['harbor_trade'] = False
 
             if self.agent_manager.players[player_id]['resources'].resources.has_more(
@@ -858,7 +1001,8 @@ class GameManager:
             if isinstance(response, Hand):
                 self.agent_manager.players[player_id]['resources'] = response
                 self.agent_manager.players[player_id]['player'].hand = self.agent_manager.players[player_id]['resources']
-                commerce_phase_object['answer'] = response.resources.__to_object__()
+                commerce_phase_object['answer'] = \
+                    response.resources if self.fast else response.resources.__to_object__()
 
                 return commerce_phase_object, winner
             else:
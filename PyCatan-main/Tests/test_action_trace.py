@@ -0,0 +1,87 @@
+import json
+
+from Agents.AlexPastorAgent import AlexPastorAgent
+from Agents.CrabisaAgent import CrabisaAgent
+from Agents.EdoAgent import EdoAgent
+from Agents.RandomAgent import RandomAgent
+from Managers.GameDirector import GameDirector
+from TraceLoader.ActionTrace import ActionLog, HAND, ReplayDivergence, replay_game
+
+
+class TestActionTrace:
+    agents = [RandomAgent, EdoAgent, AlexPastorAgent, AlexPastorAgent]
+
+    @staticmethod
+    def state(game_manager):
+        return [(player['victory_points'], player['resources'].resources, player['knights'],
+                 len(player['development_cards'].hand)) for player in game_manager.agent_manager.players]
+
+    def test_replay(self):
+        action_log = ActionLog()
+        game_director = GameDirector(agents=self.agents, max_rounds=100, store_trace=False, fast=True,
+                                     action_log=action_log)
+        for seed in range(5):
+            game_result = game_director.game_start(print_outcome=False, seed=seed)
+            final_state = self.state(game_director.game_manager)
+            # La traza sobrevive a pasar por JSON
+            trace = json.loads(json.dumps(action_log.trace))
+            assert trace['rounds'] == game_result.rounds
+
+            game_manager = replay_game(trace)
+            assert self.state(game_manager) == final_state
+            assert [player['victory_points'] for player in game_manager.agent_manager.players] == \
+                game_result.victory_points
+
+    def test_replay_agent_changing_its_hand(self):
+        # CrabisaAgent quita materiales de su mano (que es la del GameManager) al preparar las ofertas
+        action_log = ActionLog()
+        game_director = GameDirector(agents=[CrabisaAgent, RandomAgent, RandomAgent, RandomAgent], max_rounds=100,
+                                     store_trace=False, fast=True, action_log=action_log)
+        for seed in range(5):
+            game_director.game_start(print_outcome=False, seed=seed)
+            final_state = self.state(game_director.game_manager)
+            trace = json.loads(json.dumps(action_log.trace))
+            assert any(event[1] == HAND and event[0] == 0 for event in trace['events'])
+            assert self.state(replay_game(trace)) == final_state
+
+    def test_intermediate_state(self):
+        action_log = ActionLog()
+        game_director = GameDirector(agents=self.agents, max_rounds=100, store_trace=False, fast=True,
+                                     action_log=action_log)
+        game_director.game_start(print_outcome=False, seed=3)
+        trace = action_log.trace
+
+        # Repetir hasta la ronda 10 deja el mismo estado que jugar la partida con 10 rondas como máximo
+        short_director = GameDirector(agents=self.agents, max_rounds=10, store_trace=False, fast=True)
+        short_director.game_start(print_outcome=False, seed=3)
+        assert self.state(replay_game(trace, rounds=10)) == self.state(short_director.game_manager)
+
+        # También se puede parar tras cualquier evento, por ejemplo justo después de la colocación inicial
+        setup_events = sum(1 for event in trace['events'] if event[1] == 1)
+        game_manager = replay_game(trace, events=setup_events)
+        assert game_manager.get_turn() == 1 and game_manager.get_last_dice_roll() == 0
+        for player_id, placements in enumerate(trace['setup']):
+            assert sorted(node_id for node_id, _ in placements) == \
+                [node['id'] for node in game_manager.board.nodes if node['player'] == player_id]
+
+    def test_divergence(self):
+        action_log = ActionLog()
+        game_director = GameDirector(agents=self.agents, max_rounds=20, store_trace=False, fast=True,
+                                     action_log=action_log)
+        game_director.game_start(print_outcome=False, seed=1)
+        trace = json.loads(json.dumps(action_log.trace))
+        dice_event = next(event for event in trace['events'] if event[1] == 0)
+        dice_event[2] = 13
+        try:
+            replay_game(trace)
+        except ReplayDivergence:
+            return
+        assert False
+
+
+if __name__ == '__main__':
+    test = TestActionTrace()
+    test.test_replay()
+    test.test_replay_agent_changing_its_hand()
+    test.test_intermediate_state()
+    test.test_divergence()
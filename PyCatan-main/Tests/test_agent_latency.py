@@ -0,0 +1,56 @@
+from Agents.RandomAgent import RandomAgent
+from Classes.AgentLatency import AgentLatency, LatencyHistogram
+from Managers.GameDirector import GameDirector
+
+
+class TestAgentLatency:
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for microseconds in range(1, 1001):
+            histogram.record(microseconds / 1e6)
+
+        assert histogram.count == 1000
+        assert histogram.max == 1e-3
+        # Los percentiles tienen como mucho el error de un intervalo (2^(1/4), un 19%)
+        for percentile in (50, 95, 99):
+            exact = percentile * 10 / 1e6
+            assert exact <= histogram.percentile(percentile) <= exact * 2 ** 0.25
+        assert histogram.percentile(100) == histogram.max
+
+    def test_merge(self):
+        first, second, together = AgentLatency(), AgentLatency(), AgentLatency()
+        for i in range(100):
+            seconds = (i % 7 + 1) / 1e4
+            (first if i % 2 else second).record('RandomAgent', 'on_build_phase', seconds)
+            together.record('RandomAgent', 'on_build_phase', seconds)
+        second.record('RandomAgent', 'on_turn_end', 1e-6)
+
+        first.merge(second)
+        merged, expected = first.histograms[('RandomAgent', 'on_build_phase')], \
+            together.histograms[('RandomAgent', 'on_build_phase')]
+        assert merged.buckets == expected.buckets
+        assert (merged.count, merged.max) == (expected.count, expected.max)
+        assert ('RandomAgent', 'on_turn_end') in first.histograms
+
+    def test_game_director(self):
+        agent_latency = AgentLatency()
+        game_director = GameDirector(agents=[RandomAgent] * 4, max_rounds=20, store_trace=False, fast=True,
+                                     agent_latency=agent_latency)
+        measured = game_director.game_start(0, False, seed=3)
+        not_measured = GameDirector(agents=[RandomAgent] * 4, max_rounds=20, store_trace=False,
+                                    fast=True).game_start(0, False, seed=3)
+
+        # Medir no cambia la partida
+        assert measured.victory_points == not_measured.victory_points
+        triggers = {trigger for _, trigger in agent_latency.histograms}
+        assert {'on_game_start', 'on_turn_start', 'on_commerce_phase', 'on_build_phase', 'on_turn_end'} <= triggers
+        # Cada agente pone 2 pueblos, con hasta 3 intentos cada uno
+        assert 8 <= agent_latency.histograms[('RandomAgent', 'on_game_start')].count <= 24
+        assert agent_latency.histograms[('RandomAgent', 'on_turn_start')].count == measured.turns
+
+
+if __name__ == '__main__':
+    test = TestAgentLatency()
+    test.test_histogram()
+    test.test_merge()
+    test.test_game_director()
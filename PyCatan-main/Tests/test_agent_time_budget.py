@@ -0,0 +1,90 @@
+import threading
+import time
+
+from Agents.RandomAgent import RandomAgent
+from Classes.AgentTimeBudget import AgentTimeBudget, AgentTimeout
+from Managers.GameDirector import GameDirector
+
+
+class LoopingAgent(RandomAgent):
+    # Se queda en un bucle infinito al construir, aunque intente capturar las excepciones
+    def on_build_phase(self, board_instance):
+        while True:
+            try:
+                time.sleep(0.001)
+            except Exception:
+                pass
+
+
+class SlowThiefAgent(RandomAgent):
+    def on_moving_thief(self):
+        time.sleep(0.2)
+        return {'terrain': 0, 'player': -1}
+
+
+class TestAgentTimeBudget:
+    def test_looping_agent(self):
+        agents = [LoopingAgent, RandomAgent, RandomAgent, RandomAgent]
+        # El límite es amplio para que las llamadas normales no se corten aunque la máquina esté cargada
+        game_director = GameDirector(agents=agents, max_rounds=10, store_trace=False, fast=True,
+                                     time_budget=AgentTimeBudget(call_seconds=0.05))
+        start = time.perf_counter()
+        game_result = game_director.game_start(0, False, seed=1)
+
+        # La partida acaba y cada llamada a on_build_phase del agente 0 se ha cortado
+        assert time.perf_counter() - start < 5
+        timeouts = game_director.game_manager.agent_timeouts
+        assert game_result.agent_timeouts[0] == len(timeouts) == game_result.turns // 4 + (game_result.turns % 4 > 0)
+        assert all(timeout['trigger'] == 'on_build_phase' and timeout['reason'] == 'call' for timeout in timeouts)
+
+    def test_game_budget(self):
+        agents = [LoopingAgent, RandomAgent, RandomAgent, RandomAgent]
+        time_budget = AgentTimeBudget(call_seconds=0.01, game_seconds=0.05)
+        game_director = GameDirector(agents=agents, max_rounds=10, store_trace=False, fast=True,
+                                     time_budget=time_budget)
+        game_result = game_director.game_start(0, False, seed=1)
+
+        # Cuando se acaba el tiempo de la partida ya no se llama al agente
+        reasons = [timeout['reason'] for timeout in game_director.game_manager.agent_timeouts
+                   if timeout['player'] == 0]
+        assert reasons.count('call') <= 5
+        assert 'game' in reasons
+        assert game_result.agent_timeouts[0] == len(reasons)
+        assert time_budget.used[0] < 0.1
+
+    def test_without_interruption(self):
+        # Fuera del hilo principal no se puede cortar la llamada, pero se descarta la respuesta si tarda demasiado
+        time_budget = AgentTimeBudget(call_seconds=0.005)
+        errors = []
+
+        def run():
+            try:
+                time_budget.run(0, time.sleep, (0.02,))
+                errors.append('no timeout')
+            except AgentTimeout as timeout:
+                if timeout.reason != 'call':
+                    errors.append(timeout.reason)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        assert errors == []
+        assert time_budget.used[0] >= 0.02
+
+    def test_fallback(self):
+        agents = [SlowThiefAgent, SlowThiefAgent, SlowThiefAgent, SlowThiefAgent]
+        game_director = GameDirector(agents=agents, max_rounds=20, store_trace=False, fast=True,
+                                     time_budget=AgentTimeBudget(call_seconds=0.05))
+        game_director.game_start(0, False, seed=2)
+
+        # El ladrón se mueve a una casilla aleatoria y la partida sigue
+        timeouts = game_director.game_manager.agent_timeouts
+        assert timeouts and all(timeout['trigger'] == 'on_moving_thief' for timeout in timeouts)
+
+
+if __name__ == '__main__':
+    test = TestAgentTimeBudget()
+    test.test_looping_agent()
+    test.test_game_budget()
+    test.test_without_interruption()
+    test.test_fallback()
@@ -0,0 +1,72 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from Agents.AlexPastorAgent import AlexPastorAgent
+from Agents.RandomAgent import RandomAgent
+from Managers.GameDirector import GameDirector
+from TraceLoader.AsyncTraceWriter import AsyncTraceWriter
+
+
+class TestAsyncTraceWriter:
+    agents = [RandomAgent, AlexPastorAgent, RandomAgent, AlexPastorAgent]
+
+    def write_games(self, directory, trace_writer, **trace_options):
+        game_director = GameDirector(agents=self.agents, max_rounds=30, store_trace=False, trace_writer=trace_writer,
+                                     **trace_options)
+        game_director.store_trace = True
+        game_director.stream_trace = trace_options.get('stream_trace', False)
+        game_director.container_trace = trace_options.get('container_trace', False)
+        game_director.trace_loader.full_path = Path(directory)
+        for game_number in range(3):
+            game_director.game_start(game_number, False, seed=game_number)
+        game_director.trace_loader.export_every_game_to_file()
+        return {path.name: path.read_bytes() for path in Path(directory).iterdir()}
+
+    def test_same_files(self):
+        for trace_options in ({}, {'stream_trace': True}, {'container_trace': True}):
+            with tempfile.TemporaryDirectory() as directory, tempfile.TemporaryDirectory() as async_directory:
+                files = self.write_games(directory, None, **trace_options)
+                with AsyncTraceWriter(max_pending=2, fsync=True) as trace_writer:
+                    async_files = self.write_games(async_directory, trace_writer, **trace_options)
+                assert len(files) == 4
+                assert async_files == files
+
+    def test_backpressure(self):
+        written = []
+        release = threading.Event()
+        trace_writer = AsyncTraceWriter(max_pending=1)
+        trace_writer.submit(release.wait)
+        trace_writer.submit(written.append, 1)
+
+        # La cola está llena: la siguiente escritura espera a que el hilo avance
+        threading.Timer(0.05, release.set).start()
+        start = time.perf_counter()
+        trace_writer.submit(written.append, 2)
+        assert time.perf_counter() - start >= 0.04
+        assert trace_writer.blocked_seconds >= 0.04
+        trace_writer.close()
+        assert written == [1, 2]
+
+    def test_errors(self):
+        trace_writer = AsyncTraceWriter()
+        trace_writer.submit(open, '/no/existe/traza.json', 'w')
+        try:
+            trace_writer.flush()
+        except FileNotFoundError:
+            pass
+        else:
+            assert False
+        # El error solo se lanza una vez y el hilo sigue escribiendo
+        written = []
+        trace_writer.submit(written.append, 1)
+        trace_writer.close()
+        assert written == [1]
+
+
+if __name__ == '__main__':
+    test = TestAsyncTraceWriter()
+    test.test_same_files()
+    test.test_backpressure()
+    test.test_errors()
@@ -1,4 +1,4 @@
-from Classes.Board import Board
+from Classes.Board import Board, ADJACENT_NODES, CONTACTING_TERRAIN, EDGE_IDS, EDGES, NODE_EDGES
 from Classes.Constants import *
 
 
@@ -364,6 +364,57 @@ class TestBoard:
 
         return
 
+    def test_topology(self):
+        board = Board()
+        other_board = Board()
+
+        # La topología se calcula una sola vez y se comparte entre tableros, pero cada nodo y cada terreno tienen sus
+        # propias listas
+        assert board.contacting_nodes is other_board.contacting_nodes
+        assert board.nodes[0]['adjacent'] is not other_board.nodes[0]['adjacent']
+        assert board.terrain[0]['contacting_nodes'] is not other_board.terrain[0]['contacting_nodes']
+
+        for node in board.nodes:
+            assert node['adjacent'] == list(ADJACENT_NODES[node['id']]) == board.__get_adjacent_nodes__(node['id'])
+            assert node['contacting_terrain'] == list(CONTACTING_TERRAIN[node['id']])
+            assert sorted(end for _, end in NODE_EDGES[node['id']]) == \
+                   sorted(set(node['adjacent']) | {n['id'] for n in board.nodes if node['id'] in n['adjacent']})
+
+        for terrain in board.terrain:
+            for node_id in terrain['contacting_nodes']:
+                assert terrain['id'] in board.__get_contacting_terrain__(node_id)
+
+        # Cada carretera tiene un id, sea cual sea el sentido
+        for edge_id, (start, end) in enumerate(EDGES):
+            assert EDGE_IDS[(start, end)] == EDGE_IDS[(end, start)] == edge_id
+        return
+
+    def test_topology_is_not_shared_state(self):
+        board = Board()
+
+        # La topología compartida no se puede modificar
+        for attempt in (lambda: board.contacting_nodes[0].append(77),
+                        lambda: board.contacting_nodes.__setitem__(0, [77]),
+                        lambda: board.probabilities.__setitem__(0, 2),
+                        lambda: board.terrain_types.__setitem__(0, TerrainConstants.DESERT),
+                        lambda: board.harbors.__setitem__(2, HarborConstants.ALL),
+                        lambda: board.coastal_nodes.append(20)):
+            try:
+                attempt()
+            except (AttributeError, TypeError):
+                pass
+            else:
+                assert False, 'La topología compartida se ha podido modificar'
+
+        # Lo que se cambie en las listas de un tablero no llega a los tableros nuevos
+        board.terrain[0]['contacting_nodes'].append(77)
+        board.nodes[0]['adjacent'].append(77)
+        other_board = Board()
+        assert other_board.terrain[0]['contacting_nodes'] == [0, 1, 2, 8, 9, 10]
+        assert other_board.nodes[0]['adjacent'] == list(ADJACENT_NODES[0])
+        assert other_board.contacting_nodes[0] == (0, 1, 2, 8, 9, 10)
+        return
+
 
 if __name__ == '__main__':
     test = TestBoard()
@@ -376,3 +427,5 @@ if __name__ == '__main__':
     test.test_valid_road_nodes()
     test.test_valid_starting_nodes()
     test.test_check_for_player_harbors()
+    test.test_topology()
+    test.test_topology_is_not_shared_state()
@@ -0,0 +1,90 @@
+import json
+from copy import copy
+
+from Classes.Board import Board
+from Classes.BoardView import BoardView
+from Classes.CompactBoard import CompactBoard
+
+
+class TestBoardView:
+    def test_read(self):
+        for board in (Board(), CompactBoard()):
+            board.nodes[9]['player'] = 0
+            board.build_road(0, 9, 10)
+            board_view = BoardView(board)
+
+            assert board_view.nodes[9]['player'] == 0
+            assert board_view.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 10}]
+            assert dict(board_view.nodes[10]) == dict(board.nodes[10])
+            assert [terrain['has_thief'] for terrain in board_view.terrain] == \
+                   [terrain['has_thief'] for terrain in board.terrain]
+            assert board_view.valid_road_nodes(0) == board.valid_road_nodes(0)
+            assert board_view.__get_contacting_terrain__(9) == board.__get_contacting_terrain__(9)
+            assert len(board_view.nodes) == 54
+
+            # Igual que copy(board), la vista ve los cambios posteriores de la partida
+            board.build_road(0, 10, 11)
+            assert board_view.nodes[11]['roads'] == [{'player_id': 0, 'node_id': 10}]
+            assert board_view.valid_town_nodes(0) == board.valid_town_nodes(0)
+
+    def test_copy_on_write(self):
+        for board in (Board(), CompactBoard()):
+            board.nodes[9]['player'] = 0
+            board_view = BoardView(board)
+
+            # Las listas de los nodos y terrenos no se pueden modificar
+            board.build_road(0, 9, 8)
+            for attempt in (lambda: board_view.nodes[9]['adjacent'].append(30),
+                            lambda: board_view.nodes[9]['roads'].append({'player_id': 0, 'node_id': 10}),
+                            lambda: board_view.nodes[9]['roads'][0].__setitem__('player_id', 1),
+                            lambda: board_view.terrain[0]['contacting_nodes'].remove(0)):
+                try:
+                    attempt()
+                except TypeError:
+                    pass
+                else:
+                    assert False, 'Se ha podido modificar una lista de la vista'
+            assert not board_view.forked
+            assert board.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 8}]
+            assert 30 not in board.nodes[9]['adjacent'] and 0 in board.terrain[0]['contacting_nodes']
+
+            # copy() devuelve copias normales y modificables
+            node = board_view.nodes[9].copy()
+            assert type(node) is dict and type(node['roads']) is list and json.dumps(node)
+            node['roads'].append({'player_id': 0, 'node_id': 10})
+            roads = board_view.nodes[9]['roads'].copy()
+            roads.append(1)
+            assert board.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 8}]
+
+            # Lo que devuelven los métodos también son copias
+            board_view.valid_road_nodes(0).clear()
+            assert board_view.valid_road_nodes(0) == board.valid_road_nodes(0) != []
+            board.build_road(0, 9, 10)
+
+            # Solo se puede acceder al tablero a través de la vista
+            for name in ('board', '_nodes_by_id', 'node_listeners', 'get_node_listener'):
+                try:
+                    getattr(board_view, name)
+                except AttributeError:
+                    pass
+                else:
+                    assert False, 'La vista deja acceder a ' + name
+
+            # Modificar la vista la separa del tablero de la partida
+            other_view = copy(board_view)
+            board_view.nodes[20]['player'] = 1
+            board_view.build_road(0, 8, 7)
+            assert board_view.forked
+            assert board_view.nodes[20]['player'] == 1
+            assert board_view.nodes[8]['roads'] == [{'player_id': 0, 'node_id': 9}, {'player_id': 0, 'node_id': 7}]
+            assert board.nodes[20]['player'] == -1 and board.nodes[8]['roads'] == [{'player_id': 0, 'node_id': 9}]
+            assert other_view.nodes[20]['player'] == -1
+
+            board_view.move_thief(0)
+            assert board_view.terrain[0]['has_thief'] and not board.terrain[0]['has_thief']
+
+
+if __name__ == '__main__':
+    test = TestBoardView()
+    test.test_read()
+    test.test_copy_on_write()
@@ -0,0 +1,109 @@
+import random
+from copy import copy
+
+from Classes.Board import Board
+from Classes.CompactBoard import CompactBoard
+
+
+class TestBuildFrontier:
+    # Cálculos originales: se recorre el tablero entero
+    @staticmethod
+    def full_board_town_nodes(board, player_id):
+        valid_nodes = []
+        for node in board.nodes:
+            for road in node['roads']:
+                if (road['player_id'] == player_id and board.empty_adjacent_nodes(node['id']) and
+                        node['player'] == -1 and node['id'] not in valid_nodes):
+                    valid_nodes.append(node['id'])
+        return valid_nodes
+
+    @staticmethod
+    def full_board_city_nodes(board, player_id):
+        return [node['id'] for node in board.nodes if node['player'] == player_id and node['has_city'] == False]
+
+    @staticmethod
+    def full_board_road_nodes(board, player_id):
+        valid_nodes = []
+        for node in board.nodes:
+            for adjacent_node_id in node['adjacent']:
+                allowed_to_build = False
+                if board.nodes[adjacent_node_id]['player'] in [player_id, -1]:
+                    for road in board.nodes[adjacent_node_id]['roads']:
+                        if road['node_id'] != node['id']:
+                            allowed_to_build = road['player_id'] == player_id
+                        else:
+                            allowed_to_build = False
+                            break
+                if allowed_to_build:
+                    valid_nodes.append({'starting_node': adjacent_node_id, 'finishing_node': node['id']})
+        return valid_nodes
+
+    def check_board(self, board):
+        for player_id in range(4):
+            assert board.valid_town_nodes(player_id) == self.full_board_town_nodes(board, player_id)
+            assert board.valid_city_nodes(player_id) == self.full_board_city_nodes(board, player_id)
+            assert board.valid_road_nodes(player_id) == self.full_board_road_nodes(board, player_id)
+
+    def test_random_builds(self):
+        for board_class in (Board, CompactBoard):
+            random.seed(0)
+            board = board_class()
+            self.check_board(board)
+
+            for player_id, node_id in enumerate(random.sample(board.valid_starting_nodes(), 4)):
+                board.nodes[node_id]['player'] = player_id
+                board.build_road(player_id, node_id, board.nodes[node_id]['adjacent'][0])
+            self.check_board(board)
+
+            # Cada jugador construye al azar lo que le dejan, comprobando después de cada construcción
+            for _ in range(150):
+                player_id = random.randint(0, 3)
+                options = ([('road', road) for road in board.valid_road_nodes(player_id)] +
+                           [('town', node_id) for node_id in board.valid_town_nodes(player_id)] +
+                           [('city', node_id) for node_id in board.valid_city_nodes(player_id)])
+                if not options:
+                    continue
+                build, where = random.choice(options)
+                if build == 'road':
+                    board.build_road(player_id, where['starting_node'], where['finishing_node'])
+                elif build == 'town':
+                    board.build_town(player_id, where)
+                else:
+                    board.build_city(player_id, where)
+                self.check_board(board)
+
+    def test_direct_changes(self):
+        board = Board()
+        board.valid_town_nodes(0)
+
+        # Los cambios hechos directamente sobre los nodos también se tienen en cuenta
+        board.nodes[10]['roads'].append({'player_id': 0, 'node_id': 11})
+        board.nodes[11]['roads'].append({'player_id': 0, 'node_id': 10})
+        assert board.valid_town_nodes(0) == [10, 11]
+        assert board.valid_road_nodes(0) == self.full_board_road_nodes(board, 0)
+
+        board.nodes[12]['player'] = 1
+        assert board.valid_town_nodes(0) == [10]
+        assert board.valid_city_nodes(1) == [12]
+        assert board.valid_road_nodes(0) == self.full_board_road_nodes(board, 0)
+
+        board.nodes[12]['has_city'] = True
+        assert board.valid_city_nodes(1) == []
+
+    def test_board_copies(self):
+        board = Board()
+        board.valid_town_nodes(0)
+
+        # Las copias superficiales reutilizan las estructuras del tablero original en lugar de crear otras
+        for _ in range(5):
+            board_copy = copy(board)
+            board_copy.valid_road_nodes(0)
+            board_copy.longest_road()
+        assert len(board.node_listeners) == 2
+
+
+if __name__ == '__main__':
+    test = TestBuildFrontier()
+    test.test_random_builds()
+    test.test_direct_changes()
+    test.test_board_copies()
@@ -0,0 +1,120 @@
+import pickle
+from copy import copy, deepcopy
+
+from Classes.Board import Board, EDGES
+from Classes.BuildFrontier import BuildFrontier
+from Classes.CompactBoard import CompactBoard
+
+
+class TestCompactBoard:
+    @staticmethod
+    def play(board):
+        # Misma secuencia de construcciones en cualquier tipo de tablero
+        board.nodes[9]['player'] = 0
+        board.nodes[20]['player'] = 1
+        board.build_road(0, 9, 10)
+        board.build_road(0, 10, 11)
+        board.build_road(0, 9, 8)
+        board.build_road(1, 20, 19)
+        board.build_road(1, 20, 21)
+        board.build_town(0, 11)
+        board.build_city(1, 20)
+        board.move_thief(4)
+        return board
+
+    def test_same_as_board(self):
+        board = self.play(Board())
+        compact_board = self.play(CompactBoard())
+
+        assert [dict(node) for node in board.nodes] == [node.__to_object__() for node in compact_board.nodes]
+        assert board.terrain == [terrain.__to_object__() for terrain in compact_board.terrain]
+
+        for player_id in range(4):
+            assert board.valid_town_nodes(player_id) == compact_board.valid_town_nodes(player_id)
+            assert board.valid_city_nodes(player_id) == compact_board.valid_city_nodes(player_id)
+            assert board.valid_road_nodes(player_id) == compact_board.valid_road_nodes(player_id)
+        assert board.valid_starting_nodes() == compact_board.valid_starting_nodes()
+        assert board.longest_road() == compact_board.longest_road()
+
+        # Las carreteras se devuelven en orden de construcción
+        assert compact_board.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 10}, {'player_id': 0, 'node_id': 8}]
+        assert len(EDGES) == 73
+
+    def test_build_errors(self):
+        board = CompactBoard()
+        board.nodes[9]['player'] = 0
+        assert board.build_road(0, 9, 10)['response']
+        assert not board.build_road(0, 10, 9)['response']
+        assert not board.build_road(1, 10, 11)['response']
+        # Board no comprueba que los nodos sean adyacentes; CompactBoard no tiene dónde guardar esa carretera
+        assert not board.build_road(0, 9, 30)['response']
+        other_board = Board()
+        other_board.nodes[9]['player'] = 0
+        assert other_board.build_road(0, 9, 30)['response']
+        assert not board.build_town(0, 10)['response']
+        assert not board.build_city(1, 9)['response']
+        assert not board.move_thief(7)['response']
+        assert not board.terrain[7]['has_thief']
+
+    def test_node_roads(self):
+        board = self.play(CompactBoard())
+        longest_road = board.longest_road()
+
+        # Las listas de carreteras son de solo lectura: modificarlas no se pierde sin avisar
+        for attempt in (lambda: board.nodes[9]['roads'].append({'player_id': 0, 'node_id': 1}),
+                        lambda: board.nodes[9]['roads'].clear(),
+                        lambda: board.nodes[9]['roads'][0].__setitem__('player_id', 1)):
+            try:
+                attempt()
+            except TypeError:
+                pass
+            else:
+                assert False, 'Se ha podido modificar una lista de carreteras'
+        assert board.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 10}, {'player_id': 0, 'node_id': 8}]
+
+        # Asignar la lista cambia las carreteras del nodo y avisa a las estructuras incrementales
+        board.nodes[10]['roads'] = [{'player_id': 0, 'node_id': 11}]
+        assert board.nodes[10]['roads'] == [{'player_id': 0, 'node_id': 11}]
+        assert board.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 8}]
+        assert board.longest_road() != longest_road
+        board.nodes[10]['roads'] = [{'player_id': 0, 'node_id': 11}, {'player_id': 0, 'node_id': 9}]
+        assert board.longest_road() == longest_road
+        assert board.nodes[9]['roads'] == [{'player_id': 0, 'node_id': 8}, {'player_id': 0, 'node_id': 10}]
+
+        board.nodes[10]['roads'] = []
+        assert board.nodes[10]['roads'] == [] and board.nodes[11]['roads'] == []
+        fresh_frontier = BuildFrontier(board)
+        for player_id in range(2):
+            assert sorted(board.valid_road_nodes(player_id), key=repr) == \
+                sorted(fresh_frontier.get_road_nodes(player_id), key=repr)
+        try:
+            board.nodes[10]['roads'] = [{'player_id': 0, 'node_id': 30}]
+        except ValueError:
+            pass
+        else:
+            assert False, 'Se ha podido guardar una carretera entre nodos no adyacentes'
+
+    def test_copies(self):
+        board = self.play(CompactBoard())
+
+        # copy() comparte el estado con el original, igual que Board
+        board_copy = copy(board)
+        board_copy.nodes[0]['player'] = 3
+        assert board.nodes[0]['player'] == 3
+
+        # snapshot(), deepcopy() y pickle dan tableros independientes
+        for board_snapshot in (board.snapshot(), deepcopy(board), pickle.loads(pickle.dumps(board))):
+            board_snapshot.nodes[0]['player'] = 2
+            board_snapshot.build_road(2, 0, 1)
+            assert board.nodes[0]['player'] == 3
+            assert board.nodes[0]['roads'] == []
+            assert board_snapshot.nodes[1]['roads'] == [{'player_id': 2, 'node_id': 0}]
+            assert isinstance(board_snapshot, CompactBoard)
+
+
+if __name__ == '__main__':
+    test = TestCompactBoard()
+    test.test_same_as_board()
+    test.test_build_errors()
+    test.test_node_roads()
+    test.test_copies()
@@ -0,0 +1,63 @@
+import random
+
+from Agents.RandomAgent import RandomAgent
+from Classes.GameResult import GameResult
+from Managers.GameDirector import GameDirector
+
+
+class TestGameResult:
+    def test_winner_and_rank(self):
+        game_result = GameResult([7, 10, 4, 10], True, 30, 1, 3, [0, 1, 0, 0], 118, 0.5)
+        assert game_result.winner == 1
+        assert [game_result.rank(i) for i in range(4)] == [3, 1, 4, 2]
+        assert game_result.__to_object__() == {'victory_points': [7, 10, 4, 10], 'hidden_victory_points': [0, 1, 0, 0],
+                                               'winner': 1, 'finished': True, 'rounds': 30, 'turns': 118,
+                                               'largest_army': 1, 'longest_road': 3, 'elapsed_time': 0.5,
+                                               'seed': None, 'agent_timeouts': [0, 0, 0, 0]}
+
+    def test_fast_mode(self):
+        agents = [RandomAgent, RandomAgent, RandomAgent, RandomAgent]
+        game_director = GameDirector(agents=agents, max_rounds=50, store_trace=False)
+        fast_game_director = GameDirector(agents=agents, max_rounds=50, store_trace=False, fast=True)
+
+        for seed in range(3):
+            random.seed(seed)
+            game_trace = game_director.game_start(seed, False)
+            random.seed(seed)
+            game_result = fast_game_director.game_start(seed, False)
+
+            # El modo rápido juega exactamente la misma partida
+            assert isinstance(game_result, GameResult)
+            last_round = game_trace['game']['round_' + str(len(game_trace['game']) - 1)]
+            victory_points = last_round[max(last_round)]['end_turn']['victory_points']
+            assert game_result.victory_points == [int(victory_points['J' + str(i)]) for i in range(4)]
+            assert game_result.rounds == len(game_trace['game'])
+
+            players = game_director.game_manager.get_players()
+            assert game_result.largest_army == next((p['id'] for p in players if p['largest_army']), -1)
+            assert game_result.longest_road == next((p['id'] for p in players if p['longest_road']), -1)
+            assert game_result.hidden_victory_points == [p['hidden_victory_points'] for p in players]
+            assert game_result.turns == sum(len(game_round) for game_round in game_trace['game'].values())
+            assert game_result.elapsed_time > 0
+
+    def test_return_result(self):
+        game_director = GameDirector(agents=[RandomAgent] * 4, max_rounds=50, store_trace=False)
+
+        random.seed(0)
+        game_result = game_director.game_start(0, False, return_result=True)
+        assert isinstance(game_result, GameResult)
+        assert game_director.game_result is game_result
+        assert 'game' in game_director.trace_loader.current_trace
+
+        # Sin return_result se sigue devolviendo la traza, y el resultado queda en game_director.game_result
+        random.seed(0)
+        game_trace = game_director.game_start(0, False)
+        assert game_trace is game_director.trace_loader.current_trace
+        assert game_director.game_result.victory_points == game_result.victory_points
+
+
+if __name__ == '__main__':
+    test = TestGameResult()
+    test.test_winner_and_rank()
+    test.test_fast_mode()
+    test.test_return_result()
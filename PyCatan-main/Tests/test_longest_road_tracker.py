@@ -0,0 +1,112 @@
+from copy import copy, deepcopy
+
+from Classes.Board import Board
+from Managers.GameManager import GameManager
+
+
+class TestLongestRoadTracker:
+    game_manager = GameManager(for_test=True)
+
+    def full_board_longest_road(self):
+        # Cálculo original: se recorre el tablero entero desde todos los nodos
+        longest_road = {'longest_road': 0, 'player': -1}
+        for node in self.game_manager.board.nodes:
+            longest_road_obj = self.game_manager.longest_road_calculator(node, 1, {'longest_road': 0, 'player': -1},
+                                                                         -1, [node['id']])
+            if longest_road_obj['longest_road'] > longest_road['longest_road']:
+                longest_road = longest_road_obj
+        return longest_road
+
+    def test_longest_road(self):
+        self.game_manager.reset_game_values()
+        board = self.game_manager.board
+
+        assert board.longest_road() == {'longest_road': 0, 'player': -1}
+
+        # Carretera de 5 del J0
+        board.nodes[0]['player'] = 0
+        board.build_road(0, 0, 1)
+        board.build_road(0, 1, 2)
+        board.build_road(0, 0, 8)
+        assert board.longest_road() == self.full_board_longest_road() == {'longest_road': 3, 'player': 0}
+
+        board.build_road(0, 8, 9)
+        board.build_road(0, 9, 10)
+        assert board.longest_road() == self.full_board_longest_road() == {'longest_road': 5, 'player': 0}
+
+        # Carretera de 8 del J1
+        board.nodes[17]['player'] = 1
+        for start, end in [(17, 18), (18, 19), (19, 20), (20, 31), (31, 32), (32, 33), (33, 34), (34, 35)]:
+            board.build_road(1, start, end)
+        assert board.longest_road() == self.full_board_longest_road() == {'longest_road': 8, 'player': 1}
+
+    def test_town_cuts_road(self):
+        self.game_manager.reset_game_values()
+        board = self.game_manager.board
+
+        board.nodes[17]['player'] = 1
+        for start, end in [(17, 18), (18, 19), (19, 20), (20, 31), (31, 32), (32, 33)]:
+            board.build_road(1, start, end)
+        assert board.longest_road() == {'longest_road': 6, 'player': 1}
+
+        # Un pueblo del J2 en mitad de la carretera del J1 la corta, aunque se ponga sin pasar por build_town
+        board.nodes[31]['player'] = 2
+        assert board.longest_road() == self.full_board_longest_road()
+        assert board.longest_road()['longest_road'] < 6
+
+    def test_removed_roads(self):
+        self.game_manager.reset_game_values()
+        board = self.game_manager.board
+
+        board.nodes[0]['player'] = 0
+        for start, end in [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)]:
+            board.build_road(0, start, end)
+        board.nodes[17]['player'] = 1
+        for start, end in [(17, 18), (18, 19), (19, 20)]:
+            board.build_road(1, start, end)
+        assert board.longest_road() == {'longest_road': 5, 'player': 0}
+
+        # Quitar una carretera de en medio parte la red en dos
+        board.nodes[2]['roads'].remove({'player_id': 0, 'node_id': 3})
+        board.nodes[3]['roads'].pop(0)
+        assert board.longest_road() == self.full_board_longest_road() == {'longest_road': 3, 'player': 1}
+
+        # Quitar las carreteras de todos los nodos deja el tablero sin carreteras, se haga como se haga
+        for node in board.nodes:
+            if node['id'] % 2:
+                node['roads'].clear()
+            else:
+                node['roads'] = []
+        assert board.longest_road() == self.full_board_longest_road() == {'longest_road': 0, 'player': -1}
+
+        # Y se pueden volver a construir
+        board.build_road(0, 0, 1)
+        board.build_road(0, 1, 2)
+        assert board.longest_road() == self.full_board_longest_road() == {'longest_road': 2, 'player': 0}
+
+    def test_board_copies(self):
+        self.game_manager.reset_game_values()
+        board = self.game_manager.board
+        board.longest_road()
+
+        # Las copias superficiales comparten nodos, así que los cambios hechos a través de ellas también cuentan
+        board_copy = copy(board)
+        board_copy.nodes[0]['player'] = 0
+        for start, end in [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)]:
+            board_copy.build_road(0, start, end)
+        assert board.longest_road() == {'longest_road': 5, 'player': 0}
+
+        # Las copias profundas tienen sus propios nodos
+        board_deepcopy = deepcopy(board)
+        board_deepcopy.build_road(0, 5, 6)
+        assert board_deepcopy.longest_road() == {'longest_road': 6, 'player': 0}
+        assert board.longest_road() == {'longest_road': 5, 'player': 0}
+        assert isinstance(board_deepcopy, Board)
+
+
+if __name__ == '__main__':
+    test = TestLongestRoadTracker()
+    test.test_longest_road()
+    test.test_town_cuts_road()
+    test.test_removed_roads()
+    test.test_board_copies()
@@ -39,8 +39,29 @@ class TestMaterials:
         materials = Materials(1, 0, 4, 2, 7)
         assert not materials.has_more(Materials(1, 0, -1, 1, 1))
 
+    def test_fast_paths(self):
+        materials = Materials(1, 0, 4, 2, 7)
+
+        # Los caminos rápidos dan lo mismo que las operaciones originales. Materials.__eq__ no devuelve un bool, así
+        # que se comparan como tuplas
+        for material_id in range(5):
+            for amount in (-3, -1, 1, 2):
+                expected = (materials + Materials.from_ids([material_id], amount)).replace_negative()
+                assert tuple(materials.add_material(material_id, amount)) == tuple(expected)
+                assert tuple(Materials.from_ids(material_id, amount)) == tuple(Materials.from_ids([material_id], amount))
+
+        assert tuple(materials + Materials(1, 1, 1, 1, 1)) == (2, 1, 5, 3, 8)
+        assert tuple(materials - Materials(1, 1, 1, 1, 1)) == (0, -1, 3, 1, 6)
+        assert type(materials + materials) is Materials
+        assert tuple(Materials(-1, 2, -3, 0, 1).replace_negative()) == (0, 2, 0, 0, 1)
+        assert materials.replace_negative() is materials
+        assert Materials(0, 0, 0, 0, 0).is_empty() and not materials.is_empty()
+        assert Materials(0, -1, 0, 0, 0).check_negative() and not materials.check_negative()
+        assert tuple(Materials.from_building(BuildConstants.CITY)) == (2, 3, 0, 0, 0)
+
 
 if __name__ == '__main__':
     test = TestMaterials()
     test.test_add_materials()
-    test.test_has_more_materials_than_build_values()
\ No newline at end of file
+    test.test_has_more_materials_than_build_values()
+    test.test_fast_paths()
\ No newline at end of file
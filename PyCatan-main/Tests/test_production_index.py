@@ -0,0 +1,42 @@
+from Classes.Board import Board
+
+
+class TestProductionIndex:
+    @staticmethod
+    def production(board, dice):
+        # Materials.__eq__ no devuelve un bool, así que se comparan como tuplas
+        return {player_id: tuple(materials) for player_id, materials in board.production(dice).items()}
+
+    def test_production(self):
+        board = Board()
+
+        # Sin pueblos no se produce nada
+        for dice in range(2, 13):
+            assert self.production(board, dice) == {}
+
+        # El nodo 20 toca los terrenos 4 (mineral, 6), 8 (madera, 3) y 9 (cereal, 11)
+        board.nodes[20]['player'] = 0
+        assert self.production(board, 6) == {0: (0, 1, 0, 0, 0)}
+        assert self.production(board, 3) == {0: (0, 0, 0, 1, 0)}
+        assert self.production(board, 11) == {0: (1, 0, 0, 0, 0)}
+
+        # Al convertirlo en ciudad produce el doble
+        board.build_city(0, 20)
+        assert self.production(board, 11) == {0: (2, 0, 0, 0, 0)}
+
+        # El nodo 0 toca el terreno 0 (madera, 11)
+        board.nodes[0]['player'] = 2
+        assert self.production(board, 11) == {0: (2, 0, 0, 0, 0), 2: (0, 0, 0, 1, 0)}
+
+        # Si se quita el pueblo deja de producir
+        board.nodes[0]['player'] = -1
+        assert self.production(board, 11) == {0: (2, 0, 0, 0, 0)}
+
+        # Nunca sale un 7 ni se produce con el desierto
+        assert self.production(board, 7) == {}
+        return
+
+
+if __name__ == '__main__':
+    test = TestProductionIndex()
+    test.test_production()
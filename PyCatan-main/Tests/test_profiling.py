@@ -0,0 +1,60 @@
+import pstats
+import tempfile
+import time
+from pathlib import Path
+
+from Agents.RandomAgent import RandomAgent
+from Classes.Profiling import ProfileData, Profiler, StackSampler
+from Managers.GameDirector import GameDirector
+
+
+def busy_loop(seconds):
+    end = time.process_time() + seconds
+    total = 0
+    while time.process_time() < end:
+        total += 1
+    return total
+
+
+class TestProfiling:
+    def test_sampler(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        busy_loop(0.1)
+        sampler.stop()
+
+        if StackSampler.can_sample():
+            assert sum(sampler.stacks.values()) > 10
+            assert all(';' in stack for stack in sampler.stacks)
+            assert any(stack.endswith('test_profiling.py:busy_loop') for stack in sampler.stacks)
+
+    def test_merge_and_dump(self):
+        game_director = GameDirector(agents=[RandomAgent] * 4, max_rounds=20, store_trace=False, fast=True)
+        profiles = []
+        for seed in range(2):
+            with Profiler(sample_interval=0.001) as profiler:
+                game_director.game_start(0, False, seed=seed)
+            profiles.append(profiler.profile_data())
+
+        merged = ProfileData().merge(profiles[0]).merge(profiles[1])
+        game_start = next(function for function in merged.stats if function[2] == 'game_start')
+        # (llamadas primitivas, llamadas, tiempo propio, tiempo acumulado, llamadores)
+        assert merged.stats[game_start][1] == 2
+        assert sum(merged.stacks.values()) == sum(sum(profile.stacks.values()) for profile in profiles)
+
+        with tempfile.TemporaryDirectory() as directory:
+            stats_path = Path(directory) / 'profile.pstats'
+            collapsed_path = Path(directory) / 'profile.collapsed'
+            merged.dump_stats(stats_path)
+            merged.write_collapsed(collapsed_path)
+
+            assert pstats.Stats(str(stats_path)).total_calls == sum(stat[1] for stat in merged.stats.values())
+            lines = collapsed_path.read_text().splitlines()
+            assert len(lines) == len(merged.stacks)
+            assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+
+if __name__ == '__main__':
+    test = TestProfiling()
+    test.test_sampler()
+    test.test_merge_and_dump()
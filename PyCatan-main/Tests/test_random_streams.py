@@ -0,0 +1,73 @@
+import json
+import random
+
+from Agents.AlexPastorAgent import AlexPastorAgent
+from Agents.RandomAgent import RandomAgent
+from Classes.RandomStreams import RandomStreams
+from Managers.GameDirector import GameDirector
+from TraceLoader.TraceLoader import to_json_object
+
+
+class TestRandomStreams:
+    agents = [RandomAgent, RandomAgent, AlexPastorAgent, AlexPastorAgent]
+
+    @staticmethod
+    def play(game_director, seed):
+        game_trace = game_director.game_start(seed, False, seed=seed)
+        return json.dumps(game_trace, default=to_json_object)
+
+    def test_same_seed_same_game(self):
+        game_director = GameDirector(agents=self.agents, max_rounds=50, store_trace=False)
+        first_traces = [self.play(game_director, seed) for seed in range(3)]
+
+        # Las partidas no dependen de las jugadas antes ni del estado global de random
+        other_game_director = GameDirector(agents=self.agents, max_rounds=50, store_trace=False)
+        random.seed(1234)
+        assert [self.play(other_game_director, seed) for seed in (2, 1, 0)] == first_traces[::-1]
+        assert first_traces[0] != first_traces[1]
+        assert game_director.game_result.seed == 2
+
+    def test_global_state_untouched(self):
+        game_director = GameDirector(agents=self.agents, max_rounds=50, store_trace=False, fast=True)
+        random.seed(0)
+        state = random.getstate()
+        game_director.game_start(0, False, seed=7)
+        assert random.getstate() == state
+
+        # Sin semilla se sigue usando el estado global
+        game_director.game_start(0, False)
+        assert random.getstate() != state
+        assert game_director.game_result.seed is None
+
+    def test_agent_streams(self):
+        random_streams = RandomStreams(5)
+        random.seed(0)
+        with random_streams.agent(0):
+            first = random.random()
+        with random_streams.agent(1):
+            other_seat = random.random()
+        with random_streams.agent(0):
+            second = random.random()
+        random_streams.release()
+        after = random.random()
+
+        # Cada asiento sigue su propia secuencia y el estado global queda como estaba
+        seat_stream = random.Random('5:agent_0')
+        assert [first, second] == [seat_stream.random(), seat_stream.random()]
+        assert other_seat == random.Random('5:agent_1').random()
+        random.seed(0)
+        assert after == random.random()
+
+        # Sin semilla todas las fuentes son el módulo random
+        random_streams = RandomStreams()
+        assert random_streams.dice is random_streams.deck is random_streams.engine is random
+        random.seed(0)
+        with random_streams.agent(0):
+            assert random.random() == random.Random(0).random()
+
+
+if __name__ == '__main__':
+    test = TestRandomStreams()
+    test.test_same_seed_same_game()
+    test.test_global_state_untouched()
+    test.test_agent_streams()
@@ -0,0 +1,42 @@
+from Classes.Ratings import EloRatings
+
+
+class TestEloRatings:
+    def test_update(self):
+        ratings = EloRatings(k_factor=30)
+        changes = ratings.update(['A', 'B', 'C', 'D'], [10, 7, 7, 3])
+
+        # Con todos a 1500 cada par vale 0.5: A gana a los 3, B y C empatan entre ellos, D pierde con todos
+        assert changes == {'A': 15.0, 'B': 0.0, 'C': 0.0, 'D': -15.0}
+        assert abs(sum(changes.values())) < 1e-9
+        assert [agent for agent, _, _ in ratings.ranking()] == ['A', 'B', 'C', 'D']
+        assert ratings.games == {'A': 1, 'B': 1, 'C': 1, 'D': 1}
+
+    def test_expected_score(self):
+        ratings = EloRatings()
+        ratings.ratings = {'A': 1900, 'B': 1500}
+        assert abs(ratings.expected_score('A', 'B') - 10 / 11) < 1e-12
+        assert abs(ratings.expected_score('A', 'B') + ratings.expected_score('B', 'A') - 1) < 1e-12
+
+        # Ganar al favorito da más puntos que ganar a un rival más débil
+        changes = ratings.update(['A', 'B', 'C', 'D'], [2, 10, 2, 2])
+        assert changes['B'] > -changes['C']
+
+    def test_incremental(self):
+        # Las puntuaciones se actualizan partida a partida y el total de puntos se conserva
+        games = [(['A', 'B', 'C', 'D'], [10, 4, 6, 2]), (['B', 'C', 'D', 'E'], [3, 10, 5, 5]),
+                 (['E', 'A', 'C', 'B'], [10, 8, 2, 2])]
+        ratings = EloRatings()
+        for agents, victory_points in games:
+            ratings.update(agents, victory_points)
+            assert abs(sum(ratings.ratings.values()) - 1500 * len(ratings.ratings)) < 1e-9
+
+        assert ratings.games == {'A': 2, 'B': 3, 'C': 3, 'D': 2, 'E': 2}
+        assert ratings.get_rating('F') == 1500
+
+
+if __name__ == '__main__':
+    test = TestEloRatings()
+    test.test_update()
+    test.test_expected_score()
+    test.test_incremental()
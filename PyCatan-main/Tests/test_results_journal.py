@@ -0,0 +1,56 @@
+import tempfile
+from pathlib import Path
+
+from Classes.ResultsJournal import ResultsJournal
+
+
+class TestResultsJournal:
+    @staticmethod
+    def result(position, seed, victory_points):
+        return {'agent': 'RandomAgent', 'position': position, 'seed': seed, 'victory': int(victory_points >= 10),
+                'victory_points': victory_points, 'rank': 1}
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'journal.jsonl'
+            journal = ResultsJournal(path)
+            assert len(journal) == 0
+            journal.append([self.result(0, 0, 10), self.result(0, 1, 4)])
+            journal.append([self.result(1, 0, 7)])
+
+            # Al volver a abrir el diario están todas las partidas ya jugadas
+            journal = ResultsJournal(path)
+            assert len(journal) == 3
+            assert ('RandomAgent', 0, 1) in journal
+            assert ('RandomAgent', 1, 1) not in journal
+            assert journal.results[('RandomAgent', 1, 0)]['victory_points'] == 7
+            assert [result['seed'] for result in journal.filter(position=0)] == [0, 1]
+
+    def test_interrupted_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'journal.jsonl'
+            ResultsJournal(path).append([self.result(0, 0, 10)])
+            # El proceso murió a mitad de una línea
+            with open(path, 'a') as journal_file:
+                journal_file.write('{"agent": "RandomAgent", "posi')
+
+            journal = ResultsJournal(path)
+            assert len(journal) == 1
+            journal.append([self.result(0, 1, 3)])
+            assert len(ResultsJournal(path)) == 2
+
+    def test_key_fields(self):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = ResultsJournal(Path(directory) / 'journal.jsonl', key_fields=('seed',))
+            journal.append([self.result(0, 5, 3), self.result(1, 5, 8)])
+            # La misma clave se sobrescribe con el último resultado
+            assert len(journal) == 1
+            assert (5,) in journal
+            assert journal.results[(5,)]['position'] == 1
+
+
+if __name__ == '__main__':
+    test = TestResultsJournal()
+    test.test_resume()
+    test.test_interrupted_write()
+    test.test_key_fields()
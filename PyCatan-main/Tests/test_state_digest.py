@@ -0,0 +1,82 @@
+from Agents.AlexPastorAgent import AlexPastorAgent
+from Agents.RandomAgent import RandomAgent
+from Classes.CompactBoard import CompactBoard
+from Classes.StateDigest import StateDigest
+from Managers.GameDirector import GameDirector
+from TraceLoader.TraceComparison import trace_turns
+
+
+class TestStateDigest:
+    agents = [RandomAgent, AlexPastorAgent, RandomAgent, AlexPastorAgent]
+
+    def digests(self, seed, **options):
+        game_director = GameDirector(agents=self.agents, max_rounds=60, store_trace=False, state_digest=True,
+                                     **options)
+        game_trace = game_director.game_start(0, False, seed=seed)
+        return [turn_object['end_turn']['state_digest'] for _, _, turn_object in trace_turns(game_trace)]
+
+    def test_trace_digests(self):
+        digests = self.digests(4)
+        assert all(len(digest) == 16 for digest in digests)
+        assert len(set(digests)) > len(digests) // 2
+
+        # El resumen solo depende del estado: misma partida, mismo resumen con cualquier tablero
+        assert self.digests(4, board_class=CompactBoard) == digests
+        assert self.digests(5) != digests
+
+        # En modo rápido no hay traza, pero el resumen final es el mismo
+        game_director = GameDirector(agents=self.agents, max_rounds=60, fast=True, state_digest=True)
+        game_director.game_start(0, False, seed=4)
+        assert game_director.game_manager.state_digest.hexdigest() == digests[-1]
+
+        # Sin state_digest la traza no cambia
+        game_director = GameDirector(agents=self.agents, max_rounds=5, store_trace=False)
+        game_trace = game_director.game_start(0, False, seed=4)
+        assert all('state_digest' not in turn_object['end_turn'] for _, _, turn_object in trace_turns(game_trace))
+
+    def test_incremental(self):
+        # Se juega la colocación inicial y una ronda, y después se siguen jugando rondas a mano
+        game_director = GameDirector(agents=self.agents, max_rounds=1, store_trace=False, fast=True)
+        game_director.game_start(0, False, seed=2)
+        state_digest = StateDigest()
+        digests = set()
+        for round_number in range(40):
+            game_director.round_start(False)
+            state = game_director.game_manager.get_state_snapshot()
+            # Actualizarlo con los cambios da lo mismo que calcularlo desde cero
+            digests.add(state_digest.update(state))
+            assert state_digest.digest == StateDigest().update(state)
+        assert len(digests) > 20
+
+        state['players'][2]['resources'][0] += 1
+        assert state_digest.update(state) != StateDigest().update(game_director.game_manager.get_state_snapshot())
+        state['players'][2]['resources'][0] -= 1
+        assert state_digest.update(state) == StateDigest().update(game_director.game_manager.get_state_snapshot())
+
+    def test_tracks_changes(self):
+        for board_class in (None, CompactBoard):
+            options = {'board_class': board_class} if board_class else {}
+            game_director = GameDirector(agents=self.agents, max_rounds=1, store_trace=False, fast=True,
+                                         state_digest=True, **options)
+            game_director.game_start(0, False, seed=3)
+            game_manager = game_director.game_manager
+
+            # El resumen se mantiene sin volver a leer el estado completo de la partida
+            get_state_snapshot = game_manager.get_state_snapshot
+            game_manager.get_state_snapshot = None
+            for round_number in range(40):
+                game_director.round_start(False)
+                digest = game_manager.update_state_digest()
+                assert int(digest, 16) == StateDigest().update(get_state_snapshot())
+
+            # Cada cambio en un nodo se aplica en cuanto ocurre
+            node = next(node for node in game_manager.board.nodes if node['player'] == -1)
+            node['player'] = 1
+            assert game_manager.state_digest.digest == StateDigest().update(get_state_snapshot())
+
+
+if __name__ == '__main__':
+    test = TestStateDigest()
+    test.test_trace_digests()
+    test.test_incremental()
+    test.test_tracks_changes()
@@ -0,0 +1,85 @@
+import random
+import statistics
+
+from Classes.Statistics import SampleStatistics, SequentialProbabilityRatioTest
+
+
+class TestSampleStatistics:
+    def test_mean_and_interval(self):
+        values = [1, 0, 0, 1, 1, -1, 0, 1]
+        sample = SampleStatistics()
+        for value in values:
+            sample.add(value)
+
+        assert sample.count == len(values)
+        assert sample.mean() == statistics.mean(values)
+        assert abs(sample.variance() - statistics.variance(values)) < 1e-12
+        low, high = sample.confidence_interval()
+        assert low < sample.mean() < high
+        assert abs((high - low) / 2 - 1.96 * (statistics.variance(values) / len(values)) ** 0.5) < 1e-12
+
+    def test_merge(self):
+        first, second, merged = SampleStatistics(), SampleStatistics(), SampleStatistics()
+        for value in range(10):
+            (first if value % 2 else second).add(value)
+            merged.add(value)
+
+        first.merge(second)
+        assert (first.count, first.total, first.total_squares) == (merged.count, merged.total, merged.total_squares)
+
+    def test_empty(self):
+        sample = SampleStatistics()
+        assert sample.mean() == 0.0
+        assert sample.confidence_interval() == (0.0, 0.0)
+        sample.add(3)
+        assert sample.variance() == 0.0
+
+
+class TestSequentialProbabilityRatioTest:
+    @staticmethod
+    def games_until_decision(win_rate, seed):
+        rng = random.Random(seed)
+        sprt = SequentialProbabilityRatioTest(0.25, 0.35)
+        while sprt.decision() is None:
+            sprt.add(int(rng.random() < win_rate))
+        return sprt
+
+    def test_decisions(self):
+        # Un agente claramente mejor o peor se decide con muchas menos partidas que las 4000 del benchmark
+        for seed in range(5):
+            strong = self.games_until_decision(0.6, seed)
+            assert strong.decision() == SequentialProbabilityRatioTest.ACCEPT_P1
+            assert strong.games < 400
+            weak = self.games_until_decision(0.05, seed)
+            assert weak.decision() == SequentialProbabilityRatioTest.ACCEPT_P0
+            assert weak.games < 400
+
+    def test_batches(self):
+        # Añadir resultados por lotes es lo mismo que añadirlos de uno en uno
+        one_by_one, batch = SequentialProbabilityRatioTest(), SequentialProbabilityRatioTest()
+        results = [1, 0, 0, 1, 0, 0, 0, 1, 1, 0]
+        for result in results:
+            one_by_one.add(result)
+        batch.add(sum(results), len(results))
+        assert abs(one_by_one.log_likelihood_ratio - batch.log_likelihood_ratio) < 1e-12
+        assert (batch.wins, batch.games) == (4, 10)
+        assert batch.decision() is None
+
+    def test_invalid_rates(self):
+        for p0, p1 in [(0.3, 0.2), (0, 0.5), (0.5, 1)]:
+            try:
+                SequentialProbabilityRatioTest(p0, p1)
+                assert False
+            except ValueError:
+                pass
+
+
+if __name__ == '__main__':
+    test = TestSampleStatistics()
+    test.test_mean_and_interval()
+    test.test_merge()
+    test.test_empty()
+    test = TestSequentialProbabilityRatioTest()
+    test.test_decisions()
+    test.test_batches()
+    test.test_invalid_rates()
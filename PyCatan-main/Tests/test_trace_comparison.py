@@ -1,22 +1,95 @@
+import concurrent.futures
+import json
+import os
+import random
 import sys
-sys.path.append('..') # This is to add the parent directory to the path
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))  # This is to add the parent directory to the path
 
 from Managers.GameDirector import GameDirector
 from Agents.RandomAgent import RandomAgent as ra
 from Agents.AdrianHerasAgent import AdrianHerasAgent as aha
+from TraceLoader.TraceComparison import find_divergence, format_divergence
+
+# Las trazas de test_traces se generaron con estos agentes, random.seed(i) y un máximo de 200 rondas
+TRACES_PATH = Path(__file__).parent / 'test_traces'
+TOTAL_GAMES = 100
+game_director = None
+
+
+def check_game(game_number):
+    """
+    Juega la partida game_number y la compara con su traza guardada.
+    :param game_number: (int) Número de la partida.
+    :return: (int, dict/None) Número de la partida y primera diferencia (ver find_divergence), o None si es igual.
+    """
+    global game_director
+    # Se reutiliza el GameDirector entre las partidas que juega cada proceso
+    if game_director is None:
+        game_director = GameDirector(agents=(ra, ra, aha, aha), max_rounds=200, store_trace=False)
+    random.seed(game_number)
+    game_trace = json.dumps(game_director.game_start(game_number, False))
+    expected_trace = (TRACES_PATH / f'game_{game_number}.json').read_text()
+    if game_trace == expected_trace:
+        return game_number, None
+
+    divergence = find_divergence(json.loads(expected_trace), json.loads(game_trace))
+    if divergence is None:
+        # Mismo contenido con otro formato (por ejemplo, las claves en otro orden)
+        divergence = {'round': None, 'turn': 'formato', 'field': None, 'expected': 'el mismo JSON',
+                      'actual': 'el mismo contenido con otro formato'}
+    return game_number, divergence
+
+
+def check_games(game_numbers, workers=None):
+    """
+    Comprueba las partidas en paralelo.
+    :param game_numbers: [int...] Partidas a comprobar.
+    :param workers: (int) Procesos a usar, o None para usar todos los procesadores.
+    :return: {int: dict} Primera diferencia de cada partida que no coincide con su traza.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = map(check_game, game_numbers)
+        return {game_number: divergence for game_number, divergence in results if divergence is not None}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(check_game, game_numbers, chunksize=max(1, len(game_numbers) // (workers * 4)))
+        return {game_number: divergence for game_number, divergence in results if divergence is not None}
+
+
+class TestTraceComparison:
+    def test_recorded_games(self):
+        divergences = check_games(range(5), workers=1)
+        assert divergences == {}, format_divergence(next(iter(divergences.values())))
+
+    def test_first_divergence(self):
+        expected_trace = json.loads((TRACES_PATH / 'game_0.json').read_text())
+        actual_trace = json.loads((TRACES_PATH / 'game_0.json').read_text())
+        assert find_divergence(expected_trace, actual_trace) is None
+
+        actual_trace['game']['round_3']['turn_P2']['start_turn']['hand_P1']['wool'] = '99'
+        actual_trace['game']['round_5']['turn_P0']['start_turn']['dice'] = 2
+        divergence = find_divergence(expected_trace, actual_trace)
+        assert (divergence['round'], divergence['turn'], divergence['field'], divergence['actual']) == \
+            ('round_3', 'turn_P2', 'start_turn.hand_P1.wool', '99')
+
+        del actual_trace['game']['round_3']
+        divergence = find_divergence(expected_trace, actual_trace)
+        assert divergence['round'] == 'round_3' and divergence['field'] is None
+
+        actual_trace['setup']['P1'][0]['road'] = -1
+        assert find_divergence(expected_trace, actual_trace)['field'] == 'P1[0].road'
 
-import random
-import json
 
-game_director = GameDirector(agents=(ra, ra, aha, aha), max_rounds=200)
-for i in range(100):
-    random.seed(i)
-    game_trace = game_director.game_start(i, False)
-    game_hash = hash(json.dumps(game_trace)) # convert to string because dict is not hashable
-    with open(f'./../Tests/test_traces/game_{i}.json', 'r') as f:
-        test_hash = hash(f.read())
-        if game_hash != test_hash:
-            print('Game {i}: ERROR')
-            break
-        
-    print(f'Game {i}: OK')
+if __name__ == '__main__':
+    start = time.perf_counter()
+    game_numbers = range(int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_GAMES)
+    divergences = check_games(game_numbers)
+    for game_number in game_numbers:
+        if game_number in divergences:
+            print(f'Game {game_number}: ERROR en {format_divergence(divergences[game_number])}')
+    print(f'{len(game_numbers) - len(divergences)}/{len(game_numbers)} partidas iguales a su traza '
+          f'({time.perf_counter() - start:.1f}s)')
+    sys.exit(1 if divergences else 0)
@@ -0,0 +1,62 @@
+import json
+import tempfile
+from pathlib import Path
+
+from Agents.AlexPastorAgent import AlexPastorAgent
+from Agents.RandomAgent import RandomAgent
+from Managers.GameDirector import GameDirector
+from TraceLoader.TraceContainer import TraceContainerReader, write_trace_container
+from TraceLoader.TraceLoader import to_json_object
+
+
+class TestTraceContainer:
+    agents = [RandomAgent, AlexPastorAgent, RandomAgent, AlexPastorAgent]
+
+    def play(self, max_rounds, seed):
+        game_director = GameDirector(agents=self.agents, max_rounds=max_rounds, store_trace=False)
+        game_trace = game_director.game_start(0, False, seed=seed)
+        return game_director, json.loads(json.dumps(game_trace, default=to_json_object))
+
+    def test_rounds_and_keyframes(self):
+        _, game_trace = self.play(60, 5)
+        short_director, _ = self.play(20, 5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            game_director = GameDirector(agents=self.agents, max_rounds=60, store_trace=False, container_trace=True)
+            game_director.store_trace = game_director.container_trace = True
+            game_director.trace_loader.full_path = Path(directory)
+            game_trace_in_memory = game_director.game_start(0, False, seed=5)
+            game_director.trace_loader.export_every_game_to_file()
+            assert 'game' not in game_trace_in_memory
+
+            with TraceContainerReader(Path(directory) / 'game_0.trace') as reader:
+                assert reader.info['finished']
+                assert reader.rounds == list(range(len(game_trace['game'])))
+                assert reader.round(12) == game_trace['game']['round_12']
+                assert reader.to_trace()['game'] == game_trace['game']
+
+                # El keyframe de la ronda 20 es el estado tras jugar 20 rondas
+                keyframe, state = reader.keyframe(27)
+                assert keyframe == 20
+                assert state == short_director.game_manager.get_state_snapshot()
+                assert reader.keyframe(-1) == (None, None)
+
+            # games.json se sigue escribiendo
+            games = json.loads((Path(directory) / 'games.json').read_text())
+            assert games[0]['game'] == game_trace['game']
+
+    def test_convert_trace(self):
+        _, game_trace = self.play(30, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            for codec in ('gzip', 'lzma', 'zlib'):
+                path = Path(directory) / f'game.{codec}.trace'
+                write_trace_container(path, game_trace, codec)
+                with TraceContainerReader(path) as reader:
+                    assert reader.to_trace() == game_trace
+                    assert reader.keyframe(10) == (None, None)
+
+
+if __name__ == '__main__':
+    test = TestTraceContainer()
+    test.test_rounds_and_keyframes()
+    test.test_convert_trace()
@@ -0,0 +1,75 @@
+import json
+import tempfile
+from pathlib import Path
+
+from Agents.AlexPastorAgent import AlexPastorAgent
+from Agents.RandomAgent import RandomAgent
+from Managers.GameDirector import GameDirector
+from TraceLoader.TraceLoader import load_trace_lines, to_json_object
+
+
+class TestTraceStream:
+    agents = [RandomAgent, AlexPastorAgent, RandomAgent, AlexPastorAgent]
+
+    def test_same_trace_as_json(self):
+        game_director = GameDirector(agents=self.agents, max_rounds=50, store_trace=False)
+        game_trace = json.loads(json.dumps(game_director.game_start(1, False, seed=3), default=to_json_object))
+
+        with tempfile.TemporaryDirectory() as directory:
+            stream_director = GameDirector(agents=self.agents, max_rounds=50, store_trace=False, stream_trace=True)
+            stream_director.store_trace = stream_director.stream_trace = True
+            stream_director.trace_loader.full_path = Path(directory)
+            stream_trace = stream_director.game_start(1, False, seed=3)
+
+            # En memoria solo queda el setup, el resto está en el fichero
+            assert 'game' not in stream_trace
+            loaded_trace, finished = load_trace_lines(Path(directory) / 'game_1.jsonl')
+        assert finished
+        assert loaded_trace['game'] == game_trace['game']
+        # El tablero del setup se escribe al empezar la partida; en game_N.json se serializa al final
+        del loaded_trace['setup']['board'], game_trace['setup']['board']
+        assert loaded_trace['setup'] == game_trace['setup']
+
+    def test_partial_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            game_director = GameDirector(agents=self.agents, max_rounds=50, store_trace=False, stream_trace=True)
+            game_director.store_trace = game_director.stream_trace = True
+            game_director.trace_loader.full_path = Path(directory)
+            game_director.game_start(2, False, seed=4)
+
+            # Una partida cortada a media línea se puede leer hasta el último turno completo
+            path = Path(directory) / 'game_2.jsonl'
+            lines = path.read_text().splitlines(keepends=True)
+            path.write_text(''.join(lines[:6]) + lines[6][:20])
+            loaded_trace, finished = load_trace_lines(path)
+        assert not finished
+        assert 'setup' in loaded_trace
+        assert sum(len(round_object) for round_object in loaded_trace['game'].values()) == 5
+
+    def test_games_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for stream_trace in (False, True):
+                game_director = GameDirector(agents=self.agents, max_rounds=20, store_trace=False,
+                                             stream_trace=stream_trace)
+                game_director.store_trace = True
+                game_director.stream_trace = stream_trace
+                game_director.trace_loader.full_path = Path(directory)
+                for game_number in range(3):
+                    game_director.game_start(game_number, False, seed=game_number)
+                game_director.trace_loader.export_every_game_to_file()
+
+                # games.json tiene las mismas partidas que los ficheros de cada partida
+                games = json.loads((Path(directory) / 'games.json').read_text())
+                assert len(games) == 3
+                for game_number, game_trace in enumerate(games):
+                    if stream_trace:
+                        assert game_trace == load_trace_lines(Path(directory) / f'game_{game_number}.jsonl')[0]
+                    else:
+                        assert game_trace == json.loads((Path(directory) / f'game_{game_number}.json').read_text())
+
+
+if __name__ == '__main__':
+    test = TestTraceStream()
+    test.test_same_trace_as_json()
+    test.test_partial_trace()
+    test.test_games_file()
@@ -0,0 +1,296 @@
+from Classes.Board import Board
+from Classes.DevelopmentCards import DevelopmentCard
+from Classes.Hand import Hand
+from Classes.Materials import Materials
+from Classes.TradeOffer import TradeOffer
+from Interfaces.AgentInterface import AgentInterface
+from Managers.GameDirector import GameDirector
+
+# Tipos de evento de la traza v2. El 0 es la tirada de dados; HAND, la mano de un agente que la ha cambiado durante
+# una llamada; el resto, la respuesta de un agente a cada trigger
+DICE = 0
+TRIGGERS = (
+    'dice',
+    'on_game_start',
+    'on_turn_start',
+    'on_commerce_phase',
+    'on_trade_offer',
+    'on_build_phase',
+    'on_turn_end',
+    'on_having_more_than_7_materials_when_thief_is_called',
+    'on_moving_thief',
+    'on_monopoly_card_use',
+    'on_road_building_card_use',
+    'on_year_of_plenty_card_use',
+    'hand',
+)
+HAND = TRIGGERS.index('hand')
+TRIGGER_CODES = {trigger: code for code, trigger in enumerate(TRIGGERS)}
+
+
+class ReplayDivergence(Exception):
+    """
+    La partida que se está repitiendo ha dejado de coincidir con la traza.
+    """
+
+
+class ReplayStopped(BaseException):
+    """
+    Se lanza para parar la repetición en mitad de la partida. Hereda de BaseException para que no la capture el
+    'except Exception' de la colocación inicial.
+    """
+
+
+def encode_response(game_manager, player_id, trigger, response):
+    """
+    Convierte la respuesta de un agente en un valor JSON con campos numéricos.
+    :param game_manager: GameManager() de la partida.
+    :param player_id: (int) Asiento del agente.
+    :param trigger: (str) Nombre del trigger.
+    :param response: Lo que ha devuelto el agente.
+    :return: None, bool, int, list o dict.
+    """
+    if response is None or isinstance(response, (bool, int)):
+        return response
+    if isinstance(response, TradeOffer):
+        return {'offer': list(response.gives) + list(response.receives)}
+    if isinstance(response, DevelopmentCard):
+        # El GameManager busca la carta por identidad, así que se guarda su posición en la mano del jugador
+        cards = game_manager.agent_manager.players[player_id]['development_cards'].hand
+        index = next((i for i, card in enumerate(cards) if card is response), -1)
+        if index == -1:
+            return {'card': -1, 'type': response.type, 'effect': response.effect}
+        return {'card': index}
+    if isinstance(response, Hand):
+        # Al descartar, el agente puede haber cambiado su mano (que es la del GameManager) y el total devuelto marca
+        # cuántos materiales tiene que quitar el GameManager
+        resources = game_manager.agent_manager.players[player_id]['resources'].resources
+        return {'hand': list(resources), 'total': response.get_total()}
+    if isinstance(response, tuple):
+        return list(response)
+    if isinstance(response, dict):
+        # Se copia porque el GameManager modifica algunas respuestas (las carreteras de la carta de construcción)
+        return dict(response)
+    # El GameManager trata cualquier otra respuesta como si no hubiese hecho nada
+    return None
+
+
+def decode_response(game_manager, player_id, trigger, value):
+    """
+    Inversa de encode_response.
+    :param game_manager: GameManager() de la partida que se está repitiendo.
+    :param player_id: (int) Asiento del agente.
+    :param trigger: (str) Nombre del trigger.
+    :param value: Respuesta guardada en la traza.
+    :return: La respuesta del agente.
+    """
+    if isinstance(value, list):
+        return tuple(value)
+    if not isinstance(value, dict):
+        return value
+    if 'error' in value:
+        raise Exception(value['error'])
+    if 'offer' in value:
+        return TradeOffer(Materials(*value['offer'][:5]), Materials(*value['offer'][5:]))
+    if 'card' in value:
+        if value['card'] == -1:
+            return DevelopmentCard(value['type'], value['effect'])
+        return game_manager.agent_manager.players[player_id]['development_cards'].hand[value['card']]
+    if 'hand' in value:
+        player = game_manager.agent_manager.players[player_id]
+        player['resources'].resources = Materials(*value['hand'])
+        if player['resources'].get_total() == value['total']:
+            return player['resources']
+        hand = Hand()
+        hand.resources = Materials(value['total'], 0, 0, 0, 0)
+        return hand
+    return dict(value)
+
+
+class ActionLog:
+    """
+    Guarda una partida como traza v2: la semilla, las colocaciones iniciales y la secuencia de respuestas de los
+    agentes y tiradas de dados, con campos numéricos. Con la semilla, el motor vuelve a sacar los mismos dados, cartas
+    y elecciones aleatorias, así que replay_game puede reconstruir cualquier estado intermedio de la partida aplicando
+    de nuevo las respuestas guardadas. Ocupa uno o dos órdenes de magnitud menos que la traza completa.
+
+    Se pasa al GameDirector (action_log=ActionLog()) y después de cada partida su traza queda en trace.
+
+    Cada evento es [jugador, código, valor]: el código es la posición en TRIGGERS (0 para los dados) y el valor, la
+    tirada o la respuesta del agente convertida con encode_response. Si el agente devuelve None el evento es solo
+    [jugador, código].
+
+    La mano del agente es la del GameManager, así que un agente puede cambiarla durante una llamada (por ejemplo
+    CrabisaAgent quita materiales al preparar una oferta). Si la mano ha cambiado, tras la respuesta se guarda un
+    evento [jugador, HAND, [madera, barro, lana, cereal, mineral]] con la mano que ha dejado.
+
+    trace: dict Traza v2 de la última partida.
+    """
+
+    def __init__(self):
+        self.trace = {}
+        self.events = []
+        return
+
+    def start(self, game_manager):
+        """
+        Empieza la traza de una partida nueva.
+        :param game_manager: GameManager() de la partida.
+        :return: None
+        """
+        self.events = []
+        self.trace = {
+            'version': 2,
+            'seed': game_manager.random_streams.seed,
+            'agents': [type(player['player']).__name__ for player in game_manager.agent_manager.players],
+            'setup': [],
+            'events': self.events,
+        }
+        return
+
+    def call_agent(self, game_manager, player_id, trigger, args):
+        """
+        Llama al agente a través del GameManager y guarda su respuesta.
+        :return: Lo que devuelva el agente.
+        """
+        player = game_manager.agent_manager.players[player_id]
+        hand = list(player['resources'].resources)
+        try:
+            response = game_manager.run_agent(player_id, trigger, args)
+        except Exception as e:
+            self.events.append([player_id, TRIGGER_CODES[trigger], {'error': str(e)}])
+            self.hand_changed(player, player_id, hand)
+            raise
+        value = encode_response(game_manager, player_id, trigger, response)
+        if value is None:
+            self.events.append([player_id, TRIGGER_CODES[trigger]])
+        else:
+            self.events.append([player_id, TRIGGER_CODES[trigger], value])
+        # En los descartes la respuesta ya lleva la mano
+        if not (isinstance(value, dict) and 'hand' in value):
+            self.hand_changed(player, player_id, hand)
+        return response
+
+    def hand_changed(self, player, player_id, hand):
+        """
+        Guarda un evento HAND si la mano del agente ya no es la que tenía antes de la llamada.
+        :param player: dict Jugador del AgentManager.
+        :param player_id: (int) Asiento del agente.
+        :param hand: [int...] Materiales antes de la llamada.
+        :return: None
+        """
+        resources = list(player['resources'].resources)
+        if resources != hand:
+            self.events.append([player_id, HAND, resources])
+        return
+
+    def dice(self, game_manager):
+        """
+        Guarda la tirada de dados que se acaba de hacer.
+        :param game_manager: GameManager() de la partida.
+        :return: None
+        """
+        self.events.append([game_manager.get_whose_turn_is_it(), DICE, game_manager.last_dice_roll])
+        return
+
+    def setup(self, placements):
+        """
+        :param placements: [[{'id': int, 'road': int}, ...] * 4] Pueblos y carreteras iniciales de cada jugador.
+        :return: None
+        """
+        self.trace['setup'] = [[[placement['id'], placement['road']] for placement in player_placements]
+                               for player_placements in placements]
+        return
+
+    def finish(self, game_result, max_rounds):
+        """
+        :param game_result: GameResult() de la partida.
+        :param max_rounds: (int) Límite de rondas de la partida.
+        :return: None
+        """
+        self.trace['max_rounds'] = max_rounds
+        self.trace['rounds'] = game_result.rounds
+        self.trace['victory_points'] = list(game_result.victory_points)
+        return
+
+
+class ActionReplay:
+    """
+    Repite una traza v2. Ocupa el lugar del ActionLog en el GameManager: en lugar de llamar a los agentes devuelve las
+    respuestas guardadas y comprueba que los dados y el orden de las llamadas coinciden con la traza.
+
+    trace: dict Traza v2.
+    stop: int/None Número de eventos tras los que se para la partida, o None para repetirla entera.
+    position: int Eventos ya aplicados.
+    """
+
+    def __init__(self, trace, stop=None):
+        if trace.get('version') != 2:
+            raise ValueError('Solo se pueden repetir trazas v2')
+        if trace['seed'] is None:
+            raise ValueError('Solo se pueden repetir partidas jugadas con semilla')
+        self.trace = trace
+        self.stop = stop
+        self.position = 0
+        return
+
+    def next_event(self, player_id, code):
+        if self.position == self.stop:
+            raise ReplayStopped()
+        if self.position >= len(self.trace['events']):
+            raise ReplayDivergence(f"La partida sigue después del evento {self.position}, el último de la traza")
+        event = self.trace['events'][self.position]
+        event_player, event_code = event[0], event[1]
+        value = event[2] if len(event) > 2 else None
+        if (event_player, event_code) != (player_id, code):
+            raise ReplayDivergence(f"Evento {self.position}: se esperaba {TRIGGERS[event_code]} del jugador "
+                                   f"{event_player} y llega {TRIGGERS[code]} del jugador {player_id}")
+        self.position += 1
+        return value
+
+    def start(self, game_manager):
+        self.position = 0
+        return
+
+    def call_agent(self, game_manager, player_id, trigger, args):
+        value = self.next_event(player_id, TRIGGER_CODES[trigger])
+        events = self.trace['events']
+        if self.position < len(events) and events[self.position][:2] == [player_id, HAND]:
+            # El agente cambió su mano durante la llamada
+            resources = Materials(*events[self.position][2])
+            game_manager.agent_manager.players[player_id]['resources'].resources = resources
+            self.position += 1
+        return decode_response(game_manager, player_id, trigger, value)
+
+    def dice(self, game_manager):
+        value = self.next_event(game_manager.get_whose_turn_is_it(), DICE)
+        if value != game_manager.last_dice_roll:
+            raise ReplayDivergence(f"Evento {self.position - 1}: la traza tiene un {value} en los dados y sale un "
+                                   f"{game_manager.last_dice_roll}")
+        return
+
+    def setup(self, placements):
+        return
+
+    def finish(self, game_result, max_rounds):
+        return
+
+
+def replay_game(trace, rounds=None, events=None, board_class=Board):
+    """
+    Reconstruye el estado de una partida guardada como traza v2.
+    :param trace: dict Traza v2 (ActionLog().trace).
+    :param rounds: (int) Rondas que se juegan, o None para jugar hasta donde llegó la partida.
+    :param events: (int) Eventos que se aplican antes de parar, o None para no parar por eventos. La partida se para
+                   cuando el motor pide el siguiente evento, así que si es una tirada los dados ya están tirados.
+    :param board_class: Clase del tablero.
+    :return: GameManager() con el estado de la partida en ese punto.
+    """
+    replay = ActionReplay(trace, stop=events)
+    game_director = GameDirector(agents=[AgentInterface] * 4, max_rounds=rounds or trace['max_rounds'],
+                                 store_trace=False, board_class=board_class, fast=True, action_log=replay)
+    try:
+        game_director.game_start(print_outcome=False, seed=trace['seed'])
+    except ReplayStopped:
+        game_director.game_manager.random_streams.release()
+    return game_director.game_manager
@@ -0,0 +1,106 @@
+import os
+import queue
+import threading
+import time
+
+
+class AsyncTraceWriter:
+    """
+    Escribe las trazas en un hilo aparte, para que la partida no tenga que esperar a que se conviertan a JSON, se
+    compriman y se escriban en disco. Se pasa al GameDirector (trace_writer=AsyncTraceWriter()) y el TraceLoader y el
+    TraceContainerWriter le mandan las escrituras en lugar de hacerlas ellos. Se hacen en el mismo orden en que llegan.
+
+    Si hay max_pending escrituras esperando, la siguiente bloquea hasta que se libere sitio, así que la memoria no
+    crece si el disco va más lento que las partidas. Los objetos que se mandan no deben cambiar después.
+
+    Hay que llamar a close() al acabar para esperar a que se escriba todo. Si una escritura falla, el error se lanza
+    en la siguiente llamada a submit, flush o close.
+
+    fsync: bool Si se fuerza a que cada fichero llegue al disco al cerrarlo.
+    blocked_seconds: float Tiempo que ha esperado la partida por tener la cola llena.
+    """
+
+    def __init__(self, max_pending=16, fsync=False):
+        self.fsync = fsync
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.error = None
+        self.blocked_seconds = 0.0
+        self.thread = threading.Thread(target=self.work, name='AsyncTraceWriter', daemon=True)
+        self.thread.start()
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def work(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                function, args = job
+                try:
+                    function(*args)
+                except Exception as e:
+                    if self.error is None:
+                        self.error = e
+            finally:
+                self.queue.task_done()
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def submit(self, function, *args):
+        """
+        Manda una escritura al hilo.
+        :param function: Función que hace la escritura.
+        :param args: Argumentos de la función.
+        :return: None
+        """
+        self.raise_error()
+        if not self.thread.is_alive():
+            raise RuntimeError('AsyncTraceWriter ya está cerrado')
+        try:
+            self.queue.put_nowait((function, args))
+        except queue.Full:
+            start = time.perf_counter()
+            self.queue.put((function, args))
+            self.blocked_seconds += time.perf_counter() - start
+        return
+
+    def sync(self, file):
+        """
+        Con fsync, fuerza a que lo escrito en el fichero llegue al disco. Se llama desde las escrituras, en el hilo.
+        :param file: Fichero abierto.
+        :return: None
+        """
+        if self.fsync:
+            file.flush()
+            os.fsync(file.fileno())
+        return
+
+    def flush(self):
+        """
+        Espera a que se hagan todas las escrituras pendientes.
+        :return: None
+        """
+        self.queue.join()
+        self.raise_error()
+        return
+
+    def close(self):
+        """
+        Espera a que se hagan todas las escrituras pendientes y para el hilo.
+        :return: None
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.raise_error()
+        return
@@ -0,0 +1,95 @@
+import hashlib
+import json
+
+from TraceLoader.TraceLoader import to_json_object
+
+
+def trace_turns(trace):
+    """
+    :param trace: dict Traza de la partida con el formato de game_N.json.
+    :return: Generador de (ronda, turno, traza del turno) en el orden en que se jugaron.
+    """
+    for round_key, round_object in trace.get('game', {}).items():
+        for turn_key, turn_object in round_object.items():
+            yield round_key, turn_key, turn_object
+
+
+def digest(obj):
+    """
+    :param obj: Objeto JSON.
+    :return: str Resumen de 64 bits del objeto, que no depende del orden de las claves.
+    """
+    data = json.dumps(obj, sort_keys=True, default=to_json_object).encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def first_difference(expected, actual, path=''):
+    """
+    Busca el primer campo en el que se diferencian dos objetos JSON, recorriéndolos en orden.
+    :param expected: Objeto esperado.
+    :param actual: Objeto obtenido.
+    :param path: (str) Ruta hasta los objetos.
+    :return: (str, esperado, obtenido) Ruta del campo ('end_turn.hand_P0.cereal') y sus valores, o None si son iguales.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            key_path = f'{path}.{key}' if path else str(key)
+            if key not in actual:
+                return key_path, expected[key], '<no está>'
+            if key not in expected:
+                return key_path, '<no está>', actual[key]
+            difference = first_difference(expected[key], actual[key], key_path)
+            if difference is not None:
+                return difference
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        for index, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            difference = first_difference(expected_item, actual_item, f'{path}[{index}]')
+            if difference is not None:
+                return difference
+        if len(expected) != len(actual):
+            return f'{path}.length', len(expected), len(actual)
+        return None
+    if expected != actual or type(expected) is not type(actual):
+        return path, expected, actual
+    return None
+
+
+def find_divergence(expected_trace, actual_trace):
+    """
+    Compara dos partidas turno a turno por sus resúmenes y, en el primer turno distinto, busca el campo que cambia.
+    :param expected_trace: dict Traza esperada (JSON).
+    :param actual_trace: dict Traza obtenida (JSON).
+    :return: {'round': str, 'turn': str, 'field': str, 'expected': ..., 'actual': ...} de la primera diferencia, o
+             None si las partidas son iguales. Las diferencias en el setup tienen round None y turn 'setup'.
+    """
+    expected_setup, actual_setup = expected_trace.get('setup'), actual_trace.get('setup')
+    if digest(expected_setup) != digest(actual_setup):
+        field, expected, actual = first_difference(expected_setup, actual_setup)
+        return {'round': None, 'turn': 'setup', 'field': field, 'expected': expected, 'actual': actual}
+
+    expected_turns, actual_turns = trace_turns(expected_trace), trace_turns(actual_trace)
+    while True:
+        expected_turn, actual_turn = next(expected_turns, None), next(actual_turns, None)
+        if expected_turn is None and actual_turn is None:
+            return None
+        if expected_turn is None or actual_turn is None or expected_turn[:2] != actual_turn[:2]:
+            round_key, turn_key = (expected_turn or actual_turn)[:2]
+            return {'round': round_key, 'turn': turn_key, 'field': None,
+                    'expected': expected_turn[:2] if expected_turn else '<fin de la partida>',
+                    'actual': actual_turn[:2] if actual_turn else '<fin de la partida>'}
+        if digest(expected_turn[2]) != digest(actual_turn[2]):
+            field, expected, actual = first_difference(expected_turn[2], actual_turn[2])
+            return {'round': expected_turn[0], 'turn': expected_turn[1], 'field': field,
+                    'expected': expected, 'actual': actual}
+
+
+def format_divergence(divergence):
+    """
+    :param divergence: dict Resultado de find_divergence.
+    :return: str Descripción de la diferencia.
+    """
+    where = divergence['turn'] if divergence['round'] is None else f"{divergence['round']} {divergence['turn']}"
+    if divergence['field'] is None:
+        return f"{where}: se esperaba {divergence['expected']} y llega {divergence['actual']}"
+    return f"{where} {divergence['field']}: se esperaba {divergence['expected']!r} y llega {divergence['actual']!r}"
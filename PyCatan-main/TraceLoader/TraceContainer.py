@@ -0,0 +1,223 @@
+import functools
+import gzip
+import json
+import lzma
+import mmap
+import struct
+import zlib
+
+from TraceLoader.TraceLoader import to_json_object
+
+MAGIC = b'PYCATAN-TRACE\x01'
+# Al final del fichero: posición y longitud del índice
+FOOTER = struct.Struct('<QQ')
+# gzip guarda la hora en la cabecera; con mtime=0 la misma partida da siempre el mismo fichero
+CODECS = {
+    'gzip': (functools.partial(gzip.compress, mtime=0), gzip.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+    'zlib': (zlib.compress, zlib.decompress),
+}
+
+
+class TraceContainerWriter:
+    """
+    Guarda una partida en un fichero .trace: cada ronda en un bloque comprimido por separado, el setup en otro y, cada
+    keyframe_every rondas, un keyframe con el estado completo de la partida al empezar la ronda
+    (GameManager.get_state_snapshot). Al cerrar se escribe un índice con la posición de cada bloque, así que
+    TraceContainerReader puede leer una ronda sin descomprimir el resto.
+
+    Formato: MAGIC, los bloques, el índice (JSON sin comprimir) y FOOTER con la posición y longitud del índice.
+
+    Con un AsyncTraceWriter, la conversión a JSON, la compresión y la escritura de cada bloque se hacen en su hilo.
+
+    path: Ruta del fichero.
+    codec: str 'gzip', 'lzma' o 'zlib'.
+    keyframe_every: int Rondas entre keyframes.
+    """
+
+    def __init__(self, path, codec='gzip', keyframe_every=10, writer=None):
+        if codec not in CODECS:
+            raise ValueError('codec debe ser uno de ' + ', '.join(CODECS))
+        self.path = path
+        self.codec = codec
+        self.compress = CODECS[codec][0]
+        self.keyframe_every = keyframe_every
+        self.writer = writer
+        self.index = {'codec': codec, 'setup': None, 'rounds': {}, 'keyframes': {}}
+        self.file = None
+        self.run(self.open)
+        return
+
+    def run(self, function, *args):
+        if self.writer is None:
+            function(*args)
+        else:
+            self.writer.submit(function, *args)
+        return
+
+    def open(self):
+        self.file = open(self.path, 'wb')
+        self.file.write(MAGIC)
+        return
+
+    @staticmethod
+    def encode(obj):
+        return json.dumps(obj, default=to_json_object, separators=(',', ':'))
+
+    def write_block(self, section, key, obj):
+        """
+        Guarda un objeto como JSON comprimido y apunta su posición y longitud en el índice.
+        :param section: (str) Parte del índice ('setup', 'rounds' o 'keyframes').
+        :param key: (str) Clave dentro de la parte, o None para el setup.
+        :param obj: Objeto a guardar, o str si ya está convertido a JSON.
+        :return: None
+        """
+        data = self.compress((obj if isinstance(obj, str) else self.encode(obj)).encode())
+        block = [self.file.tell(), len(data)]
+        self.file.write(data)
+        if key is None:
+            self.index[section] = block
+        else:
+            self.index[section][key] = block
+        return
+
+    def write_setup(self, setup_object):
+        # El setup tiene los nodos del tablero, que cambian durante la partida, así que se convierte ya a JSON
+        self.run(self.write_block, 'setup', None, self.encode(setup_object))
+        return
+
+    def wants_keyframe(self, round_number):
+        """
+        :param round_number: (int) Ronda que va a empezar.
+        :return: bool Si hay que guardar un keyframe antes de la ronda.
+        """
+        return round_number % self.keyframe_every == 0
+
+    def write_keyframe(self, round_number, state):
+        """
+        :param round_number: (int) Ronda que va a empezar.
+        :param state: dict Estado de la partida (GameManager.get_state_snapshot).
+        :return: None
+        """
+        self.run(self.write_block, 'keyframes', str(round_number), state)
+        return
+
+    def write_round(self, round_number, round_object):
+        """
+        :param round_number: (int) Número de la ronda.
+        :param round_object: dict Traza de la ronda, con el mismo formato que en game_N.json.
+        :return: None
+        """
+        self.run(self.write_block, 'rounds', str(round_number), round_object)
+        return
+
+    def close(self, **info):
+        """
+        Escribe el índice y cierra el fichero.
+        :param info: Datos de la partida que se guardan en el índice (rondas jugadas, resultado...).
+        :return: None
+        """
+        self.run(self.write_index, info)
+        return
+
+    def write_index(self, info):
+        self.index['info'] = info
+        data = json.dumps(self.index, separators=(',', ':')).encode()
+        offset = self.file.tell()
+        self.file.write(data)
+        self.file.write(FOOTER.pack(offset, len(data)))
+        if self.writer is not None:
+            self.writer.sync(self.file)
+        self.file.close()
+        return
+
+
+class TraceContainerReader:
+    """
+    Lee un fichero .trace. El fichero se abre con mmap y solo se descomprimen los bloques que se piden:
+
+        with TraceContainerReader(path) as reader:
+            round_object = reader.round(150)
+            state = reader.keyframe(150)
+
+    rounds: [int...] Rondas guardadas.
+    info: dict Datos de la partida guardados al cerrar.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f'{path} no es un fichero de trazas')
+        offset, length = FOOTER.unpack(self.data[-FOOTER.size:])
+        self.index = json.loads(self.data[offset:offset + length])
+        self.decompress = CODECS[self.index['codec']][1]
+        self.rounds = sorted(int(round_number) for round_number in self.index['rounds'])
+        self.info = self.index['info']
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+        return
+
+    def read_block(self, block):
+        offset, length = block
+        return json.loads(self.decompress(self.data[offset:offset + length]))
+
+    def setup(self):
+        """
+        :return: dict Setup de la partida.
+        """
+        return self.read_block(self.index['setup'])
+
+    def round(self, round_number):
+        """
+        :param round_number: (int) Número de la ronda.
+        :return: dict Traza de la ronda. Lanza KeyError si no está guardada.
+        """
+        return self.read_block(self.index['rounds'][str(round_number)])
+
+    def keyframe(self, round_number):
+        """
+        :param round_number: (int) Número de la ronda.
+        :return: (int, dict) Ronda del último keyframe antes de round_number (incluida) y estado de la partida al
+                 empezar esa ronda, o (None, None) si no hay ninguno.
+        """
+        keyframes = [int(keyframe) for keyframe in self.index['keyframes'] if int(keyframe) <= round_number]
+        if not keyframes:
+            return None, None
+        keyframe = max(keyframes)
+        return keyframe, self.read_block(self.index['keyframes'][str(keyframe)])
+
+    def to_trace(self):
+        """
+        :return: dict La partida entera con el mismo formato que game_N.json.
+        """
+        return {'setup': self.setup(),
+                'game': {'round_' + str(round_number): self.round(round_number) for round_number in self.rounds}}
+
+
+def write_trace_container(path, trace, codec='gzip'):
+    """
+    Convierte una traza con el formato de game_N.json en un fichero .trace. Sin el GameManager no se puede saber el
+    estado de la partida, así que no tiene keyframes.
+    :param path: Ruta del fichero .trace.
+    :param trace: dict Traza de la partida.
+    :param codec: str 'gzip', 'lzma' o 'zlib'.
+    :return: None
+    """
+    writer = TraceContainerWriter(path, codec)
+    writer.write_setup(trace['setup'])
+    for round_key, round_object in trace['game'].items():
+        writer.write_round(int(round_key[len('round_'):]), round_object)
+    writer.close(rounds=len(trace['game']))
+    return
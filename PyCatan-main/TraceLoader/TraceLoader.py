@@ -4,12 +4,59 @@ from pathlib import Path
 from datetime import datetime
 
 
+def to_json_object(obj):
+    """
+    Convierte a JSON los objetos que no son diccionarios ni listas pero saben representarse con __to_object__, por
+    ejemplo los nodos y terrenos de CompactBoard.
+    :param obj: Objeto a convertir.
+    :return: dict/list
+    """
+    if hasattr(obj, '__to_object__'):
+        return obj.__to_object__()
+    raise TypeError('Object of type ' + type(obj).__name__ + ' is not JSON serializable')
+
+
+def load_trace_lines(path):
+    """
+    Lee una traza guardada por turnos (game_N.jsonl) y la reconstruye con el mismo formato que game_N.json. Si la
+    partida se cortó a medias se devuelve lo que llegó a escribirse y se ignora la última línea si está incompleta.
+    El tablero del setup es el de después de las colocaciones iniciales (en game_N.json es el del final de la partida,
+    porque se serializa al acabar).
+    :param path: Ruta del fichero .jsonl.
+    :return: (dict, bool) Traza de la partida y si la partida llegó a terminar.
+    """
+    trace = {}
+    finished = False
+    with open(path) as trace_file:
+        for line in trace_file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if 'setup' in record:
+                trace['setup'] = record['setup']
+                trace['game'] = {}
+            elif 'turn' in record:
+                trace['game'].setdefault(record['round'], {})[record['turn']] = record['data']
+            elif 'end' in record:
+                finished = True
+    return trace, finished
+
+
 class TraceLoader:
-    all_games_trace = []
     current_trace = {}
     full_path = ''
+    # Fichero en el que se está escribiendo por turnos la partida actual
+    stream_file = None
+    streaming = False
+    # games.json se va escribiendo según acaban las partidas, así no hace falta guardar todas las trazas en memoria
+    games_file = None
 
-    def __init__(self, store_trace=True):
+    def __init__(self, store_trace=True, writer=None):
+        """
+        :param writer: AsyncTraceWriter() que hace las escrituras en otro hilo, o None para hacerlas en este.
+        """
+        self.writer = writer
         # Cogemos el día y hora para ponerle el nombre a la carpeta a crear en trazas
         # Creamos la carpeta del día y hora de hoy para guardar todas las trazas ahí
         # Si no existe la carpeta "Traces" la crea
@@ -19,31 +66,157 @@ class TraceLoader:
             self.full_path.mkdir(parents=True)
         return
 
+    def run(self, function, *args):
+        """
+        Hace una escritura: en el hilo del writer si hay uno o ahora mismo si no.
+        :param function: Función que hace la escritura.
+        :param args: Argumentos de la función.
+        :return: None
+        """
+        if self.writer is None:
+            function(*args)
+        else:
+            self.writer.submit(function, *args)
+        return
+
+    def sync(self, file):
+        if self.writer is not None:
+            self.writer.sync(file)
+        return
+
     def export_to_file(self, game_number):
         """
         Función que exporta a formato JSON la variable current_trace
         :return: None
         """
+        self.run(self.write_game_file, game_number, self.current_trace)
+        return
 
-        json_obj = json.dumps(self.current_trace)
+    def write_game_file(self, game_number, game_trace):
+        json_obj = json.dumps(game_trace, default=to_json_object)
         file_path = self.full_path / ("game_" + str(game_number) + '.json')
         with open(file_path, 'w') as outfile:
             outfile.write(json_obj)
+            self.sync(outfile)
 
         # Se añade la traza al json con todas las trazas
-        self.all_games_trace.append(self.current_trace)
+        self.append_to_games_file(json_obj)
         return
 
-    def export_every_game_to_file(self):
+    def export_action_trace(self, game_number, action_trace):
         """
-        Función que exporta a formato JSON la variable all_games_trace
+        Exporta la traza v2 de la partida (ActionLog().trace) a game_N.v2.json, sin espacios para que ocupe lo mínimo.
+        :param game_number: (int) Número de la partida.
+        :param action_trace: dict Traza v2.
         :return: None
         """
-        json_obj = json.dumps(self.all_games_trace)
-        file_path = self.full_path / "games.json"
+        self.run(self.write_action_trace, game_number, action_trace)
+        return
+
+    def write_action_trace(self, game_number, action_trace):
+        file_path = self.full_path / ("game_" + str(game_number) + '.v2.json')
         with open(file_path, 'w') as outfile:
-            outfile.write(json_obj)
+            json.dump(action_trace, outfile, separators=(',', ':'))
+            self.sync(outfile)
+        return
+
+    def append_to_games_file(self, json_obj):
+        """
+        Añade una partida a games.json, que se mantiene abierto hasta export_every_game_to_file.
+        :param json_obj: (str) Traza de la partida ya convertida a JSON.
+        :return: None
+        """
+        if self.games_file is None:
+            self.games_file = open(self.full_path / "games.json", 'w')
+            self.games_file.write('[')
+        else:
+            self.games_file.write(', ')
+        self.games_file.write(json_obj)
+        self.games_file.flush()
+        return
+
+    def export_every_game_to_file(self):
+        """
+        Función que termina games.json con las trazas de todas las partidas exportadas. Con writer, espera a que se
+        hayan escrito.
+        :return: None
+        """
+        self.run(self.close_games_file)
+        if self.writer is not None:
+            self.writer.flush()
+        return
+
+    def close_games_file(self):
+        if self.games_file is None:
+            with open(self.full_path / "games.json", 'w') as outfile:
+                outfile.write('[]')
+            return
+
+        self.games_file.write(']')
+        self.sync(self.games_file)
+        self.games_file.close()
+        # Las siguientes partidas empiezan un games.json nuevo
+        self.games_file = None
+        return
+
+    def start_stream(self, game_number, setup_object):
+        """
+        Empieza a guardar la partida por turnos en game_N.jsonl: una línea JSON con el setup y después una por cada
+        turno según se juegan (stream_turn), así que no hace falta tener la traza entera en memoria y una partida
+        que se corta deja una traza parcial que se puede leer con load_trace_lines.
+        :param game_number: (int) Número de la partida.
+        :param setup_object: dict Setup de la partida.
+        :return: None
+        """
+        self.end_stream()
+        self.streaming = True
+        file_path = self.full_path / ("game_" + str(game_number) + '.jsonl')
+        # El setup tiene los nodos del tablero, que cambian durante la partida, así que se convierte ya a JSON
+        self.run(self.open_stream, file_path, json.dumps({'setup': setup_object}, default=to_json_object))
+        return
+
+    def open_stream(self, file_path, setup_line):
+        self.stream_file = open(file_path, 'w')
+        self.stream_file.write(setup_line + '\n')
+        self.stream_file.flush()
+        return
+
+    def stream_turn(self, round_key, turn_key, turn_object):
+        """
+        :param round_key: (str) Ronda del turno ('round_N').
+        :param turn_key: (str) Jugador del turno ('turn_PN').
+        :param turn_object: dict Traza del turno.
+        :return: None
+        """
+        self.run(self.stream_record, {'round': round_key, 'turn': turn_key, 'data': turn_object})
+        return
+
+    def stream_record(self, record):
+        # Se vacía el buffer en cada línea para que una partida interrumpida deje escrito todo lo jugado
+        self.stream_file.write(json.dumps(record, default=to_json_object) + '\n')
+        self.stream_file.flush()
+        return
+
+    def end_stream(self, rounds=None):
+        """
+        Cierra el fichero de la partida que se está guardando por turnos. Con rounds se marca como terminada.
+        :param rounds: (int) Rondas jugadas, o None si la partida no ha terminado.
+        :return: None
+        """
+        if not self.streaming:
+            return
+        self.streaming = False
+        self.run(self.close_stream, rounds)
+        return
 
-        # Se resetea la variable una vez se ha exportado
-        self.all_games_trace = []
+    def close_stream(self, rounds):
+        if rounds is not None:
+            self.stream_record({'end': {'rounds': rounds}})
+        self.sync(self.stream_file)
+        self.stream_file.close()
+        if rounds is not None:
+            # En games.json va con el mismo formato que el resto de partidas. Solo se carga en memoria esta partida
+            trace, _ = load_trace_lines(self.stream_file.name)
+            self.append_to_games_file(json.dumps(trace))
+        self.stream_file = None
         return
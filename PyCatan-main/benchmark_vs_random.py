@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import importlib
 import concurrent.futures
@@ -10,45 +11,185 @@ from Agents.TristanAgent import TristanAgent as Tris
 from Agents.EdoAgent import EdoAgent as Edo
 from Agents.AdrianHerasAgent import AdrianHerasAgent as Ad
 from Agents.AlexPastorAgent import AlexPastorAgent as AlexP
+from Classes.AgentLatency import AgentLatency
+from Classes.AgentTimeBudget import AgentTimeBudget
+from Classes.Profiling import ProfileData, Profiler
+from Classes.ResultsJournal import ResultsJournal
+from Classes.Statistics import SampleStatistics, SequentialProbabilityRatioTest
 
 n_matches = 1000
 porcentaje_workers = 0.95
+# Partidas que juega cada worker por tarea
+tamano_lote = 50
 
 agentes_alumnos = [
     "Agents.HaoDiego.HaoDiego",
 ]
+# Modo emparejado: si se indica un agente de referencia, cada agente y la referencia juegan las mismas partidas (misma
+# semilla: mismos dados, mismo mazo y mismos rivales) y se informa de la diferencia entre ambos con su intervalo de
+# confianza. Al compartir el azar, la diferencia tiene mucha menos varianza que comparar partidas independientes.
+agente_referencia = None  # p.ej. "Agents.AlexPastorAgent.AlexPastorAgent"
+# Parada temprana: se hace un SPRT sobre la tasa de victorias (¿gana como mucho sprt_p0 o al menos sprt_p1?) con los
+# resultados según van llegando, y en cuanto se puede decidir se cancelan las partidas pendientes. n_matches pasa a
+# ser el máximo de partidas por posición.
+parada_temprana = False
+sprt_p0 = 0.25
+sprt_p1 = 0.35
+sprt_alpha = 0.05
+sprt_beta = 0.05
+# Diario con el resultado de cada partida. Se va escribiendo según acaban las partidas; al volver a lanzar el benchmark
+# se saltan las partidas (agente, posición, semilla) que ya estén en él, así que se puede reanudar una ejecución
+# interrumpida o ampliar n_matches sin repetir las partidas ya jugadas. Para empezar de cero hay que borrarlo.
+diario_filename = "benchmark_vs_random_diario.jsonl"
+# Mide cuánto tarda cada agente (el evaluado y sus rivales) en cada trigger y muestra llamadas, p50/p95/p99 y máximo
+medir_latencias = False
+# Tiempo máximo (en segundos) de cada agente por llamada y por partida. Si se pasa, se corta la llamada y se usa la
+# respuesta por defecto del trigger, así que un agente lento o en bucle no bloquea al worker. None: sin límite
+presupuesto_llamada = None
+presupuesto_partida = None
+# Perfilado (python benchmark_vs_random.py --profile): cada worker perfila sus lotes con cProfile y muestreando pilas,
+# y al acabar se juntan en benchmark_vs_random_perfil.pstats (para pstats/snakeviz) y en
+# benchmark_vs_random_perfil.collapsed (para flamegraph.pl/speedscope)
+perfilar = '--profile' in sys.argv
+perfil_filename = "benchmark_vs_random_perfil"
 
 def cargar_agente(ruta_clase):
     modulo, clase = ruta_clase.rsplit(".", 1)
     mod = importlib.import_module(modulo)
     return getattr(mod, clase)
 
-def simulate_match(position, agente_alumno):
+def crear_game_director(position, agente_alumno, agent_latency=None):
+    match_agents = [Sig,Tris,Edo]
+    match_agents.insert(position, agente_alumno)
+    time_budget = None
+    if presupuesto_llamada is not None or presupuesto_partida is not None:
+        time_budget = AgentTimeBudget(presupuesto_llamada, presupuesto_partida)
+    return GameDirector(agents=match_agents, max_rounds=200, store_trace=False, fast=True, agent_latency=agent_latency,
+                        time_budget=time_budget)
+
+def jugar_partida(game_director, position, seed=None):
+    """
+    :return: (victoria, puntos, puesto, error). Si la partida falla, error es el mensaje del error y el resto None: la
+             partida no cuenta como jugada (ni se guarda en el diario, así que al reanudar se vuelve a jugar).
+    """
     try:
-        match_agents = [Sig,Tris,Edo]
-        match_agents.insert(position, agente_alumno)
+        game_result = game_director.game_start(print_outcome=False, seed=seed)
+    except Exception as e:
+        return None, None, None, f"{type(e).__name__}: {e}"
+
+    points = game_result.victory_points[position]
+    victory = 1 if game_result.winner == position else 0
+    rank = game_result.rank(position)
+
+    return victory, points, rank, None
+
+def simulate_match(position, agente_alumno):
+    return jugar_partida(crear_game_director(position, agente_alumno), position)
+
+def simulate_batch(agente_alumno, jobs, medir_latencias=False, perfilar=False):
+    """
+    Juega un lote de partidas en el mismo proceso. Se crea un solo GameDirector por posición y se reutiliza en todas
+    las partidas del lote (game_start ya reinicia la partida). Cada partida se juega con su semilla, así que da igual
+    en qué worker o en qué orden se juegue.
+    :param agente_alumno: Clase del agente a evaluar.
+    :param jobs: [(int, int)...] Posición del agente y semilla de cada partida.
+    :param medir_latencias: (bool) Si se mide cuánto tardan los agentes en cada trigger.
+    :param perfilar: (bool) Si se perfila el lote.
+    :return: [{'agent': str, 'position': int, 'seed': int, 'victory': int, 'victory_points': int, 'rank': int,
+             'timeouts': int, 'error': str/None}...] Resultado de cada partida (timeouts: veces que el agente se ha
+             pasado de tiempo; error: el error si la partida ha fallado, y entonces el resto de campos son None), y
+             AgentLatency() con los tiempos del lote (o None si no se miden) y ProfileData() con el perfil del lote (o
+             None si no se perfila).
+    """
+    if perfilar:
+        with Profiler() as profiler:
+            resultados, latencias, _ = simulate_batch(agente_alumno, jobs, medir_latencias)
+        return resultados, latencias, profiler.profile_data()
+
+    game_directors = {}
+    resultados = []
+    latencias = AgentLatency() if medir_latencias else None
+    for position, seed in jobs:
+        if position not in game_directors:
+            game_directors[position] = crear_game_director(position, agente_alumno, latencias)
+
+        victory, points, rank, error = jugar_partida(game_directors[position], position, seed)
+        timeouts = sum(1 for timeout in game_directors[position].game_manager.agent_timeouts
+                       if timeout['player'] == position)
+        resultados.append({'agent': agente_alumno.__name__, 'position': position, 'seed': seed, 'victory': victory,
+                           'victory_points': points, 'rank': rank, 'timeouts': timeouts, 'error': error})
+    return resultados, latencias, None
+
+def simulate_paired_batch(agente_alumno, agente_referencia, jobs):
+    """
+    Juega cada partida del lote dos veces con la misma semilla, una con el agente y otra con el agente de referencia
+    en la misma posición, y acumula las diferencias entre ambos.
+    :param agente_alumno: Clase del agente a evaluar.
+    :param agente_referencia: Clase del agente con el que se compara.
+    :param jobs: [(int, int)...] Posición del agente y semilla de cada partida.
+    :return: {posición: [SampleStatistics() victorias, SampleStatistics() puntos, SampleStatistics() puesto]} y
+             [(int, int, str)...] posición, semilla y error de las partidas que han fallado. Si falla una de las dos
+             partidas de un par, el par no cuenta.
+    """
+    game_directors = {}
+    estadisticas = {}
+    errores = []
+    for position, seed in jobs:
+        if position not in game_directors:
+            game_directors[position] = (crear_game_director(position, agente_alumno),
+                                        crear_game_director(position, agente_referencia))
+        game_director, game_director_referencia = game_directors[position]
 
-        game_director = GameDirector(agents=match_agents, max_rounds=200, store_trace=False)
-        game_trace = game_director.game_start(print_outcome=False)
+        *resultado, error = jugar_partida(game_director, position, seed)
+        *resultado_referencia, error_referencia = jugar_partida(game_director_referencia, position, seed)
+        if error is not None or error_referencia is not None:
+            errores.append((position, seed, error or error_referencia))
+            continue
 
-        last_round = max(game_trace["game"].keys(), key=lambda r: int(r.split("_")[-1]))
-        last_turn = max(game_trace["game"][last_round].keys(), key=lambda t: int(t.split("_")[-1].lstrip("P")))
-        victory_points = game_trace["game"][last_round][last_turn]["end_turn"]["victory_points"]
+        estadisticas_posicion = estadisticas.setdefault(position, [SampleStatistics() for _ in range(3)])
+        for estadistica, valor, valor_referencia in zip(estadisticas_posicion, resultado, resultado_referencia):
+            estadistica.add(valor - valor_referencia)
+    return estadisticas, errores
 
-        agent_id = f"J{position}"
-        points = int(victory_points[agent_id])
-        winner = max(victory_points, key=lambda player: int(victory_points[player]))
-        victory = 1 if winner == agent_id else 0
+def evaluar_emparejado(agente_alumno, agente_referencia, workers):
+    """
+    Evalúa un agente frente al de referencia en modo emparejado e imprime las diferencias.
+    :param agente_alumno: Clase del agente a evaluar.
+    :param agente_referencia: Clase del agente con el que se compara.
+    :param workers: (int) Número de procesos.
+    :return: [SampleStatistics() victorias, SampleStatistics() puntos, SampleStatistics() puesto] de todas las partidas
+    """
+    jobs = [(pos, seed) for pos in range(4) for seed in range(n_matches)]
+    lotes = [jobs[i:i + tamano_lote] for i in range(0, len(jobs), tamano_lote)]
 
-        ordenados = sorted(victory_points.items(), key=lambda item: int(item[1]), reverse=True)
-        for idx, (jugador, _) in enumerate(ordenados, start=1):
-            if jugador == agent_id:
-                rank = idx
-                break
+    estadisticas = {pos: [SampleStatistics() for _ in range(3)] for pos in range(4)}
+    partidas_con_error = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(simulate_paired_batch, agente_alumno, agente_referencia, lote) for lote in lotes]
+        for f in concurrent.futures.as_completed(futures):
+            estadisticas_lotes, errores = f.result()
+            for pos, estadisticas_lote in estadisticas_lotes.items():
+                for estadistica, estadistica_lote in zip(estadisticas[pos], estadisticas_lote):
+                    estadistica.merge(estadistica_lote)
+            for pos, seed, error in errores:
+                print(f"Error en la posición {pos+1} (semilla {seed}): {error}")
+            partidas_con_error += len(errores)
 
-        return (victory, points, rank)
-    except Exception:
-        return (0, 0, 4)
+    totales = [SampleStatistics() for _ in range(3)]
+    for pos in range(4):
+        victorias, puntos, _ = estadisticas[pos]
+        print(f"- Posición {pos+1}: diferencia de victorias {victorias}, diferencia de puntos {puntos}")
+        for total, estadistica in zip(totales, estadisticas[pos]):
+            total.merge(estadistica)
+
+    victorias, puntos, puesto = totales
+    print(f"\n{agente_alumno.__name__} - {agente_referencia.__name__} (media [IC 95%]):")
+    print(f"Diferencia de ratio de victorias: {victorias}")
+    print(f"Diferencia de media de puntos: {puntos}")
+    print(f"Diferencia de puesto medio: {puesto}")
+    if partidas_con_error:
+        print(f"Pares descartados por errores: {partidas_con_error}")
+    return totales
 
 if __name__ == '__main__':
     total_workers = os.cpu_count()
@@ -57,6 +198,8 @@ if __name__ == '__main__':
 
     start_time = time.time()
     resumen_csv = []
+    referencia = cargar_agente(agente_referencia) if agente_referencia else None
+    diario = ResultsJournal(diario_filename)
 
     for ruta_agente in agentes_alumnos:
         agente_alumno = cargar_agente(ruta_agente)
@@ -64,27 +207,104 @@ if __name__ == '__main__':
         print(f"\n==== Evaluando agente: {agent_name} ====\n")
 
         partial_start_time = time.time()
+
+        if referencia is not None:
+            victorias, puntos, puesto = evaluar_emparejado(agente_alumno, referencia, workers_a_utilizar)
+            low, high = victorias.confidence_interval()
+            resumen_csv.append([agent_name, referencia.__name__, victorias.count, f"{victorias.mean():.4f}",
+                                f"{low:.4f}", f"{high:.4f}", f"{puntos.mean():.2f}", f"{puesto.mean():.2f}"])
+            print(f"Tiempo parcial: {time.time() - partial_start_time:.0f}s\n")
+            continue
         position_results = {pos: 0 for pos in range(4)}
-        total_wins = 0
-        total_points = 0
-        total_rank = 0
+        position_games = {pos: 0 for pos in range(4)}
+        position_points = {pos: 0 for pos in range(4)}
+        position_ranks = {pos: 0 for pos in range(4)}
+        position_timeouts = {pos: 0 for pos in range(4)}
+        position_errors = {pos: 0 for pos in range(4)}
+
+        # Cada partida es un par (posición, semilla). Se reparten en lotes para no crear un GameDirector ni enviar el
+        # agente al pool en cada partida. Con parada temprana se intercalan las posiciones para que cada lote que
+        # llega tenga partidas de todas ellas
+        if parada_temprana:
+            jobs = [(pos, seed) for seed in range(n_matches) for pos in range(4)]
+            sprt = SequentialProbabilityRatioTest(sprt_p0, sprt_p1, sprt_alpha, sprt_beta)
+        else:
+            jobs = [(pos, seed) for pos in range(4) for seed in range(n_matches)]
+            sprt = None
+
+        def sumar_resultado(resultado):
+            if resultado.get('error') is not None:
+                # Las partidas que han fallado no cuentan: se avisa y se vuelven a jugar si se reanuda
+                position_errors[resultado['position']] += 1
+                print(f"Error en la posición {resultado['position']+1} (semilla {resultado['seed']}): "
+                      f"{resultado['error']}")
+                return
+            position_results[resultado['position']] += resultado['victory']
+            position_games[resultado['position']] += 1
+            position_points[resultado['position']] += resultado['victory_points']
+            position_ranks[resultado['position']] += resultado['rank']
+            position_timeouts[resultado['position']] += resultado.get('timeouts', 0)
+            if sprt is not None:
+                sprt.add(resultado['victory'])
+
+        # Se suman las partidas que ya están en el diario y solo se juegan las que faltan
+        for pos, seed in jobs:
+            if (agent_name, pos, seed) in diario:
+                sumar_resultado(diario.results[(agent_name, pos, seed)])
+        if sprt is not None and sprt.decision() is not None:
+            jobs = []
+        jobs = [(pos, seed) for pos, seed in jobs if (agent_name, pos, seed) not in diario]
+        print(f"Partidas ya jugadas en {diario_filename}: {sum(position_games.values())}. Pendientes: {len(jobs)}")
+        lotes = [jobs[i:i + tamano_lote] for i in range(0, len(jobs), tamano_lote)]
+        latencias = AgentLatency()
+        perfil = ProfileData()
 
         with concurrent.futures.ProcessPoolExecutor(max_workers=workers_a_utilizar) as executor:
-            for pos in range(4):
-                futures = [executor.submit(simulate_match, pos, agente_alumno) for _ in range(n_matches)]
-                for f in concurrent.futures.as_completed(futures):
-                    victory, points, rank = f.result()
-                    position_results[pos] += victory
-                    total_wins += victory
-                    total_points += points
-                    total_rank += rank
+            futures = [executor.submit(simulate_batch, agente_alumno, lote, medir_latencias, perfilar)
+                       for lote in lotes]
+            procesados = set()
+            for f in concurrent.futures.as_completed(futures):
+                procesados.add(f)
+                resultados, latencias_lote, perfil_lote = f.result()
+                for resultado in resultados:
+                    sumar_resultado(resultado)
+                diario.append([resultado for resultado in resultados if resultado['error'] is None])
+                if latencias_lote is not None:
+                    latencias.merge(latencias_lote)
+                if perfil_lote is not None:
+                    perfil.merge(perfil_lote)
+
+                if sprt is not None and sprt.decision() is not None:
+                    # Las partidas que ya se están jugando acaban, pero no se empieza ninguna más
+                    for future in futures:
+                        future.cancel()
+                    break
+
+            # Los lotes que ya estaban en marcha al decidir se esperan de todas formas al salir del pool: se guardan en
+            # el diario para no repetirlos al reanudar, pero no se suman porque la decisión ya está tomada
+            en_marcha = [future for future in futures if future not in procesados and not future.cancelled()]
+            for f in concurrent.futures.as_completed(en_marcha):
+                resultados, _, _ = f.result()
+                diario.append([resultado for resultado in resultados if resultado['error'] is None])
 
         for pos in range(4):
             wins = position_results[pos]
-            percentage = 100 * wins / n_matches
-            print(f"- Posición {pos+1}: {wins} victorias de {n_matches} partidas ({percentage:.2f}%)")
+            percentage = 100 * wins / max(1, position_games[pos])
+            print(f"- Posición {pos+1}: {wins} victorias de {position_games[pos]} partidas ({percentage:.2f}%)")
+
+        if sprt is not None:
+            print(f"\n{sprt}")
+            if sprt.decision() == SequentialProbabilityRatioTest.ACCEPT_P1:
+                print(f"Decisión: gana al menos el {sprt_p1:.0%} de las partidas")
+            elif sprt.decision() == SequentialProbabilityRatioTest.ACCEPT_P0:
+                print(f"Decisión: no gana más del {sprt_p0:.0%} de las partidas")
+            else:
+                print("Decisión: sin decidir tras jugar todas las partidas")
 
-        total_partidas = n_matches * 4
+        total_partidas = max(1, sum(position_games.values()))
+        total_wins = sum(position_results.values())
+        total_points = sum(position_points.values())
+        total_rank = sum(position_ranks.values())
         ratio_victorias = total_wins / total_partidas
         media_puntos = total_points / total_partidas
         puesto_medio = total_rank / total_partidas
@@ -92,6 +312,20 @@ if __name__ == '__main__':
         print(f"\nTotal para {agent_name}: {total_wins} victorias de {total_partidas} partidas ({ratio_victorias:.2%})")
         print(f"Media de puntos: {media_puntos:.2f}")
         print(f"Puesto medio: {puesto_medio:.2f}")
+        if presupuesto_llamada is not None or presupuesto_partida is not None:
+            print(f"Llamadas fuera de tiempo: {sum(position_timeouts.values())}")
+        if sum(position_errors.values()):
+            print(f"Partidas con error (no cuentan ni se guardan en el diario): {sum(position_errors.values())}")
+
+        if medir_latencias:
+            print(f"\nTiempos de respuesta de los agentes en las partidas jugadas:\n{latencias}")
+
+        if perfilar:
+            perfil.print_stats()
+            fichero_perfil = f"{perfil_filename}_{agent_name}"
+            perfil.dump_stats(fichero_perfil + ".pstats")
+            perfil.write_collapsed(fichero_perfil + ".collapsed")
+            print(f"Perfil guardado en: {fichero_perfil}.pstats y {fichero_perfil}.collapsed")
 
         resumen_csv.append([agent_name, total_wins, total_points, total_partidas,
                             f"{ratio_victorias:.4f}", f"{media_puntos:.2f}", f"{puesto_medio:.2f}"])
@@ -105,7 +339,12 @@ if __name__ == '__main__':
     csv_filename = "benchmark_vs_random_resultados.csv"
     with open(csv_filename, mode='w', newline='') as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow(["Agente", "Victorias", "Puntos", "Partidas", "Ratio Victorias", "Media Puntos", "Puesto Medio"])
+        if referencia is not None:
+            writer.writerow(["Agente", "Referencia", "Partidas", "Diferencia Ratio Victorias", "IC Inferior",
+                             "IC Superior", "Diferencia Media Puntos", "Diferencia Puesto Medio"])
+        else:
+            writer.writerow(["Agente", "Victorias", "Puntos", "Partidas", "Ratio Victorias", "Media Puntos",
+                             "Puesto Medio"])
         for row in resumen_csv:
             writer.writerow(row)
 
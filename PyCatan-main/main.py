@@ -1,21 +1,31 @@
 from Managers.GameDirector import GameDirector
+from TraceLoader.AsyncTraceWriter import AsyncTraceWriter
 
 
 def main():
-    game_director = GameDirector()
+    # Las trazas se escriben en otro hilo para que el disco no frene las partidas
+    trace_writer = AsyncTraceWriter()
+    game_director = GameDirector(trace_writer=trace_writer)
     try:
         games_to_play = int(input('Number of games to be played: '))
     except ValueError:
         games_to_play = 0
-    if isinstance(games_to_play, int) and games_to_play > 0:
-        for i in range(games_to_play):
+    try:
+        if isinstance(games_to_play, int) and games_to_play > 0:
+            for i in range(games_to_play):
+                print('......')
+                game_director.game_start(i + 1)
+        else:
             print('......')
-            game_director.game_start(i + 1)
-    else:
-        print('......')
-        print('Invalid quantity')
-    print('------------------------')
-    game_director.trace_loader.export_every_game_to_file()
+            print('Invalid quantity')
+        print('------------------------')
+    finally:
+        # Aunque una partida falle o se interrumpa con Ctrl-C, se cierra games.json con las partidas ya acabadas y se
+        # escribe todo lo que quede en la cola del hilo
+        try:
+            game_director.trace_loader.export_every_game_to_file()
+        finally:
+            trace_writer.close()
     return
 
 
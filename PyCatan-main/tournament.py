@@ -0,0 +1,222 @@
+import os
+import sys
+import time
+import importlib
+import inspect
+import itertools
+import random
+import concurrent.futures
+import csv
+from pathlib import Path
+
+from Classes.AgentTimeBudget import AgentTimeBudget
+from Classes.Ratings import EloRatings
+from Classes.ResultsJournal import ResultsJournal
+from Interfaces.AgentInterface import AgentInterface
+from Managers.GameDirector import GameDirector
+
+# Carpetas en las que se buscan agentes (clases que heredan de AgentInterface). Las rutas relativas son respecto a
+# esta carpeta. Si hay dos agentes con el mismo nombre se queda el primero que se encuentre.
+directorios_agentes = [
+    "Agents",
+    "../PyCatanAgents2025",
+]
+# Partidas por cada combinación de 4 agentes y orden de asientos. Cada combinación se juega en sus 4 rotaciones, así
+# que cada agente juega en todos los asientos con las mismas semillas
+partidas_por_asiento = 5
+porcentaje_workers = 0.95
+tamano_lote = 20
+max_rounds = 200
+k_factor = 32
+# Tiempo máximo (en segundos) de cada agente por llamada y por partida. Si se pasa se usa la respuesta por defecto del
+# trigger. None: sin límite
+presupuesto_llamada = None
+presupuesto_partida = None
+# Diario con el resultado de cada partida. Al relanzar el torneo se recalculan las puntuaciones con lo que ya está en
+# él y solo se juegan las partidas que falten (por ejemplo, las de un agente nuevo o las que fallaron)
+diario_filename = "torneo_diario.jsonl"
+csv_filename = "torneo_resultados.csv"
+
+# Las carpetas de fuera del proyecto se importan como paquetes desde su carpeta padre. Se hace al importar el módulo
+# para que los procesos del pool también puedan cargar los agentes
+for directorio in directorios_agentes:
+    parent = str((Path(__file__).parent / directorio).resolve().parent)
+    if parent not in sys.path:
+        sys.path.append(parent)
+
+
+def ruta_modulo(directorio):
+    """
+    :param directorio: (str) Carpeta de agentes.
+    :return: (str) Nombre del paquete con el que se importan sus módulos.
+    """
+    return (Path(__file__).parent / directorio).resolve().name
+
+
+def descubrir_agentes(directorios):
+    """
+    Busca en las carpetas los agentes que heredan de AgentInterface.
+    :param directorios: [str...] Carpetas de agentes.
+    :return: {nombre: ruta} Ruta de importación de cada agente ("paquete.modulo.Clase"), por nombre de clase.
+    """
+    agentes = {}
+    for directorio in directorios:
+        carpeta = (Path(__file__).parent / directorio).resolve()
+        if not carpeta.is_dir():
+            print(f"No existe la carpeta de agentes {carpeta}")
+            continue
+
+        for fichero in sorted(carpeta.glob('*.py')):
+            nombre_modulo = ruta_modulo(directorio) + '.' + fichero.stem
+            try:
+                modulo = importlib.import_module(nombre_modulo)
+            except Exception as e:
+                print(f"No se ha podido importar {nombre_modulo}: {e}")
+                continue
+
+            for nombre, clase in inspect.getmembers(modulo, inspect.isclass):
+                if (issubclass(clase, AgentInterface) and clase is not AgentInterface and
+                        clase.__module__ == modulo.__name__):
+                    if nombre in agentes:
+                        print(f"Se ignora {nombre_modulo}.{nombre}: ya se ha cargado {agentes[nombre]}")
+                        continue
+                    agentes[nombre] = f"{nombre_modulo}.{nombre}"
+    return agentes
+
+
+def cargar_agente(ruta_clase):
+    modulo, clase = ruta_clase.rsplit(".", 1)
+    mod = importlib.import_module(modulo)
+    return getattr(mod, clase)
+
+
+def emparejamientos(nombres, partidas):
+    """
+    Partidas del torneo: todas las combinaciones de 4 agentes, cada una en sus 4 rotaciones de asientos y con las
+    mismas semillas en cada rotación.
+    :param nombres: [str...] Nombres de los agentes.
+    :param partidas: (int) Partidas por combinación y rotación.
+    :return: [((str, str, str, str), int)...] Agente de cada asiento y semilla de cada partida.
+    """
+    jobs = []
+    for combinacion in itertools.combinations(sorted(nombres), 4):
+        for rotacion in range(4):
+            asientos = combinacion[rotacion:] + combinacion[:rotacion]
+            for seed in range(partidas):
+                jobs.append((asientos, seed))
+    return jobs
+
+
+def clave_partida(asientos):
+    return '|'.join(asientos)
+
+
+def jugar_lote(rutas, jobs):
+    """
+    Juega un lote de partidas en el mismo proceso, reutilizando un GameDirector por orden de asientos.
+    :param rutas: {nombre: ruta} Ruta de importación de cada agente.
+    :param jobs: [((str, str, str, str), int)...] Agente de cada asiento y semilla de cada partida.
+    :return: [{'match': str, 'seed': int, 'agents': [str...], 'victory_points': [int...], 'timeouts': [int...],
+             'error': str/None}...]
+    """
+    game_directors = {}
+    resultados = []
+    for asientos, seed in jobs:
+        if asientos not in game_directors:
+            time_budget = None
+            if presupuesto_llamada is not None or presupuesto_partida is not None:
+                time_budget = AgentTimeBudget(presupuesto_llamada, presupuesto_partida)
+            game_directors[asientos] = GameDirector(agents=[cargar_agente(rutas[nombre]) for nombre in asientos],
+                                                    max_rounds=max_rounds, store_trace=False, fast=True,
+                                                    time_budget=time_budget)
+        resultado = {'match': clave_partida(asientos), 'seed': seed, 'agents': list(asientos)}
+        try:
+            game_result = game_directors[asientos].game_start(print_outcome=False, seed=seed)
+            resultado['victory_points'] = game_result.victory_points
+            resultado['timeouts'] = game_result.agent_timeouts
+            resultado['error'] = None
+        except Exception as e:
+            resultado['victory_points'] = None
+            resultado['timeouts'] = None
+            resultado['error'] = f"{type(e).__name__}: {e}"
+        resultados.append(resultado)
+    return resultados
+
+
+def actualizar_puntuaciones(puntuaciones, resultado):
+    """
+    :param puntuaciones: EloRatings()
+    :param resultado: dict Resultado de una partida de jugar_lote.
+    :return: None
+    """
+    # Las partidas que han fallado no cuentan para la puntuación
+    if resultado['error'] is None:
+        puntuaciones.update(resultado['agents'], resultado['victory_points'])
+    return
+
+
+def imprimir_clasificacion(puntuaciones):
+    for posicion, (nombre, puntuacion, partidas) in enumerate(puntuaciones.ranking(), start=1):
+        print(f"{posicion:>3}. {nombre:<30} {puntuacion:8.1f} ({partidas} partidas)")
+
+
+if __name__ == '__main__':
+    total_workers = os.cpu_count()
+    workers_a_utilizar = max(1, int(total_workers * porcentaje_workers))
+    print(f"Workers a utilizar ({porcentaje_workers*100}%): {workers_a_utilizar}\n")
+
+    start_time = time.time()
+
+    rutas = descubrir_agentes(directorios_agentes)
+    print(f"Agentes encontrados ({len(rutas)}): {', '.join(sorted(rutas))}\n")
+    if len(rutas) < 4:
+        raise SystemExit('Hacen falta al menos 4 agentes para el torneo')
+
+    jobs = emparejamientos(list(rutas), partidas_por_asiento)
+    puntuaciones = EloRatings(k_factor=k_factor)
+    diario = ResultsJournal(diario_filename, key_fields=('match', 'seed'))
+
+    # Se recalculan las puntuaciones con las partidas ya jugadas, en el orden en que se jugaron
+    claves = set((clave_partida(asientos), seed) for asientos, seed in jobs)
+    for clave, resultado in diario.results.items():
+        if clave in claves:
+            actualizar_puntuaciones(puntuaciones, resultado)
+
+    # Las partidas que fallaron (en diarios de versiones anteriores, que las guardaban) se vuelven a jugar
+    jugadas = set(clave for clave, resultado in diario.results.items() if resultado.get('error') is None)
+    jobs = [(asientos, seed) for asientos, seed in jobs if (clave_partida(asientos), seed) not in jugadas]
+    print(f"Partidas ya jugadas en {diario_filename}: {len(claves) - len(jobs)}. Pendientes: {len(jobs)}\n")
+    # Se mezclan para que las puntuaciones provisionales tengan partidas de todos los agentes desde el principio
+    random.Random(0).shuffle(jobs)
+    lotes = [jobs[i:i + tamano_lote] for i in range(0, len(jobs), tamano_lote)]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers_a_utilizar) as executor:
+        futures = [executor.submit(jugar_lote, rutas, lote) for lote in lotes]
+        for lotes_terminados, f in enumerate(concurrent.futures.as_completed(futures), start=1):
+            resultados = f.result()
+            # Las partidas que han fallado no se guardan, así que al reanudar se vuelven a jugar
+            diario.append([resultado for resultado in resultados if resultado['error'] is None])
+            for resultado in resultados:
+                actualizar_puntuaciones(puntuaciones, resultado)
+                if resultado['error'] is not None:
+                    print(f"Error en {resultado['match']} (semilla {resultado['seed']}): {resultado['error']}")
+
+            if lotes_terminados % 10 == 0 or lotes_terminados == len(lotes):
+                print(f"-- {lotes_terminados}/{len(lotes)} lotes --")
+                imprimir_clasificacion(puntuaciones)
+                print()
+
+    print("Clasificación final:")
+    imprimir_clasificacion(puntuaciones)
+
+    with open(csv_filename, mode='w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Posicion", "Agente", "Puntuacion", "Partidas"])
+        for posicion, (nombre, puntuacion, partidas) in enumerate(puntuaciones.ranking(), start=1):
+            writer.writerow([posicion, nombre, f"{puntuacion:.1f}", partidas])
+    print(f"\nResultados guardados en: {csv_filename}")
+
+    end_time = time.time()
+    horas, resto = divmod(end_time - start_time, 3600)
+    minutos, segundos = divmod(resto, 60)
+    print(f"\nTiempo total: {int(horas)}h {int(minutos)}m {int(segundos)}s\n")